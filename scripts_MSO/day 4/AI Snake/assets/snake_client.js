@@ -0,0 +1,125 @@
+// Client-side game loop for dash_snake.py (mode 'client').
+// Steps the game with the rules of game_engine.step_game and sends only
+// extendData deltas to the board; see frame_delta in dash_snake.py.
+// A finished game (state.dead) cannot be started again, only reset: after a
+// self-collision the snake holds its head twice.
+(function() {
+  var OPPOSITE = {UP: 'DOWN', DOWN: 'UP', LEFT: 'RIGHT', RIGHT: 'LEFT'};
+  var DELTA = {UP: [0, -1], DOWN: [0, 1], LEFT: [-1, 0], RIGHT: [1, 0]};
+  var KEY_MAP = {ARROWLEFT: 'LEFT', LEFT: 'LEFT', A: 'LEFT',
+                 ARROWRIGHT: 'RIGHT', RIGHT: 'RIGHT', D: 'RIGHT',
+                 ARROWUP: 'UP', UP: 'UP', W: 'UP',
+                 ARROWDOWN: 'DOWN', DOWN: 'DOWN', S: 'DOWN'};
+
+  function copyState(state) {
+    var s = Object.assign({}, state);
+    s.snake = state.snake.map(function(p) { return [p[0], p[1]]; });
+    return s;
+  }
+
+  function newGame(grid, wrap) {
+    var w = grid[0], h = grid[1];
+    var snake = [];
+    for (var i = 0; i < 3; i++) snake.push([Math.floor(w / 2) - i, Math.floor(h / 2)]);
+    var s = {grid: grid, snake: snake, direction: 'RIGHT', food: null, score: 0, running: false, wrap: wrap,
+             dead: false};
+    s.food = randomFood(s);
+    return s;
+  }
+
+  function randomFood(state) {
+    // only runs on a meal, so a scan of the grid is fine
+    var w = state.grid[0], h = state.grid[1];
+    var taken = new Uint8Array(w * h);
+    state.snake.forEach(function(p) { taken[p[1] * w + p[0]] = 1; });
+    var free = [];
+    for (var c = 0; c < w * h; c++) if (!taken[c]) free.push(c);
+    if (!free.length) return null;
+    var cell = free[Math.floor(Math.random() * free.length)];
+    return [cell % w, Math.floor(cell / w)];
+  }
+
+  function step(state) {
+    // returns the event; updates state in place
+    if (!state.running) return 'no_op';
+    var w = state.grid[0], h = state.grid[1];
+    var d = DELTA[state.direction];
+    var x = state.snake[0][0] + d[0], y = state.snake[0][1] + d[1];
+    if (state.wrap) {
+      x = (x + w) % w;
+      y = (y + h) % h;
+    } else if (x < 0 || x >= w || y < 0 || y >= h) {
+      state.running = false;
+      state.dead = true;
+      return 'dead';
+    }
+    var ate = state.food !== null && x === state.food[0] && y === state.food[1];
+    if (!ate) state.snake.pop();  // the tail moves away first
+    var hit = state.snake.some(function(p) { return p[0] === x && p[1] === y; });
+    state.snake.unshift([x, y]);
+    if (hit) {
+      state.running = false;
+      state.dead = true;
+      return 'dead';
+    }
+    if (ate) {
+      state.score += 1;
+      state.food = randomFood(state);
+      return 'ate';
+    }
+    return 'moved';
+  }
+
+  function points(cells) {
+    return {x: cells.map(function(p) { return p[0] + 0.5; }),
+            y: cells.map(function(p) { return p[1] + 0.5; })};
+  }
+
+  function frameDelta(state, event) {
+    var n = state.snake.length;
+    var food = state.food ? points([state.food]) : {x: [null], y: [null]};
+    if (event === 'moved') {
+      var head = points(state.snake.slice(0, 1));
+      return [{x: [head.x], y: [head.y]}, [0], n];
+    }
+    if (event === 'ate' || event === 'reset') {
+      var body = points(event === 'ate' ? state.snake.slice(0, 1) : state.snake.slice().reverse());
+      return [{x: [body.x, food.x], y: [body.y, food.y]}, [0, 1], [n, 1]];
+    }
+    return null;
+  }
+
+  window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    snake: {
+      // outputs: game_state, game_board.extendData, score, tick.disabled, game_events
+      tick: function(nIntervals, start, pause, reset, key, state) {
+        var no = window.dash_clientside.no_update;
+        var triggered = window.dash_clientside.callback_context.triggered;
+        var trigger = triggered && triggered.length ? triggered[0].prop_id.split('.')[0] : 'tick';
+        if (!state) return [no, no, no, no, no];
+
+        if (trigger === 'reset') {
+          var fresh = newGame(state.grid, state.wrap);
+          return [fresh, frameDelta(fresh, 'reset'), 'Score: 0', true, no];
+        }
+        if (trigger === 'start' || trigger === 'pause') {
+          if (state.dead) return [no, no, no, true, no];
+          var toggled = Object.assign({}, state, {running: trigger === 'start'});
+          return [toggled, no, no, !toggled.running, no];
+        }
+        if (trigger === 'key_input') {
+          var dir = KEY_MAP[(key || '').toUpperCase()];
+          if (!dir || OPPOSITE[dir] === state.direction) return [no, no, no, no, no];
+          return [Object.assign({}, state, {direction: dir}), no, no, no, no];
+        }
+
+        var next = copyState(state);
+        var event = step(next);
+        if (event === 'no_op') return [no, no, no, true, no];
+        var delta = frameDelta(next, event);
+        var report = event === 'moved' ? no : {event: event, score: next.score};
+        return [next, delta || no, 'Score: ' + next.score, !next.running, report];
+      }
+    }
+  });
+})();
@@ -0,0 +1,385 @@
+"""Search-based autopilot for the Snake game.
+
+``Autopilot.move(state)`` returns the direction to play next. It accepts the
+dict state of ``game_engine`` and the ``FastSnake`` object of
+``fast_engine``. Per tick it:
+
+  1. follows the cached path to the food while it is still valid (the head is
+     where the path expects it, the food has not moved and the next cell is
+     free); otherwise
+  2. runs a BFS from the head to the food that knows when body cells become
+     free (the segment ``i`` cells from the tail leaves after ``i + 1``
+     moves) and accepts the path only if, after eating, the tail is still
+     reachable from the new head;
+  3. else falls back to a precomputed Hamiltonian cycle (if the grid has
+     one): it moves to the free neighbour furthest ahead on the cycle that
+     neither overtakes the food nor passes its own tail, provided the tail
+     stays reachable after the move;
+  4. else moves one step towards its own tail, or to any free neighbour.
+
+Once the snake fills more than ``cycle_fill`` of the board (and a cycle
+exists) step 2 moves behind step 3 and only its first move is taken: greedy
+food paths scatter a long body across the board, while cycle moves keep it
+in cycle order so the snake can fill the board. A scattered body can still
+trap the cycle (or the tail chase) in a loop that never reaches the food, so
+after a board's worth of ticks without eating the snake first moves to the
+neighbour closest to the food that keeps its tail reachable. Grids with odd
+width and height have no Hamiltonian cycle and rely on steps 2 and 4 only.
+
+Neighbour lists and the Hamiltonian successor of every cell are precomputed
+per grid. Run ``python autopilot.py`` for a moves-per-second benchmark and a
+win-rate report over many seeds.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DIRECTIONS = {
+    'UP': (0, -1),
+    'DOWN': (0, 1),
+    'LEFT': (-1, 0),
+    'RIGHT': (1, 0),
+}
+OPPOSITE = {
+    'UP': 'DOWN',
+    'DOWN': 'UP',
+    'LEFT': 'RIGHT',
+    'RIGHT': 'LEFT'
+}
+
+
+def _load_fast_engine():
+    p = Path(__file__).resolve().parent / 'fast_engine.py'
+    spec = importlib.util.spec_from_file_location('fast_engine', str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def hamiltonian_cycle(grid: Tuple[int, int]) -> Optional[List[int]]:
+    """Successor cell of every cell on a Hamiltonian cycle, or None.
+
+    Needs an even width or height (and both >= 2). Column 0 is the way back,
+    the other columns are swept row by row.
+    """
+    w, h = grid
+    if w < 2 or h < 2:
+        return None
+    transpose = h % 2 == 1
+    if transpose:
+        if w % 2 == 1:
+            return None
+        w, h = h, w
+    order = [(x, 0) for x in range(w)]
+    for y in range(1, h):
+        xs = range(w - 1, 0, -1) if y % 2 == 1 else range(1, w)
+        order.extend((x, y) for x in xs)
+    order.extend((0, y) for y in range(h - 1, 0, -1))
+    if transpose:
+        order = [(y, x) for x, y in order]
+        w, h = h, w
+    succ = [0] * (w * h)
+    for (x, y), (nx, ny) in zip(order, order[1:] + order[:1]):
+        succ[y * w + x] = ny * w + nx
+    return succ
+
+
+class Autopilot:
+    """Plans moves for one grid size / wrap mode; keeps a cached path."""
+
+    def __init__(self, grid: Tuple[int, int], wrap: bool = False, cycle_fill: float = 0.2):
+        self.width, self.height = grid
+        self.cycle_fill = cycle_fill
+        self.wrap = bool(wrap)
+        n = self.width * self.height
+        self.neighbours: List[List[Tuple[int, str]]] = [self._neighbours(c) for c in range(n)]
+        self.hamilton = hamiltonian_cycle(grid)
+        self.cycle_pos: Optional[List[int]] = None
+        if self.hamilton is not None:
+            self.cycle_pos = [0] * n
+            c = 0
+            for i in range(n):
+                self.cycle_pos[c] = i
+                c = self.hamilton[c]
+        self._stamp = 0
+        self._seen = [0] * n
+        self._parent = [0] * n
+        self._path: deque = deque()
+        self._path_food: Optional[int] = None
+        self.plans = 0
+        # ticks since the snake last grew (see ``_approach``)
+        self._length = 0
+        self._hungry = 0
+
+    def _neighbours(self, cell: int) -> List[Tuple[int, str]]:
+        w, h = self.width, self.height
+        x, y = cell % w, cell // w
+        out = []
+        for name, (dx, dy) in DIRECTIONS.items():
+            nx, ny = x + dx, y + dy
+            if self.wrap:
+                nx %= w
+                ny %= h
+            elif not (0 <= nx < w and 0 <= ny < h):
+                continue
+            out.append((ny * w + nx, name))
+        return out
+
+    # -- state access ---------------------------------------------------
+    def _head_food(self, state) -> Tuple[int, Optional[int], str]:
+        w = self.width
+        if isinstance(state, dict):
+            hx, hy = state['snake'][0]
+            food = state.get('food')
+            return hy * w + hx, None if food is None else food[1] * w + food[0], state['direction']
+        return state.body[0], state.food, state.direction
+
+    def _body(self, state) -> List[int]:
+        if isinstance(state, dict):
+            w = self.width
+            return [y * w + x for x, y in state['snake']]
+        return list(state.body)
+
+    # -- search ---------------------------------------------------------
+    def _bfs(self, body: Sequence[int], goal: int, direction: Optional[str]) -> Optional[List[int]]:
+        """Shortest path head -> goal (excluding the head), aware of the body
+        moving on. ``goal`` may be a body cell (e.g. the tail)."""
+        self._stamp += 1
+        stamp = self._stamp
+        seen, parent = self._seen, self._parent
+        n_body = len(body)
+        # body cell -> number of moves until it is free
+        blocked = {c: n_body - i for i, c in enumerate(body)}
+        head = body[0]
+        seen[head] = stamp
+        back = OPPOSITE.get(direction) if direction else None
+        frontier = [head]
+        dist = 0
+        neighbours = self.neighbours
+        while frontier:
+            dist += 1
+            nxt = []
+            for c in frontier:
+                for nb, name in neighbours[c]:
+                    if seen[nb] == stamp or (c == head and name == back):
+                        continue
+                    t = blocked.get(nb)
+                    if t is not None and dist < t:
+                        continue
+                    seen[nb] = stamp
+                    parent[nb] = c
+                    if nb == goal:
+                        path = [nb]
+                        while parent[path[-1]] != head:
+                            path.append(parent[path[-1]])
+                        path.reverse()
+                        return path
+                    nxt.append(nb)
+            frontier = nxt
+        return None
+
+    def _safe_after(self, body: List[int], path: List[int]) -> bool:
+        """Is the tail reachable once the snake has followed ``path`` and eaten?"""
+        grown = (path[::-1] + body)[:len(body) + 1]
+        if len(grown) == self.width * self.height:
+            return True
+        return self._bfs(grown, grown[-1], None) is not None
+
+    def _direction(self, head: int, cell: int) -> str:
+        for nb, name in self.neighbours[head]:
+            if nb == cell:
+                return name
+        raise ValueError('cell is not a neighbour of the head')
+
+    # -- public API -----------------------------------------------------
+    def reset(self):
+        self._path.clear()
+        self._path_food = None
+        self._length = 0
+        self._hungry = 0
+
+    def move(self, state) -> str:
+        """Direction to play for the current state."""
+        head, food, direction = self._head_food(state)
+        length = len(state['snake']) if isinstance(state, dict) else len(state.body)
+        self._hungry = 0 if length != self._length else self._hungry + 1
+        self._length = length
+        path = self._path
+        if path and food == self._path_food and self._next_ok(state, head, path[0]):
+            return self._direction(head, path.popleft())
+
+        self.plans += 1
+        path.clear()
+        body = self._body(state)
+        n_cells = len(self.neighbours)
+        cycle_mode = self.hamilton is not None and len(body) > self.cycle_fill * n_cells
+        if food is not None and not cycle_mode and self._plan_food(body, food, direction):
+            return self._direction(head, path.popleft())
+        if food is not None and self._hungry > n_cells:
+            cell = self._approach(body, food, direction)
+            if cell is not None:
+                return self._direction(head, cell)
+        if self.hamilton is not None:
+            cell = self._cycle_move(body, food, direction)
+            if cell is not None:
+                return self._direction(head, cell)
+        if food is not None and cycle_mode and self._plan_food(body, food, direction):
+            # one step only, so the cycle takes over again as soon as it can
+            cell = path.popleft()
+            path.clear()
+            return self._direction(head, cell)
+        if len(body) > 1:
+            to_tail = self._bfs(body, body[-1], direction)
+            if to_tail is not None:
+                return self._direction(head, to_tail[0])
+        return self._fallback(body, head, direction)
+
+    def _plan_food(self, body: List[int], food: int, direction: str) -> bool:
+        """Cache a shortest path to the food if eating it keeps the tail reachable."""
+        to_food = self._bfs(body, food, direction)
+        if to_food is None or not self._safe_after(body, to_food):
+            return False
+        self._path.extend(to_food)
+        self._path_food = food
+        return True
+
+    def _approach(self, body: List[int], food: int, direction: str) -> Optional[int]:
+        """Neighbour closest to the food after which the tail is still reachable."""
+        occupied = set(body[:-1])
+        back = OPPOSITE.get(direction)
+        best = None
+        for nb, name in self.neighbours[body[0]]:
+            if nb in occupied or name == back:
+                continue
+            moved = [nb] + (body if nb == food else body[:-1])
+            if self._bfs(moved, moved[-1], None) is None:
+                continue
+            to_food = self._bfs(moved, food, name) if nb != food else []
+            if to_food is not None and (best is None or len(to_food) < best[0]):
+                best = (len(to_food), nb)
+        return None if best is None else best[1]
+
+    def _next_ok(self, state, head: int, cell: int) -> bool:
+        if not any(nb == cell for nb, _ in self.neighbours[head]):
+            return False
+        if isinstance(state, dict):
+            w = self.width
+            snake = state['snake']
+            tail = snake[-1][1] * w + snake[-1][0]
+            return cell == tail or all(p[1] * w + p[0] != cell for p in snake)
+        return not state.occupied[cell] or cell == state.body[-1]
+
+    def _cycle_move(self, body: List[int], food: Optional[int], direction: str) -> Optional[int]:
+        """Next cell along the Hamiltonian cycle, shortcutting towards the food."""
+        n = self.width * self.height
+        pos = self.cycle_pos
+        head, tail = body[0], body[-1]
+        ahead = lambda c: (pos[c] - pos[head]) % n  # noqa: E731
+        limit_tail = ahead(tail) if len(body) > 1 else n
+        limit_food = ahead(food) if food is not None else n
+        occupied = set(body[:-1])
+        back = OPPOSITE.get(direction)
+        candidates = []
+        for nb, name in self.neighbours[head]:
+            if nb in occupied or name == back:
+                continue
+            d = ahead(nb)
+            if d <= limit_food and (d < limit_tail or d == 1):
+                candidates.append((d, nb))
+        for d, nb in sorted(candidates, reverse=True):
+            # eating on the way keeps the tail where it is
+            moved = [nb] + (body if nb == food else body[:-1])
+            if len(body) < 2 or self._bfs(moved, moved[-1], None) is not None:
+                return nb
+        return None
+
+    def _fallback(self, body: List[int], head: int, direction: str) -> str:
+        occupied = set(body[:-1])
+        for nb, name in self.neighbours[head]:
+            if nb not in occupied and name != OPPOSITE.get(direction):
+                return name
+        return direction
+
+
+# -- evaluation ---------------------------------------------------------
+def play(grid: Tuple[int, int] = (20, 20), seed: Optional[int] = None, wrap: bool = False,
+         max_ticks: Optional[int] = None, engine=None) -> Dict[str, object]:
+    """Play one game on the fast engine; returns score, outcome and timings."""
+    engine = engine or _load_fast_engine()
+    game = engine.new_game(grid, init_length=3, wrap=wrap, seed=seed)
+    game.running = True
+    pilot = Autopilot(grid, wrap)
+    n_cells = grid[0] * grid[1]
+    max_ticks = max_ticks or n_cells * n_cells
+    # give up if no food was eaten for a full tour of the board
+    stall_limit = 2 * n_cells
+    since_meal = 0
+    ticks = 0
+    plan_time = 0.0
+    outcome = 'timeout'
+    while ticks < max_ticks:
+        start = time.perf_counter()
+        direction = pilot.move(game)
+        plan_time += time.perf_counter() - start
+        event = game.step(direction)
+        ticks += 1
+        if event == 'dead':
+            outcome = 'dead'
+            break
+        if event == 'ate':
+            since_meal = 0
+            if game.food is None:
+                outcome = 'won'
+                break
+        else:
+            since_meal += 1
+            if since_meal > stall_limit:
+                outcome = 'stalled'
+                break
+    return {'seed': seed, 'score': game.score, 'length': len(game), 'ticks': ticks,
+            'outcome': outcome, 'fill': len(game) / n_cells, 'plans': pilot.plans,
+            'plan_ms_per_tick': 1000.0 * plan_time / max(ticks, 1)}
+
+
+def evaluate(n_games: int = 20, grid: Tuple[int, int] = (20, 20), wrap: bool = False,
+             seed: int = 0, max_ticks: Optional[int] = None) -> Dict[str, object]:
+    """Win-rate report over ``n_games`` seeds plus moves-per-second throughput."""
+    engine = _load_fast_engine()
+    start = time.perf_counter()
+    games = [play(grid, seed + i, wrap, max_ticks, engine) for i in range(n_games)]
+    elapsed = time.perf_counter() - start
+    ticks = sum(g['ticks'] for g in games)
+    outcomes = [g['outcome'] for g in games]
+    return {
+        'games': games,
+        'grid': list(grid),
+        'win_rate': outcomes.count('won') / n_games,
+        'outcomes': {o: outcomes.count(o) for o in sorted(set(outcomes))},
+        'mean_score': sum(g['score'] for g in games) / n_games,
+        'mean_fill': sum(g['fill'] for g in games) / n_games,
+        'moves_per_sec': ticks / elapsed if elapsed > 0 else float('inf'),
+        'max_plan_ms_per_tick': max(g['plan_ms_per_tick'] for g in games),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description='Autopilot benchmark and win-rate report')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--grid', type=int, nargs=2, default=(20, 20), metavar=('W', 'H'))
+    parser.add_argument('--wrap', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    report = evaluate(args.games, tuple(args.grid), args.wrap, args.seed)
+    print(f"grid {args.grid[0]}x{args.grid[1]}  games {args.games}  win rate {report['win_rate']:.0%}  "
+          f"outcomes {report['outcomes']}")
+    print(f"mean score {report['mean_score']:.1f}  mean fill {report['mean_fill']:.0%}  "
+          f"{report['moves_per_sec']:,.0f} moves/s  max plan {report['max_plan_ms_per_tick']:.3f} ms/tick")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,35 +3,118 @@
 This file is intentionally self-contained and uses the local `game_engine.py` via
 importlib to avoid package import issues when running from the repo
 directory (folder name contains a space on disk).
+
+Two modes (``create_app(mode=...)`` or ``SNAKE_MODE``):
+
+  - 'client' (default): the tick and render loop run in the browser
+    (``assets/snake_client.js``, clientside callbacks); the server only
+    receives score events ('ate' / 'dead') and keeps the best score.
+  - 'server': games live in a ``sessions.SessionManager`` and are batch-
+    stepped by its ticker thread; the browser holds only its session id
+    (``dcc.Store(id='session')``) and polls for frames.
+
+In both modes the board figure is built once; frames are sent as
+``extendData`` deltas (see ``frame_delta``): a move appends the new head and
+caps the snake trace at the snake's length, which drops the old tail. While
+a game is paused or over the interval is disabled, so idle players cost
+nothing.
 """
 from __future__ import annotations
 
 import importlib.util
 from pathlib import Path
-import json
 import os
+import threading
+from typing import Dict, List, Optional
 
 try:
     import dash
-    from dash import dcc, html, Input, Output, State
+    from dash import dcc, html, Input, Output, State, ClientsideFunction
     import plotly.graph_objs as go
 except Exception:  # pragma: no cover - optional dependency
     dash = None
 
+KEY_MAP = {'ARROWLEFT': 'LEFT', 'LEFT': 'LEFT', 'A': 'LEFT',
+           'ARROWRIGHT': 'RIGHT', 'RIGHT': 'RIGHT', 'D': 'RIGHT',
+           'ARROWUP': 'UP', 'UP': 'UP', 'W': 'UP',
+           'ARROWDOWN': 'DOWN', 'DOWN': 'DOWN', 'S': 'DOWN'}
+MAX_SPEED = 30  # ticks per second
 
-def _load_game_engine():
-    p = Path(__file__).resolve().parent / 'game_engine.py'
-    spec = importlib.util.spec_from_file_location('game_engine', str(p))
+
+def _load_module(name: str):
+    p = Path(__file__).resolve().parent / f'{name}.py'
+    spec = importlib.util.spec_from_file_location(name, str(p))
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)
     return mod
 
 
-def create_app():
+def _load_game_engine():
+    return _load_module('game_engine')
+
+
+def _points(cells) -> Dict[str, List[float]]:
+    return {'x': [p[0] + 0.5 for p in cells], 'y': [p[1] + 0.5 for p in cells]}
+
+
+def board_figure(state: Dict[str, object]):
+    """Static board: trace 0 is the snake (tail first), trace 1 the food."""
+    w, h = state['grid']
+    food = state.get('food')
+    fig = go.Figure()
+    fig.update_xaxes(range=[0, w], showgrid=True, dtick=1, zeroline=False, showticklabels=False, fixedrange=True)
+    # row 0 is the top row ('UP' decreases y)
+    fig.update_yaxes(range=[h, 0], showgrid=True, dtick=1, zeroline=False, showticklabels=False,
+                     scaleanchor='x', fixedrange=True)
+    fig.add_trace(go.Scatter(**_points(state['snake'][::-1]), mode='markers',
+                             marker=dict(size=40, color='black'), showlegend=False))
+    fig.add_trace(go.Scatter(**_points([food] if food else []), mode='markers',
+                             marker=dict(size=20, color='red'), showlegend=False))
+    fig.update_layout(plot_bgcolor='white', margin=dict(l=10, r=10, t=30, b=10), uirevision='board')
+    return fig
+
+
+def frame_delta(state: Dict[str, object], event: str) -> Optional[list]:
+    """``extendData`` payload for the frame after ``event``, or None.
+
+    'moved' sends the new head only; 'ate' also the new food; 'reset'
+    redraws the whole snake. ``maxPoints`` equal to the snake length makes
+    Plotly drop the points beyond the tail.
+    """
+    snake = state['snake']
+    food = state.get('food')
+    food_pt = _points([food]) if food else {'x': [None], 'y': [None]}
+    if event == 'moved':
+        head = _points(snake[:1])
+        return [{'x': [head['x']], 'y': [head['y']]}, [0], len(snake)]
+    if event in ('ate', 'reset'):
+        body = _points(snake[:1] if event == 'ate' else snake[::-1])
+        return [{'x': [body['x'], food_pt['x']], 'y': [body['y'], food_pt['y']]}, [0, 1], [len(snake), 1]]
+    return None
+
+
+def _client_state(state: Dict[str, object]) -> Dict[str, object]:
+    """The fields the browser engine needs (no free-cell index)."""
+    keys = ('grid', 'snake', 'direction', 'food', 'score', 'running', 'wrap')
+    return {k: state.get(k) for k in keys}
+
+
+def session_delta(game, steps: int, event: str) -> Optional[list]:
+    """Frame delta for a polled session game (``SessionManager.poll``)."""
+    if steps == 0 or (steps == 1 and event == 'dead'):
+        return None
+    state = game.to_state()
+    return frame_delta(state, event if steps == 1 and event in ('moved', 'ate') else 'reset')
+
+
+def create_app(mode: Optional[str] = None, sessions=None):
     if dash is None:
         print('Dash not installed. Install dash to run the Snake demo.')
         return None
 
+    mode = mode or os.environ.get('SNAKE_MODE', 'client')
+    if mode not in ('client', 'server'):
+        raise ValueError(f'unknown mode {mode!r}')
     mod = _load_game_engine()
 
     app = dash.Dash(__name__)
@@ -41,79 +124,78 @@ def create_app():
 
     app.layout = html.Div([
         html.H3('AI Snake — Nokia 3210 style demo'),
-        html.Div(id='score', children='Score: 0'),
+        html.Div([html.Span(id='score', children='Score: 0'), html.Span(id='best', children='')],
+                 style={'display': 'flex', 'gap': '16px'}),
         html.Div([
             html.Button('Start', id='start', n_clicks=0),
             html.Button('Pause', id='pause', n_clicks=0),
             html.Button('Reset', id='reset', n_clicks=0),
             html.Label('Speed:'),
-            dcc.Slider(id='speed', min=1, max=20, step=1, value=8),
+            dcc.Slider(id='speed', min=1, max=MAX_SPEED, step=1, value=8),
         ], style={'display': 'flex', 'gap': '8px', 'alignItems': 'center'}),
         dcc.Input(id='key_input', type='text', value='', style={'display': 'none'}),
-        dcc.Store(id='game_state', data=initial_state),
-        dcc.Interval(id='tick', interval=200, n_intervals=0),
-        dcc.Graph(id='game_board', style={'width': '420px', 'height': '420px'})
+        dcc.Store(id='game_state', data=_client_state(initial_state) if mode == 'client' else None),
+        dcc.Store(id='session', storage_type='session'),
+        dcc.Store(id='game_events'),
+        dcc.Interval(id='tick', interval=125, n_intervals=0, disabled=True),
+        dcc.Graph(id='game_board', figure=board_figure(initial_state), config={'displayModeBar': False},
+                  style={'width': '420px', 'height': '420px'})
     ])
 
-    @app.callback(Output('game_state', 'data'), [Input('tick', 'n_intervals'), Input('start', 'n_clicks'), Input('pause', 'n_clicks'), Input('reset', 'n_clicks'), Input('key_input', 'value')], State('game_state', 'data'), State('speed', 'value'))
-    def tick(n_intervals, start_clicks, pause_clicks, reset_clicks, key_val, state, speed):
-        # simple event prioritisation: reset > start/pause toggles > key
-        if state is None:
-            state = initial_state
-
-        if reset_clicks:
-            ns = mod.new_game(state['grid'], init_length=3, wrap=state.get('wrap', False))
-            ns['running'] = False
-            return ns
-
-        # start/pause handling (start if start_clicks > pause_clicks)
-        if start_clicks and start_clicks > pause_clicks:
-            state['running'] = True
-        if pause_clicks and pause_clicks >= start_clicks:
-            state['running'] = False
-
-        # handle keyboard
-        if key_val:
-            key = key_val.upper()
-            mapping = {'ARROWLEFT': 'LEFT', 'LEFT': 'LEFT', 'A': 'LEFT',
-                       'ARROWRIGHT': 'RIGHT', 'RIGHT': 'RIGHT', 'D': 'RIGHT',
-                       'ARROWUP': 'UP', 'UP': 'UP', 'W': 'UP',
-                       'ARROWDOWN': 'DOWN', 'DOWN': 'DOWN', 'S': 'DOWN'}
-            new_dir = mapping.get(key)
+    app.clientside_callback('function(speed) { return 1000 / (speed || 1); }',
+                            Output('tick', 'interval'), Input('speed', 'value'))
+
+    game_inputs = [Input('tick', 'n_intervals'), Input('start', 'n_clicks'), Input('pause', 'n_clicks'),
+                   Input('reset', 'n_clicks'), Input('key_input', 'value')]
+    if mode == 'client':
+        app.clientside_callback(ClientsideFunction(namespace='snake', function_name='tick'),
+                                Output('game_state', 'data'), Output('game_board', 'extendData'),
+                                Output('score', 'children'), Output('tick', 'disabled'),
+                                Output('game_events', 'data'),
+                                *game_inputs, State('game_state', 'data'))
+        stats = {'games': 0, 'best': 0}
+        lock = threading.Lock()
+
+        @app.callback(Output('best', 'children'), Input('game_events', 'data'), prevent_initial_call=True)
+        def record(event):
+            # the only server work in client mode: one request per meal / death
+            with lock:
+                if event and event.get('event') == 'dead':
+                    stats['games'] += 1
+                if event:
+                    stats['best'] = max(stats['best'], int(event.get('score', 0)))
+                return f"Best: {stats['best']} ({stats['games']} games)"
+
+        return app
+
+    if sessions is None:
+        sessions = _load_module('sessions').SessionManager(initial_state['grid'], initial_state.get('wrap', False))
+        sessions.start_ticker()
+    app.sessions = sessions
+
+    @app.callback(Output('session', 'data'), Output('game_board', 'extendData'),
+                  Output('score', 'children'), Output('tick', 'disabled'),
+                  *game_inputs, Input('speed', 'value'), State('session', 'data'))
+    def tick(n_intervals, start_clicks, pause_clicks, reset_clicks, key_val, speed, sid):
+        # the ticker thread steps the games; this callback applies input and polls a frame
+        trigger = dash.ctx.triggered_id
+        new = sid not in sessions
+        if new:
+            sid = sessions.create()
+        elif trigger == 'reset':
+            sessions.reset(sid)
+        elif trigger in ('start', 'pause'):
+            (sessions.start if trigger == 'start' else sessions.pause)(sid)
+        elif trigger == 'key_input':
+            new_dir = KEY_MAP.get((key_val or '').upper())
             if new_dir:
-                state = mod.change_direction(state, new_dir)
-
-        # perform step on tick
-        new_state, ev = mod.step_game(state)
-        return new_state
-
-    @app.callback(Output('game_board', 'figure'), Output('score', 'children'), Input('game_state', 'data'))
-    def render(state):
-        if state is None:
-            return {}, 'Score: 0'
-
-        w, h = state['grid']
-        snake = state['snake']
-        food = state.get('food')
-
-        xs = [p[0] + 0.5 for p in snake]
-        ys = [p[1] + 0.5 for p in snake]
-
-        fig = go.Figure()
-        # draw grid background
-        fig.update_xaxes(range=[0, w], showgrid=True, dtick=1, zeroline=False, showticklabels=False)
-        fig.update_yaxes(range=[0, h], showgrid=True, dtick=1, zeroline=False, showticklabels=False, scaleanchor='x')
-
-        # snake body
-        fig.add_trace(go.Scatter(x=xs, y=ys, mode='markers', marker=dict(size=40, color='black'), showlegend=False))
-
-        # food
-        if food:
-            fig.add_trace(go.Scatter(x=[food[0] + 0.5], y=[food[1] + 0.5], mode='markers', marker=dict(size=20, color='red')))
+                sessions.change_direction(sid, new_dir)
+        if speed:
+            sessions.set_speed(sid, speed)
 
-        fig.update_layout(plot_bgcolor='white', margin=dict(l=10, r=10, t=30, b=10))
-        score_text = f"Score: {state.get('score', 0)}"
-        return fig, score_text
+        game, steps, event = sessions.poll(sid)
+        delta = frame_delta(game.to_state(), 'reset') if new else session_delta(game, steps, event)
+        return sid, delta if delta is not None else dash.no_update, f'Score: {game.score}', not game.running
 
     return app
 
@@ -0,0 +1,204 @@
+"""Compact Snake engine with O(1) moves, collision checks and food placement.
+
+Same rules as ``game_engine.step_game``, but the state is a mutable
+``FastSnake`` object instead of a dict:
+
+  - body: deque of cell indices (y * width + x), head at the left
+  - occupied: bytearray of width * height, 1 where the snake is
+  - free / free_pos: dense list of free cells plus each cell's position in
+    it (-1 if occupied); cells are added and swap-removed in O(1)
+  - rng: ``random.Random(seed)``, so food placement is reproducible
+
+``FastSnake.from_state`` / ``to_state`` convert from and to the dict state
+(including its ``seed``: ``to_state`` draws one from a copy of the RNG, so a
+round trip keeps food placement reproducible), and the module-level ``new_game`` / ``change_direction`` / ``step_game``
+mirror the functional API of ``game_engine`` (but update the object in place).
+
+Like ``game_engine`` this file is self-contained so it can be loaded with
+importlib from a folder whose name contains a space.
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+Coord = Tuple[int, int]
+
+DIRECTIONS = {
+    'UP': (0, -1),
+    'DOWN': (0, 1),
+    'LEFT': (-1, 0),
+    'RIGHT': (1, 0),
+}
+OPPOSITE = {
+    'UP': 'DOWN',
+    'DOWN': 'UP',
+    'LEFT': 'RIGHT',
+    'RIGHT': 'LEFT'
+}
+
+
+class FastSnake:
+    """Mutable Snake state; see the module docstring for the layout."""
+
+    __slots__ = ('width', 'height', 'wrap', 'body', 'occupied', 'free', 'free_pos',
+                 'direction', 'food', 'score', 'running', 'rng')
+
+    def __init__(self, grid: Tuple[int, int], snake: List[Coord], direction: str = 'RIGHT',
+                 food: Optional[Coord] = None, score: int = 0, running: bool = False,
+                 wrap: bool = False, seed: Optional[int] = None):
+        w, h = grid
+        self.width = w
+        self.height = h
+        self.wrap = bool(wrap)
+        self.direction = direction
+        self.score = int(score)
+        self.running = bool(running)
+        self.rng = random.Random(seed)
+        self.body = deque(y * w + x for x, y in snake)
+        self.occupied = bytearray(w * h)
+        for cell in self.body:
+            self.occupied[cell] = 1
+        self.free = array('i', (c for c in range(w * h) if not self.occupied[c]))
+        self.free_pos = array('i', [-1]) * (w * h)
+        for i, c in enumerate(self.free):
+            self.free_pos[c] = i
+        self.food = None if food is None else food[1] * w + food[0]
+
+    # -- construction / adapters ----------------------------------------
+    @classmethod
+    def new(cls, grid: Tuple[int, int] = (11, 11), init_length: int = 3, wrap: bool = False,
+            seed: Optional[int] = None) -> 'FastSnake':
+        """Fresh game, laid out like ``game_engine.new_game``; food from the seeded RNG."""
+        w, h = grid
+        snake = [(w // 2 - i, h // 2) for i in range(init_length)]
+        game = cls(grid, snake, 'RIGHT', None, 0, False, wrap, seed)
+        game.food = game._random_free()
+        return game
+
+    @classmethod
+    def from_state(cls, state: Dict[str, object], seed: Optional[int] = None) -> 'FastSnake':
+        """Game for a dict state; ``seed`` defaults to the state's own."""
+        food = state.get('food')
+        if seed is None:
+            seed = state.get('seed')
+        return cls(tuple(state['grid']), [tuple(p) for p in state['snake']], state['direction'],
+                   tuple(food) if food is not None else None, state.get('score', 0),
+                   state.get('running', False), state.get('wrap', False), seed)
+
+    def to_state(self) -> Dict[str, object]:
+        """Dict state as used by ``game_engine`` (O(length))."""
+        return {
+            'grid': (self.width, self.height),
+            'snake': self.snake,
+            'direction': self.direction,
+            'food': self.coord(self.food) if self.food is not None else None,
+            'score': self.score,
+            'running': self.running,
+            'wrap': self.wrap,
+            'seed': self._next_seed(),
+        }
+
+    def _next_seed(self) -> int:
+        # drawn from a copy, so converting does not change this game's food
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        return rng.getrandbits(32)
+
+    # -- queries --------------------------------------------------------
+    def coord(self, cell: int) -> Coord:
+        return cell % self.width, cell // self.width
+
+    @property
+    def head(self) -> Coord:
+        return self.coord(self.body[0])
+
+    @property
+    def snake(self) -> List[Coord]:
+        return [self.coord(c) for c in self.body]
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        return bool(self.occupied[y * self.width + x])
+
+    # -- free-cell index ------------------------------------------------
+    def _take(self, cell: int):
+        i = self.free_pos[cell]
+        last = self.free.pop()
+        if last != cell:
+            self.free[i] = last
+            self.free_pos[last] = i
+        self.free_pos[cell] = -1
+
+    def _release(self, cell: int):
+        self.free_pos[cell] = len(self.free)
+        self.free.append(cell)
+
+    def _random_free(self) -> Optional[int]:
+        if not self.free:
+            return None
+        return self.free[self.rng.randrange(len(self.free))]
+
+    # -- rules ----------------------------------------------------------
+    def change_direction(self, new_dir: str) -> 'FastSnake':
+        if new_dir in OPPOSITE and OPPOSITE[new_dir] != self.direction:
+            self.direction = new_dir
+        return self
+
+    def step(self, input_dir: Optional[str] = None) -> str:
+        """Advance one tick in place; returns 'moved', 'ate', 'dead' or 'no_op'."""
+        if not self.running:
+            return 'no_op'
+        direction = self.direction
+        if input_dir is not None and input_dir in OPPOSITE and OPPOSITE[input_dir] != direction:
+            direction = input_dir
+        dx, dy = DIRECTIONS[direction]
+        w = self.width
+        head = self.body[0]
+        x = head % w + dx
+        y = head // w + dy
+        if self.wrap:
+            x %= w
+            y %= self.height
+        elif not (0 <= x < w and 0 <= y < self.height):
+            self.running = False
+            return 'dead'
+
+        new = y * w + x
+        ate = new == self.food
+        body = self.body
+        if not ate:
+            # the tail moves away first, so following it is allowed
+            tail = body.pop()
+            self.occupied[tail] = 0
+            self._release(tail)
+        body.appendleft(new)
+        self.direction = direction
+        if self.occupied[new]:
+            self.running = False
+            return 'dead'
+        self.occupied[new] = 1
+        self._take(new)
+        if ate:
+            self.score += 1
+            self.food = self._random_free()
+            return 'ate'
+        return 'moved'
+
+
+def new_game(grid: Tuple[int, int] = (11, 11), init_length: int = 3, wrap: bool = False,
+             seed: Optional[int] = None) -> FastSnake:
+    return FastSnake.new(grid, init_length, wrap, seed)
+
+
+def change_direction(state: FastSnake, new_dir: str) -> FastSnake:
+    return state.change_direction(new_dir)
+
+
+def step_game(state: FastSnake, input_dir: Optional[str] = None) -> Tuple[FastSnake, str]:
+    """Functional-style wrapper; unlike ``game_engine`` the state is updated in place."""
+    return state, state.step(input_dir)
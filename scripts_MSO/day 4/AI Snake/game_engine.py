@@ -8,8 +8,26 @@ State representation (dict):
   - score: int
   - running: bool
   - wrap: bool
+  - seed: int, RNG seed for the next food placement (advanced on every meal;
+    derived from the snake if missing)
+  - free_index: optional free-cell index, built on the first step (see below)
 
 Functions are pure / functional where convenient to make testing straightforward.
+
+Free-cell index: ``free_index`` marks the free cells (y * width + x) in
+``free`` (1 free, 0 snake) and keeps their prefix counts in a Fenwick tree
+``tree``. A move updates two cells in O(log(width * height)), and food goes
+to the k-th free cell in cell order, also found in O(log(width * height)),
+so neither the collision check nor food placement scans the grid and the
+food depends only on the snake and the seed, not on the index's history.
+To keep steps cheap the index object is handed on from a state to the one
+``step_game`` returns and updated in place: afterwards it describes only the
+newest state, so the input state's ``free_index`` is invalidated by the step
+(its other fields are never modified). ``sync`` is a fingerprint of the whole
+snake that the index describes, so stepping an older state again, a state
+whose snake was edited by hand or a state without an index rebuilds it
+(O(width * height)) instead of trusting it. Everything is plain lists and
+strings, so states stay JSON-friendly.
 """
 from __future__ import annotations
 
@@ -28,6 +46,10 @@ OPPOSITE = {
 }
 
 
+def _coord(cell: int, w: int) -> Coord:
+    return cell % w, cell // w
+
+
 def _in_bounds(x: int, y: int, grid: Tuple[int, int]) -> bool:
     w, h = grid
     return 0 <= x < w and 0 <= y < h
@@ -62,10 +84,85 @@ def new_game(grid: Tuple[int, int] = (11, 11), init_length: int = 3, wrap: bool
         'food': food,
         'score': 0,
         'running': False,
-        'wrap': wrap
+        'wrap': wrap,
+        'seed': rng.getrandbits(32)
     }
 
 
+def _cell(p, w: int) -> int:
+    return p[1] * w + p[0]
+
+
+def _sync(snake: List[Coord]) -> str:
+    """Fingerprint of a snake given as a list of (x, y) tuples.
+
+    Hashing the body is O(length), like the list copy every step makes anyway.
+    Stored as a hex string (a 64-bit int would lose precision in JSON/JS).
+    """
+    return format(hash(tuple(snake)) & 0xFFFFFFFFFFFFFFFF, 'x')
+
+
+def build_free_index(snake, grid: Tuple[int, int]) -> Dict[str, list]:
+    """Free-cell index for ``snake`` on ``grid`` (O(width * height))."""
+    w, h = grid
+    n = w * h
+    free = [1] * n
+    for p in snake:
+        free[_cell(p, w)] = 0
+    # Fenwick tree built in O(n): tree[i] sums free[i - (i & -i):i]
+    tree = [0] + free
+    for i in range(1, n + 1):
+        j = i + (i & -i)
+        if j <= n:
+            tree[j] += tree[i]
+    return {'free': free, 'tree': tree, 'count': sum(free), 'sync': _sync([tuple(p) for p in snake])}
+
+
+def _free_index(state: State, snake: List[Coord]) -> Dict[str, list]:
+    """The state's index if it describes ``snake`` (tuples), else a new one."""
+    w, h = state['grid']
+    index = state.get('free_index')
+    if index is None or len(index['free']) != w * h or index.get('sync') != _sync(snake):
+        index = build_free_index(snake, (w, h))
+    return index
+
+
+def _update(index: Dict[str, list], cell: int, value: int):
+    delta = value - index['free'][cell]
+    if not delta:
+        return
+    index['free'][cell] = value
+    index['count'] += delta
+    tree = index['tree']
+    i = cell + 1
+    while i < len(tree):
+        tree[i] += delta
+        i += i & -i
+
+
+def _take(index: Dict[str, list], cell: int):
+    _update(index, cell, 0)
+
+
+def _release(index: Dict[str, list], cell: int):
+    _update(index, cell, 1)
+
+
+def _nth_free(index: Dict[str, list], k: int) -> int:
+    """The ``k``-th free cell (0-based) in cell order."""
+    tree = index['tree']
+    n = len(tree) - 1
+    cell = 0
+    step = 1 << n.bit_length()
+    while step:
+        nxt = cell + step
+        if nxt <= n and tree[nxt] <= k:
+            cell = nxt
+            k -= tree[nxt]
+        step >>= 1
+    return cell
+
+
 def change_direction(state: State, new_dir: str) -> State:
     """Return new state with direction changed if not opposite.
 
@@ -124,32 +221,42 @@ def step_game(state: State, input_dir: Optional[str] = None) -> Tuple[State, str
             s['running'] = False
             return s, 'dead'
 
-    # check self collision
+    # check self collision with the free-cell index
     # note: tail will move unless we eat food; collision with tail that is moving off is allowed in that case
-    # easiest approach: compute next snake body and check duplicates
-    ate = new_head == tuple(state['food'])
+    food = state.get('food')
+    ate = food is not None and new_head == tuple(food)
+    index = _free_index(state, snake)
 
     if ate:
         new_snake = [new_head] + snake
     else:
         new_snake = [new_head] + snake[:-1]
+        _release(index, _cell(snake[-1], w))
 
-    if len(set(new_snake)) != len(new_snake):
+    new_cell = _cell(new_head, w)
+    s['free_index'] = index
+    if not index['free'][new_cell]:
+        index['sync'] = None  # no longer matches any state; rebuilt on demand
         s['running'] = False
         s['snake'] = new_snake
         s['direction'] = direction
         return s, 'dead'
 
+    _take(index, new_cell)
+    index['sync'] = _sync(new_snake)
     # update state
     s['snake'] = new_snake
     s['direction'] = direction
 
     if ate:
         s['score'] = int(state['score']) + 1
-        # place new food in free cell
-        rng = random.Random()
-        free_cells = [(x, y) for x in range(w) for y in range(h) if (x, y) not in new_snake]
-        s['food'] = rng.choice(free_cells) if free_cells else None
+        # place new food in a free cell, reproducibly from the state's seed
+        # (a state without one derives it from its snake)
+        seed = state.get('seed')
+        rng = random.Random(int(_sync(snake), 16) if seed is None else seed)
+        count = index['count']
+        s['food'] = _coord(_nth_free(index, rng.randrange(count)), w) if count else None
+        s['seed'] = rng.getrandbits(32)
         return s, 'ate'
 
     return s, 'moved'
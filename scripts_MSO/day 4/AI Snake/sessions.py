@@ -0,0 +1,290 @@
+"""Server-side session store for many concurrent Snake players.
+
+``SessionManager`` keeps one compact ``FastSnake`` per session id; clients
+only ever hold the id, so they cannot edit their game. Inputs are queued and
+applied on the session's next step. Games advance in batches:
+
+  - ``step_all()`` moves every running session one tick
+  - ``step_due(now)`` moves the running sessions whose own tick interval
+    (``1 / speed``) has elapsed; ``start_ticker`` calls it from a daemon
+    thread together with ``expire``
+
+Sessions not touched (polled or given input) for ``ttl`` seconds are
+dropped by ``expire``. Only running sessions are visited per tick, so paused
+and finished games cost nothing but their memory. A finished game stays over
+until ``reset``: the engine does not clean up after a collision, so ``start``
+refuses to resume it.
+
+Run ``python sessions.py --sessions 1000`` for a load test.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import secrets
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+def _load_fast_engine():
+    p = Path(__file__).resolve().parent / 'fast_engine.py'
+    spec = importlib.util.spec_from_file_location('fast_engine', str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class Session:
+    """One player's game plus scheduling and polling bookkeeping."""
+
+    __slots__ = ('game', 'speed', 'pending', 'last_seen', 'next_due', 'ticks', 'polled_ticks', 'last_event',
+                 'dead')
+
+    def __init__(self, game, speed: float, now: float):
+        self.game = game
+        self.speed = float(speed)
+        self.pending: Optional[str] = None
+        self.last_seen = now
+        self.next_due = now
+        self.ticks = 0
+        self.polled_ticks = 0
+        self.last_event = 'no_op'
+        self.dead = False
+
+
+class SessionManager:
+    """Compact engine states keyed by session id; see the module docstring."""
+
+    def __init__(self, grid: Tuple[int, int] = (11, 11), wrap: bool = False, init_length: int = 3,
+                 ttl: float = 300.0, max_sessions: Optional[int] = None, speed: float = 8.0,
+                 clock: Callable[[], float] = time.monotonic, engine=None):
+        self.grid = tuple(grid)
+        self.wrap = bool(wrap)
+        self.init_length = init_length
+        self.ttl = float(ttl)
+        self.max_sessions = max_sessions
+        self.speed = float(speed)
+        self.clock = clock
+        self.engine = engine or _load_fast_engine()
+        self._sessions: Dict[str, Session] = {}
+        self._running: Dict[str, Session] = {}
+        self._lock = threading.RLock()
+        self._ticker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # -- lifecycle ------------------------------------------------------
+    def create(self, seed: Optional[int] = None) -> str:
+        """New paused game; returns its session id."""
+        now = self.clock()
+        with self._lock:
+            if self.max_sessions is not None and len(self._sessions) >= self.max_sessions:
+                self.expire(now)
+                if len(self._sessions) >= self.max_sessions:
+                    raise RuntimeError('session limit reached')
+            sid = secrets.token_urlsafe(12)
+            game = self.engine.new_game(self.grid, self.init_length, self.wrap, seed)
+            self._sessions[sid] = Session(game, self.speed, now)
+        return sid
+
+    def __contains__(self, sid) -> bool:
+        return sid in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def n_running(self) -> int:
+        return len(self._running)
+
+    def _touch(self, sid: str) -> Session:
+        session = self._sessions.get(sid)
+        if session is None:
+            raise KeyError(sid)
+        session.last_seen = self.clock()
+        return session
+
+    def game(self, sid: str):
+        """The session's ``FastSnake`` (marks the session as active)."""
+        with self._lock:
+            return self._touch(sid).game
+
+    def remove(self, sid: str):
+        with self._lock:
+            self._sessions.pop(sid, None)
+            self._running.pop(sid, None)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop sessions idle for more than ``ttl`` seconds; returns how many."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            stale = [sid for sid, s in self._sessions.items() if now - s.last_seen > self.ttl]
+            for sid in stale:
+                del self._sessions[sid]
+                self._running.pop(sid, None)
+        return len(stale)
+
+    # -- player input ---------------------------------------------------
+    def start(self, sid: str) -> bool:
+        """Run a paused game; False (and nothing changes) if the game is over."""
+        with self._lock:
+            session = self._touch(sid)
+            if session.dead:
+                return False
+            session.game.running = True
+            session.next_due = self.clock()
+            self._running[sid] = session
+            return True
+
+    def pause(self, sid: str):
+        with self._lock:
+            self._touch(sid).game.running = False
+            self._running.pop(sid, None)
+
+    def reset(self, sid: str, seed: Optional[int] = None):
+        """Fresh paused game in the same session."""
+        with self._lock:
+            session = self._touch(sid)
+            session.game = self.engine.new_game(self.grid, self.init_length, self.wrap, seed)
+            session.pending = None
+            session.dead = False
+            session.ticks += 1  # forces a full redraw on the next poll
+            session.last_event = 'reset'
+            self._running.pop(sid, None)
+
+    def change_direction(self, sid: str, direction: str):
+        """Queue a turn; it is applied (or ignored if reversing) on the next step."""
+        with self._lock:
+            self._touch(sid).pending = direction
+
+    def set_speed(self, sid: str, speed: float):
+        with self._lock:
+            self._touch(sid).speed = max(float(speed), 1e-3)
+
+    def poll(self, sid: str) -> Tuple[object, int, str]:
+        """(game, ticks since the previous poll, last event) for rendering."""
+        with self._lock:
+            session = self._touch(sid)
+            steps = session.ticks - session.polled_ticks
+            session.polled_ticks = session.ticks
+            return session.game, steps, session.last_event
+
+    # -- batch stepping -------------------------------------------------
+    def _step(self, sid: str, session: Session) -> str:
+        event = session.game.step(session.pending)
+        session.pending = None
+        session.ticks += 1
+        session.last_event = event
+        if event == 'dead':
+            session.dead = True
+        if not session.game.running:
+            del self._running[sid]
+        return event
+
+    def step_all(self) -> Dict[str, str]:
+        """One tick for every running session; returns session id -> event."""
+        with self._lock:
+            return {sid: self._step(sid, s) for sid, s in list(self._running.items())}
+
+    def step_due(self, now: Optional[float] = None) -> Dict[str, str]:
+        """One tick for each running session whose tick interval has elapsed."""
+        now = self.clock() if now is None else now
+        events = {}
+        with self._lock:
+            for sid, s in list(self._running.items()):
+                if now >= s.next_due:
+                    # no catch-up bursts after a stall: schedule from now
+                    s.next_due = max(s.next_due + 1.0 / s.speed, now)
+                    events[sid] = self._step(sid, s)
+        return events
+
+    def start_ticker(self, period: float = 1 / 60, expire_every: float = 10.0) -> threading.Thread:
+        """Daemon thread calling ``step_due`` every ``period`` seconds."""
+        if self._ticker is not None and self._ticker.is_alive():
+            return self._ticker
+        self._stop.clear()
+
+        def run():
+            last_expire = self.clock()
+            while not self._stop.wait(period):
+                now = self.clock()
+                self.step_due(now)
+                if now - last_expire >= expire_every:
+                    self.expire(now)
+                    last_expire = now
+
+        self._ticker = threading.Thread(target=run, name='snake-sessions', daemon=True)
+        self._ticker.start()
+        return self._ticker
+
+    def stop_ticker(self):
+        self._stop.set()
+        if self._ticker is not None:
+            self._ticker.join()
+            self._ticker = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'sessions': len(self._sessions), 'running': len(self._running)}
+
+
+# -- load test ----------------------------------------------------------
+def load_test(n_sessions: int = 1000, ticks: int = 300, grid: Tuple[int, int] = (20, 20),
+              seed: int = 0) -> Dict[str, float]:
+    """Step ``n_sessions`` games with random turns; returns timings and memory."""
+    rng = random.Random(seed)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    manager = SessionManager(grid, ttl=3600.0)
+    sids = [manager.create(seed=seed + i) for i in range(n_sessions)]
+    bytes_per_session = (tracemalloc.get_traced_memory()[0] - base) / n_sessions
+    tracemalloc.stop()
+    for sid in sids:
+        manager.start(sid)
+    directions = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+    worst = total = 0.0
+    steps = 0
+    for _ in range(ticks):
+        for sid in rng.sample(sids, max(1, n_sessions // 10)):
+            if sid in manager:
+                manager.change_direction(sid, rng.choice(directions))
+        start = time.perf_counter()
+        events = manager.step_all()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        worst = max(worst, elapsed)
+        steps += len(events)
+        # restart finished games so the load stays constant
+        for sid, event in events.items():
+            if event == 'dead':
+                manager.reset(sid)
+                manager.start(sid)
+    return {
+        'sessions': n_sessions,
+        'steps_per_sec': steps / total if total > 0 else float('inf'),
+        'mean_tick_ms': 1000.0 * total / ticks,
+        'max_tick_ms': 1000.0 * worst,
+        'bytes_per_session': bytes_per_session,
+        # how many sessions one worker could keep at 30 ticks/s
+        'capacity_at_30fps': int(steps / total / 30) if total > 0 else 0,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description='Snake session manager load test')
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--grid', type=int, nargs=2, default=(20, 20), metavar=('W', 'H'))
+    args = parser.parse_args(argv)
+    r = load_test(args.sessions, args.ticks, tuple(args.grid))
+    print(f"{r['sessions']} sessions  {r['steps_per_sec']:,.0f} steps/s  "
+          f"tick mean {r['mean_tick_ms']:.2f} ms  max {r['max_tick_ms']:.2f} ms")
+    print(f"{r['bytes_per_session'] / 1024:.1f} KiB per session  "
+          f"~{r['capacity_at_30fps']:,} sessions at 30 ticks/s per worker")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import importlib.util
+import time
+from pathlib import Path
+
+
+def _load(module_name):
+    p = Path(__file__).resolve().parent.parent / f'{module_name}.py'
+    spec = importlib.util.spec_from_file_location(module_name, str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_hamiltonian_cycle_visits_every_cell():
+    ap = _load('autopilot')
+    for grid in [(4, 4), (6, 5), (5, 6), (10, 10)]:
+        w, h = grid
+        succ = ap.hamiltonian_cycle(grid)
+        seen, c = set(), 0
+        for _ in range(w * h):
+            seen.add(c)
+            nxt = succ[c]
+            assert abs(nxt % w - c % w) + abs(nxt // w - c // w) == 1
+            c = nxt
+        assert c == 0 and len(seen) == w * h
+    assert ap.hamiltonian_cycle((5, 5)) is None
+
+
+def test_wins_small_board():
+    ap = _load('autopilot')
+    for seed in range(5):
+        result = ap.play((6, 6), seed=seed)
+        assert result['outcome'] == 'won'
+        assert result['length'] == 36
+        # the cached path avoids re-planning on most ticks
+        assert result['plans'] < result['ticks']
+
+
+def test_wins_20x20_without_stalling():
+    ap = _load('autopilot')
+    # seed 0 used to loop around its own tail once the cycle took over
+    for seed in range(3):
+        result = ap.play((20, 20), seed=seed)
+        assert result['outcome'] == 'won', result
+        assert result['length'] == 400
+
+
+def test_drives_dict_engine():
+    ap = _load('autopilot')
+    ge = _load('game_engine')
+    state = ge.new_game((8, 8), init_length=3, seed=1)
+    state['running'] = True
+    pilot = ap.Autopilot((8, 8))
+    for _ in range(300):
+        state, event = ge.step_game(state, pilot.move(state))
+        assert event != 'dead'
+    assert state['score'] >= 10
+
+
+def test_no_hamiltonian_cycle_stays_alive():
+    ap = _load('autopilot')
+    result = ap.play((7, 7), seed=2)
+    assert result['outcome'] != 'dead'
+    assert result['score'] >= 10
+
+
+def test_planning_time_on_large_board():
+    ap = _load('autopilot')
+    fe = _load('fast_engine')
+    game = fe.new_game((50, 50), init_length=3, seed=0)
+    game.running = True
+    pilot = ap.Autopilot((50, 50))
+    start = time.perf_counter()
+    ticks = 0
+    while ticks < 2000 and game.running:
+        game.step(pilot.move(game))
+        ticks += 1
+    per_tick = (time.perf_counter() - start) / ticks
+    assert game.running
+    assert per_tick < 1e-3
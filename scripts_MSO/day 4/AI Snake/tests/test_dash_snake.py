@@ -0,0 +1,119 @@
+import importlib.util
+import json
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+def _load(module_name):
+    p = Path(__file__).resolve().parent.parent / f'{module_name}.py'
+    spec = importlib.util.spec_from_file_location(module_name, str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _extend(traces, delta):
+    # Plotly.extendTraces: append, then keep the last maxPoints points
+    data, indices, max_points = delta
+    if not isinstance(max_points, list):
+        max_points = [max_points] * len(indices)
+    for k, i in enumerate(indices):
+        for axis in ('x', 'y'):
+            traces[i][axis] = (traces[i][axis] + list(data[axis][k]))[-max_points[k]:]
+
+
+def test_deltas_reproduce_the_board():
+    pytest.importorskip('dash')
+    app_mod = _load('dash_snake')
+    ge = _load('game_engine')
+    state = ge.new_game((8, 8), init_length=3, seed=4)
+    state['running'] = True
+    fig = app_mod.board_figure(state)
+    traces = [{'x': list(t.x), 'y': list(t.y)} for t in fig.data]
+    rng = random.Random(1)
+    for _ in range(200):
+        state, ev = ge.step_game(state, rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT', None]))
+        if ev == 'dead':
+            break
+        delta = app_mod.frame_delta(state, ev)
+        _extend(traces, delta)
+        if ev == 'moved':
+            assert delta[1] == [0] and len(delta[0]['x'][0]) == 1
+        expected = app_mod.board_figure(state)
+        assert sorted(zip(traces[0]['x'], traces[0]['y'])) == sorted(zip(expected.data[0].x, expected.data[0].y))
+        assert traces[1]['x'] == list(expected.data[1].x)
+    _extend(traces, app_mod.frame_delta(state, 'reset'))
+    assert len(traces[0]['x']) == len(state['snake'])
+
+
+def test_create_app_modes():
+    pytest.importorskip('dash')
+    app_mod = _load('dash_snake')
+    client = app_mod.create_app('client')
+    server = app_mod.create_app('server', sessions=_load('sessions').SessionManager())
+    # client mode: the game loop runs in the browser, the server only records events
+    def server_side(app):
+        return [key for key, cb in app.callback_map.items() if 'callback' in cb]
+
+    assert server_side(client) == ['best.children']
+    # server mode: the browser only holds a session id
+    assert any('session.data' in key for key in server_side(server))
+    assert not any('game_state' in key for key in server_side(server))
+    with pytest.raises(ValueError):
+        app_mod.create_app('browser')
+
+
+def test_session_delta():
+    pytest.importorskip('dash')
+    app_mod = _load('dash_snake')
+    sessions = _load('sessions').SessionManager((8, 8))
+    sid = sessions.create(seed=1)
+    sessions.start(sid)
+    assert app_mod.session_delta(*sessions.poll(sid)) is None
+    sessions.step_all()
+    delta = app_mod.session_delta(*sessions.poll(sid))
+    assert delta[1] == [0] and len(delta[0]['x'][0]) == 1
+    sessions.step_all()
+    sessions.step_all()
+    # missed frames: redraw the whole snake
+    delta = app_mod.session_delta(*sessions.poll(sid))
+    assert delta[1] == [0, 1] and len(delta[0]['x'][0]) == len(sessions.game(sid))
+
+
+# runs assets/snake_client.js with a minimal stand-in for dash_clientside
+_CLIENT_HARNESS = """
+global.window = {dash_clientside: {no_update: null, callback_context: {triggered: []}}};
+require(%s);
+var snake = window.dash_clientside.snake;
+function press(id, state) {
+  window.dash_clientside.callback_context.triggered = [{prop_id: id + '.n_clicks'}];
+  return snake.tick(0, 1, 1, 1, '', state);
+}
+var state = {grid: [8, 8], snake: [[4, 4], [4, 5], [3, 5], [3, 4], [2, 4]], direction: 'DOWN',
+             food: [0, 0], score: 0, running: true, wrap: false};
+window.dash_clientside.callback_context.triggered = [{prop_id: 'tick.n_intervals'}];
+var out = snake.tick(1, 0, 0, 0, '', state);
+var dead = out[0];
+var started = press('start', dead);
+var reset = press('reset', dead);
+var restarted = press('start', reset[0]);
+console.log(JSON.stringify({event: out[4] && out[4].event, dead: dead.dead,
+                            started: started[0], reset_running: restarted[0].running}));
+"""
+
+
+def test_client_refuses_to_restart_a_finished_game():
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('node not installed')
+    script = Path(__file__).resolve().parent.parent / 'assets' / 'snake_client.js'
+    harness = _CLIENT_HARNESS % json.dumps(str(script))
+    out = json.loads(subprocess.run([node, '-e', harness], capture_output=True, text=True,
+                                    check=True).stdout)
+    assert out['event'] == 'dead' and out['dead'] is True
+    assert out['started'] is None  # no_update: 'start' is ignored until 'reset'
+    assert out['reset_running'] is True
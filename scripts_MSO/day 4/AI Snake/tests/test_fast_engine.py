@@ -0,0 +1,100 @@
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+
+def _load(module_name):
+    p = Path(__file__).resolve().parent.parent / f'{module_name}.py'
+    spec = importlib.util.spec_from_file_location(module_name, str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_matches_dict_engine_on_random_games():
+    ge = _load('game_engine')
+    fe = _load('fast_engine')
+    for seed in range(30):
+        rng = random.Random(seed)
+        wrap = seed % 2 == 1
+        state = ge.new_game((8, 7), init_length=3, wrap=wrap, seed=seed)
+        state['running'] = True
+        fast = fe.FastSnake.from_state(state, seed=seed)
+        for _ in range(300):
+            move = rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT', None])
+            state, ev = ge.step_game(state, move)
+            _, fev = fe.step_game(fast, move)
+            assert ev == fev
+            if ev == 'ate':
+                # the engines use different RNG streams for food: follow the fast one
+                state['food'] = fast.to_state()['food']
+            fast_state = fast.to_state()
+            del fast_state['seed']  # different RNG streams, see above
+            assert fast_state == {k: state[k] for k in fast_state}
+            if ev == 'dead':
+                break
+
+
+def test_free_index_stays_consistent():
+    fe = _load('fast_engine')
+    game = fe.new_game((6, 6), init_length=3, wrap=True, seed=3)
+    game.running = True
+    rng = random.Random(0)
+    for _ in range(500):
+        if game.step(rng.choice(list(fe.DIRECTIONS))) == 'dead':
+            break
+        occupied = set(game.body)
+        assert set(game.free) == set(range(36)) - occupied
+        assert all(game.free[game.free_pos[c]] == c for c in game.free)
+        assert game.food is None or game.food not in occupied
+
+
+def test_seeded_games_are_reproducible():
+    fe = _load('fast_engine')
+    runs = []
+    for _ in range(2):
+        game = fe.new_game((9, 9), seed=11)
+        game.running = True
+        foods = []
+        for i in range(200):
+            if game.step('DOWN' if i % 9 == 0 else None) == 'ate':
+                foods.append(game.food)
+        runs.append((game.to_state(), foods))
+    assert runs[0] == runs[1]
+
+
+def test_state_round_trip_keeps_the_seed():
+    fe = _load('fast_engine')
+    game = fe.new_game((9, 9), wrap=True, seed=5)
+    game.running = True
+    state = game.to_state()
+    assert state == game.to_state()  # converting does not advance the RNG
+    runs = []
+    for g in (game, fe.FastSnake.from_state(state), fe.FastSnake.from_state(state)):
+        g.running = True
+        foods = []
+        for _ in range(200):
+            # wraps around: right to the food's column, then down to it
+            event = g.step('RIGHT' if g.head[0] != g.coord(g.food)[0] else 'DOWN')
+            if event == 'ate':
+                foods.append(g.food)
+            elif event == 'dead':
+                break
+        runs.append(foods)
+    assert len(runs[1]) >= 3 and runs[1] == runs[2]
+
+
+def test_large_grid_long_snake_is_fast():
+    fe = _load('fast_engine')
+    w = h = 500
+    # 10,000 body cells (only the head's neighbourhood matters for the rules)
+    snake = [(x, y) for y in range(38, -1, -2) for x in range(w)]
+    game = fe.FastSnake((w, h), snake, 'DOWN', None, running=True, seed=0)
+    game.food = game._random_free()
+    start = time.perf_counter()
+    steps = 0
+    while steps < 20000 and game.step('DOWN' if game.head[1] < h - 1 else 'RIGHT') != 'dead':
+        steps += 1
+    assert len(game) >= 10000
+    assert (time.perf_counter() - start) / max(steps, 1) < 50e-6
@@ -87,3 +87,115 @@ def test_wrap_around():
     st2, ev = step_game(st)
     # wrapped head should be at x=0
     assert st2['snake'][0][0] == 0
+
+
+def test_food_placement_is_seeded_and_avoids_snake():
+    mod = _load_game_engine()
+    runs = []
+    for _ in range(2):
+        st = mod.new_game((6, 6), init_length=3, wrap=True, seed=9)
+        st['running'] = True
+        foods = []
+        for i in range(400):
+            st, ev = mod.step_game(st, 'DOWN' if i % 6 == 0 else 'RIGHT' if i % 6 == 1 else None)
+            if ev == 'ate':
+                assert st['food'] is None or tuple(st['food']) not in st['snake']
+                foods.append(st['food'])
+            if ev == 'dead':
+                break
+        runs.append(foods)
+    assert runs[0] and runs[0] == runs[1]
+
+
+def test_food_without_seed_is_derived_from_snake():
+    mod = _load_game_engine()
+    st = mod.new_game((6, 6), init_length=3, seed=2)
+    del st['seed']
+    st.update(food=(st['snake'][0][0] + 1, st['snake'][0][1]), running=True)
+    foods = {mod.step_game(dict(st))[0]['food'] for _ in range(5)}
+    assert len(foods) == 1
+
+
+def test_free_index_rebuilt_for_stale_state():
+    mod = _load_game_engine()
+    st = mod.new_game((5, 5), init_length=3, seed=4)
+    st['running'] = True
+    st2, _ = mod.step_game(st)
+    st3, _ = mod.step_game(st2)
+    # stepping the older state again must not use the index of st3
+    again, ev = mod.step_game(st2)
+    assert ev == 'moved' and again['snake'] == st3['snake']
+    index = again['free_index']
+    expected = mod.build_free_index(again['snake'], (5, 5))
+    assert index['free'] == expected['free'] and index['tree'] == expected['tree']
+
+
+def test_food_reproducible_from_stale_or_stripped_state():
+    mod = _load_game_engine()
+    st = mod.new_game((8, 8), init_length=3, seed=3)
+    st['running'] = True
+    checked = 0
+    for _ in range(300):
+        x, y = st['snake'][0]
+        fx, fy = st['food']
+        # greedy: the first safe direction that does not move away from the food
+        steps = {'RIGHT': (x + 1, y), 'LEFT': (x - 1, y), 'DOWN': (x, y + 1), 'UP': (x, y - 1)}
+        safe = [d for d, (nx, ny) in steps.items()
+                if 0 <= nx < 8 and 0 <= ny < 8 and (nx, ny) not in st['snake'][:-1]
+                and d != mod.OPPOSITE[st['direction']]]
+        if not safe:
+            break
+        move = min(safe, key=lambda d: abs(steps[d][0] - fx) + abs(steps[d][1] - fy))
+        before = st
+        st, ev = mod.step_game(st, move)
+        if ev == 'dead':
+            break
+        if ev == 'ate':
+            # the index has moved on: stepping the old state again rebuilds it
+            mod.step_game(st, None)
+            again, ev2 = mod.step_game(before, move)
+            assert ev2 == 'ate' and again['food'] == st['food']
+            stripped = {k: v for k, v in before.items() if k != 'free_index'}
+            assert mod.step_game(stripped, move)[0]['food'] == st['food']
+            checked += 1
+    assert checked >= 5
+
+
+def test_free_index_rebuilt_for_edited_middle():
+    mod = _load_game_engine()
+    left = [(1, 0), (0, 0), (0, 1), (0, 2), (1, 2)]
+    right = [(1, 0), (2, 0), (2, 1), (2, 2), (1, 2)]
+    st = mod.new_game((5, 5), seed=1)
+    st.update(snake=right, direction='UP', food=(4, 4), running=True,
+              free_index=mod.build_free_index(left, (5, 5)))
+    # same head, tail and length, but (0, 0) is free in this snake
+    st2, ev = mod.step_game(st, 'LEFT')
+    assert ev == 'moved'
+    assert st2['free_index']['free'] == mod.build_free_index(st2['snake'], (5, 5))['free']
+
+
+def test_eating_costs_like_moving_on_large_board():
+    import time
+    mod = _load_game_engine()
+    w = h = 200
+    st = mod.new_game((w, h), init_length=3, seed=1)
+    st['snake'] = [(0, 100)] + [(x, 101 + y) for y in range(0, 60, 2) for x in range(w)]
+    st['direction'] = 'UP'
+    st['food'] = (w - 1, 0)
+    st['running'] = True
+    st, _ = mod.step_game(st)   # builds the index once
+
+    def run(eat):
+        s = st
+        total = 0.0
+        for _ in range(20):
+            if eat:
+                head = s['snake'][0]
+                s = dict(s, food=(head[0], head[1] - 1))
+            start = time.perf_counter()
+            s, ev = mod.step_game(s)
+            total += time.perf_counter() - start
+            assert ev == ('ate' if eat else 'moved')
+        return total / 20
+
+    assert run(eat=True) < 3 * run(eat=False) + 1e-4
@@ -0,0 +1,94 @@
+import importlib.util
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load(module_name):
+    p = Path(__file__).resolve().parent.parent / f'{module_name}.py'
+    spec = importlib.util.spec_from_file_location(module_name, str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _random_replay(rp, seed, grid=(8, 8), wrap=True, ticks=500):
+    rng = random.Random(seed)
+    rec = rp.Recorder(grid, seed=seed, wrap=wrap)
+    moves = []
+    while rec.game.running and rec.n_ticks < ticks:
+        rec.step(rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT', None]))
+        moves.append(rec.game.direction)
+    return rec, moves
+
+
+def test_round_trip_and_packing():
+    rp = _load('replay')
+    for seed in range(10):
+        rec, moves = _random_replay(rp, seed, ticks=37 + seed)  # every padding length
+        rep = rec.finish()
+        assert len(rep.stream) == (len(moves) + 3) // 4
+        loaded = rp.Replay.from_bytes(rep.to_bytes())
+        assert loaded == rep
+        assert loaded.directions() == moves
+
+
+def test_replay_reproduces_the_game():
+    rp = _load('replay')
+    for seed in range(10):
+        rec, _ = _random_replay(rp, seed, wrap=seed % 2 == 0)
+        rep = rec.finish()
+        game = rp.replay(rep)
+        assert game.snake == rec.game.snake
+        assert game.food == rec.game.food and game.score == rec.game.score
+        assert rp.verify(rep) == (True, 'ok')
+
+
+def test_wall_death_after_a_turn():
+    rp = _load('replay')
+    rec = rp.Recorder((11, 11), seed=3)
+    events = [rec.step(d) for d in ['UP'] * 5 + ['RIGHT', 'UP']]
+    assert events[-1] == 'dead'
+    rep = rec.finish()
+    assert rep.directions()[-1] == 'UP'
+    assert rp.verify(rep) == (True, 'ok')
+
+
+def test_detects_tampering():
+    rp = _load('replay')
+    rec, _ = _random_replay(rp, 3)
+    rep = rec.finish()
+    data = bytearray(rep.to_bytes())
+    data[-1] ^= 0b01
+    with pytest.raises(ValueError, match='checksum'):
+        rp.Replay.from_bytes(bytes(data))
+    with pytest.raises(ValueError, match='not a Snake replay'):
+        rp.Replay.from_bytes(b'XXXX' + bytes(rep.to_bytes()[4:]))
+    assert rp.verify(rep._replace(score=rep.score + 1))[0] is False
+    assert rp.verify(rep._replace(checksum=rep.checksum ^ 1)) == (False, 'final snake checksum mismatch')
+    # another seed places other food, so the recorded game no longer matches
+    assert rp.verify(rep._replace(seed=rep.seed + 1))[0] is False
+
+
+def test_verify_directory(tmp_path):
+    rp = _load('replay')
+    for seed in range(4):
+        rp.record_game((6, 6), seed=seed).save(tmp_path / f'g{seed}{rp.SUFFIX}')
+    (tmp_path / f'broken{rp.SUFFIX}').write_bytes(b'SNKR')
+    report = rp.verify_directory(tmp_path, workers=1)
+    assert report['files'] == 5
+    assert [Path(r['path']).name for r in report['failed']] == [f'broken{rp.SUFFIX}']
+    assert report['ticks'] > 0
+
+
+def test_cli_verifies_in_parallel(tmp_path):
+    script = Path(__file__).resolve().parent.parent / 'replay.py'
+    run = [sys.executable, str(script)]
+    subprocess.run(run + ['record', str(tmp_path), '--games', '3', '--grid', '6', '6'], check=True,
+                   capture_output=True)
+    out = subprocess.run(run + ['verify', str(tmp_path), '--workers', '2'], check=True,
+                         capture_output=True, text=True).stdout
+    assert '3 replays  0 failed' in out
@@ -0,0 +1,130 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+def _load(module_name):
+    p = Path(__file__).resolve().parent.parent / f'{module_name}.py'
+    spec = importlib.util.spec_from_file_location(module_name, str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_step_all_only_moves_running_sessions():
+    sm = _load('sessions')
+    manager = sm.SessionManager((10, 10))
+    a, b = manager.create(seed=1), manager.create(seed=2)
+    assert a != b and len(manager) == 2
+    manager.start(a)
+    head_b = manager.game(b).head
+    events = manager.step_all()
+    assert list(events) == [a] and events[a] in ('moved', 'ate')
+    assert manager.game(b).head == head_b
+    manager.pause(a)
+    assert manager.step_all() == {}
+
+
+def test_queued_input_and_poll():
+    sm = _load('sessions')
+    manager = sm.SessionManager((10, 10))
+    sid = manager.create(seed=3)
+    manager.start(sid)
+    x, y = manager.game(sid).head
+    manager.change_direction(sid, 'LEFT')  # reversing is ignored
+    manager.step_all()
+    assert manager.game(sid).head == (x + 1, y)
+    manager.change_direction(sid, 'DOWN')
+    manager.step_all()
+    assert manager.game(sid).head == (x + 1, y + 1)
+    game, steps, event = manager.poll(sid)
+    assert steps == 2 and event in ('moved', 'ate')
+    assert manager.poll(sid)[1] == 0
+
+
+def test_finished_games_leave_the_batch():
+    sm = _load('sessions')
+    manager = sm.SessionManager((6, 6))
+    sid = manager.create(seed=0)
+    manager.start(sid)
+    for _ in range(10):
+        manager.step_all()
+    assert not manager.game(sid).running
+    assert manager.n_running == 0
+    manager.reset(sid)
+    assert manager.poll(sid)[2] == 'reset'
+    assert len(manager.game(sid)) == 3
+
+
+def test_finished_game_cannot_be_restarted():
+    sm = _load('sessions')
+    manager = sm.SessionManager((8, 8), init_length=5)
+    sid = manager.create(seed=0)
+    manager.start(sid)
+    # run into its own body: the engine's index is left as it was at the collision
+    for direction in ('DOWN', 'LEFT', 'UP'):
+        manager.change_direction(sid, direction)
+        manager.step_all()
+    assert manager.poll(sid)[2] == 'dead'
+    assert manager.start(sid) is False
+    assert not manager.game(sid).running and manager.n_running == 0
+    assert manager.step_all() == {}
+    manager.reset(sid)
+    assert manager.start(sid) is True
+    game = manager.game(sid)
+    assert sum(game.occupied) == len(game.body) == 5
+    assert manager.step_all()[sid] in ('moved', 'ate')
+
+
+def test_expire_and_session_limit():
+    sm = _load('sessions')
+    clock = FakeClock()
+    manager = sm.SessionManager((8, 8), ttl=10.0, max_sessions=2, clock=clock)
+    a = manager.create()
+    clock.now = 5.0
+    b = manager.create()
+    with pytest.raises(RuntimeError):
+        manager.create()
+    clock.now = 12.0
+    manager.game(b)  # touching keeps b alive
+    c = manager.create()  # makes room by expiring a
+    assert a not in manager and b in manager and c in manager
+    clock.now = 30.0
+    assert manager.expire() == 2 and len(manager) == 0
+    with pytest.raises(KeyError):
+        manager.start(b)
+
+
+def test_step_due_follows_each_session_speed():
+    sm = _load('sessions')
+    clock = FakeClock()
+    manager = sm.SessionManager((20, 20), clock=clock)
+    slow, fast = manager.create(seed=1), manager.create(seed=2)
+    manager.set_speed(slow, 2)
+    manager.set_speed(fast, 10)
+    manager.start(slow)
+    manager.start(fast)
+    counts = {slow: 0, fast: 0}
+    for i in range(100):
+        clock.now = i / 100
+        for sid in manager.step_due():
+            counts[sid] += 1
+    assert counts == {slow: 2, fast: 10}
+
+
+def test_load_test_hundreds_of_sessions():
+    sm = _load('sessions')
+    report = sm.load_test(n_sessions=500, ticks=20, grid=(20, 20))
+    assert report['sessions'] == 500
+    # one batch tick for 500 games stays far below a 30 fps frame (33 ms)
+    assert report['mean_tick_ms'] < 33
+    assert report['capacity_at_30fps'] >= 500
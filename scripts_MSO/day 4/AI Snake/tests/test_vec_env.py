@@ -0,0 +1,72 @@
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+def _load(module_name):
+    p = Path(__file__).resolve().parent.parent / f'{module_name}.py'
+    spec = importlib.util.spec_from_file_location(module_name, str(p))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _corpus(ge, n, wrap):
+    states = []
+    for seed in range(n):
+        st = ge.new_game((7, 6), init_length=3, wrap=wrap, seed=seed)
+        st['running'] = True
+        states.append(st)
+    return states
+
+
+def test_matches_step_game_on_corpus():
+    ge = _load('game_engine')
+    ve = _load('vec_env')
+    for wrap in (False, True):
+        states = _corpus(ge, 40, wrap)
+        env = ve.VecSnakeEnv.from_states(states, seed=0)
+        rng = random.Random(wrap)
+        for _ in range(200):
+            actions = [rng.choice([-1, 0, 1, 2, 3]) for _ in states]
+            _, reward, done, info = env.step(actions)
+            for i, st in enumerate(states):
+                move = None if actions[i] < 0 else ve.DIRECTIONS[actions[i]]
+                states[i], ev = ge.step_game(st, move)
+                assert ve.EVENT_NAMES[info['events'][i]] == ev
+                if ev == 'ate':
+                    # game_engine draws food from its own seeded stream: follow the batch
+                    states[i]['food'] = env.get_state(i)['food']
+                vec_state = env.get_state(i)
+                assert vec_state == {k: states[i][k] for k in vec_state}
+            assert np.array_equal(done, [not s['running'] for s in states])
+
+
+def test_reset_observation_and_autoreset():
+    ve = _load('vec_env')
+    env = ve.VecSnakeEnv(16, grid=(5, 5), seed=1, autoreset=True)
+    obs = env.reset()
+    assert obs.shape == (16, 3, 5, 5)
+    assert obs[:, 0].sum(axis=(1, 2)).tolist() == [3] * 16
+    assert (obs[:, 2].sum(axis=(1, 2)) == 1).all()
+    # run straight into the right wall
+    for _ in range(3):
+        obs, reward, done, info = env.step(np.full(16, 3))
+    assert done.all() and (reward == -1).all()
+    assert (info['final_score'] >= 0).all()
+    assert env.running.all()   # restarted
+
+
+def test_batch_throughput():
+    ve = _load('vec_env')
+    env = ve.VecSnakeEnv(4096, grid=(20, 20), seed=2, autoreset=True)
+    env.reset()
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(20):
+        env._advance(rng.integers(-1, 4, env.n_envs))
+    per_step = (time.perf_counter() - start) / (20 * env.n_envs)
+    assert per_step < 20e-6
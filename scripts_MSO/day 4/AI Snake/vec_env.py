@@ -0,0 +1,201 @@
+"""Batched NumPy Snake environment: N games advanced by one ``step`` call.
+
+All games share the grid size and wrap mode. State lives in stacked arrays:
+
+  - body: (N, W*H) ring buffer of cell indices (y * W + x) per game; the head
+    is at ``head_ptr`` and the snake continues for ``length`` slots
+  - occupied: (N, W*H) uint8 occupancy grids
+  - direction: (N,) codes into ``DIRECTIONS`` ('UP', 'DOWN', 'LEFT', 'RIGHT')
+  - food: (N,) cell index or -1, score, running
+  - rng: one ``np.random.Generator`` for food placement of the whole batch
+
+The rules are those of ``game_engine.step_game`` (including wrap mode and
+moving into the cell the tail just left); ``from_states`` / ``get_state``
+convert from and to its dict state. The gym-style API is ``reset()`` ->
+observation and ``step(actions)`` -> (observation, reward, done, info).
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+NO_ACTION = -1
+_DX = np.array([0, 0, -1, 1])
+_DY = np.array([-1, 1, 0, 0])
+_OPPOSITE = np.array([1, 0, 3, 2])
+
+# event codes returned in info['events']
+NO_OP, MOVED, ATE, DEAD = 0, 1, 2, 3
+EVENT_NAMES = ('no_op', 'moved', 'ate', 'dead')
+
+
+class VecSnakeEnv:
+    """N Snake games in stacked arrays; see the module docstring."""
+
+    def __init__(self, n_envs: int, grid: Tuple[int, int] = (11, 11), init_length: int = 3,
+                 wrap: bool = False, seed: Optional[int] = None, autoreset: bool = False):
+        self.n_envs = int(n_envs)
+        self.width, self.height = grid
+        self.n_cells = self.width * self.height
+        self.init_length = init_length
+        self.wrap = bool(wrap)
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+        n, c = self.n_envs, self.n_cells
+        self.body = np.zeros((n, c), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.occupied = np.zeros((n, c), dtype=np.uint8)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.food = np.full(n, -1, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.running = np.zeros(n, dtype=bool)
+        self._rows = np.arange(n)
+
+    # -- construction / adapters ----------------------------------------
+    @classmethod
+    def from_states(cls, states: Sequence[Dict[str, object]], seed: Optional[int] = None) -> 'VecSnakeEnv':
+        """Batch of ``game_engine`` dict states (same grid and wrap mode)."""
+        first = states[0]
+        env = cls(len(states), tuple(first['grid']), len(first['snake']), first.get('wrap', False), seed)
+        for i, st in enumerate(states):
+            if tuple(st['grid']) != (env.width, env.height) or bool(st.get('wrap', False)) != env.wrap:
+                raise ValueError('all states must share grid and wrap mode')
+            cells = [y * env.width + x for x, y in st['snake']]
+            env._place(i, cells, DIRECTIONS.index(st['direction']))
+            food = st.get('food')
+            env.food[i] = -1 if food is None else food[1] * env.width + food[0]
+            env.score[i] = int(st.get('score', 0))
+            env.running[i] = bool(st.get('running', False))
+        return env
+
+    def get_state(self, i: int) -> Dict[str, object]:
+        """Dict state of game ``i`` as used by ``game_engine``."""
+        w = self.width
+        food = int(self.food[i])
+        return {
+            'grid': (self.width, self.height),
+            'snake': [(int(c) % w, int(c) // w) for c in self._cells(i)],
+            'direction': DIRECTIONS[int(self.direction[i])],
+            'food': (food % w, food // w) if food >= 0 else None,
+            'score': int(self.score[i]),
+            'running': bool(self.running[i]),
+            'wrap': self.wrap,
+        }
+
+    def _cells(self, i: int) -> np.ndarray:
+        slots = (self.head_ptr[i] + np.arange(self.length[i])) % self.n_cells
+        return self.body[i, slots]
+
+    def _place(self, i: int, cells: List[int], direction: int):
+        self.occupied[i] = 0
+        self.occupied[i, cells] = 1
+        self.body[i, :len(cells)] = cells
+        self.head_ptr[i] = 0
+        self.length[i] = len(cells)
+        self.direction[i] = direction
+
+    # -- gym-style API --------------------------------------------------
+    def reset(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """(Re)start all games (or those in ``mask``), running, like ``new_game``."""
+        rows = self._rows if mask is None else np.flatnonzero(mask)
+        w, h = self.width, self.height
+        cells = [(h // 2) * w + (w // 2 - i) for i in range(self.init_length)]
+        for i in rows:
+            self._place(i, cells, DIRECTIONS.index('RIGHT'))
+        self.score[rows] = 0
+        self.running[rows] = True
+        self._spawn_food(rows)
+        return self.observe()
+
+    def observe(self) -> np.ndarray:
+        """(N, 3, H, W) uint8 planes: body, head, food."""
+        n = self.n_envs
+        obs = np.zeros((n, 3, self.n_cells), dtype=np.uint8)
+        obs[:, 0] = self.occupied
+        obs[self._rows, 1, self.body[self._rows, self.head_ptr]] = 1
+        has_food = self.food >= 0
+        obs[self._rows[has_food], 2, self.food[has_food]] = 1
+        return obs.reshape(n, 3, self.height, self.width)
+
+    def step(self, actions=None):
+        """Advance every running game one tick.
+
+        ``actions`` holds one direction code per game (index into
+        ``DIRECTIONS``) or ``NO_ACTION``; opposite directions are ignored.
+        Returns (observation, reward, done, info): reward is +1 for eating
+        and -1 for dying, ``done`` marks games not running after the step and
+        ``info['events']`` holds the event codes (``EVENT_NAMES``). With
+        ``autoreset`` finished games restart and ``info['final_score']`` keeps
+        their score.
+        """
+        events = self._advance(actions)
+        reward = (events == ATE).astype(np.float32) - (events == DEAD)
+        done = ~self.running
+        info = {'events': events}
+        if self.autoreset and done.any():
+            info['final_score'] = np.where(done, self.score, -1)
+            self.reset(done)
+        return self.observe(), reward, done, info
+
+    # -- rules ----------------------------------------------------------
+    def _advance(self, actions) -> np.ndarray:
+        rows, w, h, cap = self._rows, self.width, self.height, self.n_cells
+        if actions is None:
+            actions = np.full(self.n_envs, NO_ACTION)
+        actions = np.asarray(actions, dtype=np.int64)
+        active = self.running.copy()
+        events = np.zeros(self.n_envs, dtype=np.int8)
+
+        turn = active & (actions >= 0) & (actions != _OPPOSITE[self.direction])
+        direction = np.where(turn, actions, self.direction)
+        head = self.body[rows, self.head_ptr]
+        x = head % w + _DX[direction]
+        y = head // w + _DY[direction]
+        if self.wrap:
+            x %= w
+            y %= h
+            wall = np.zeros(self.n_envs, dtype=bool)
+        else:
+            wall = (x < 0) | (x >= w) | (y < 0) | (y >= h)
+        hit_wall = active & wall
+        self.running[hit_wall] = False
+        events[hit_wall] = DEAD
+
+        move = active & ~wall
+        new = np.where(move, y * w + x, 0)
+        ate = move & (new == self.food)
+        # the tail leaves its cell before the collision check
+        drop = np.flatnonzero(move & ~ate)
+        tail = self.body[drop, (self.head_ptr[drop] + self.length[drop] - 1) % cap]
+        self.occupied[drop, tail] = 0
+
+        m = np.flatnonzero(move)
+        self.head_ptr[m] = (self.head_ptr[m] - 1) % cap
+        self.body[m, self.head_ptr[m]] = new[m]
+        self.length[ate] += 1
+        self.direction[m] = direction[m]
+
+        hit_self = move & (self.occupied[rows, new] == 1)
+        self.running[hit_self] = False
+        events[hit_self] = DEAD
+        ok = np.flatnonzero(move & ~hit_self)
+        self.occupied[ok, new[ok]] = 1
+        events[ok] = MOVED
+        eaten = np.flatnonzero(ate & ~hit_self)
+        events[eaten] = ATE
+        self.score[eaten] += 1
+        self._spawn_food(eaten)
+        return events
+
+    def _spawn_food(self, rows: np.ndarray):
+        """Uniform free cell per game in ``rows`` (-1 if the board is full)."""
+        if len(rows) == 0:
+            return
+        free = self.occupied[rows] == 0
+        counts = free.sum(axis=1)
+        pick = np.floor(self.rng.random(len(rows)) * counts).astype(np.int64)
+        cell = np.argmax(np.cumsum(free, axis=1) > pick[:, None], axis=1)
+        self.food[rows] = np.where(counts > 0, cell, -1)
@@ -4,4 +4,18 @@
 __all__ = [
     "windpro_io",
     "aep_calc",
+    "correlation",
+    "data_store",
+    "file_cache",
+    "instrumentation",
+    "jobs",
+    "map_render",
+    "mc_result",
+    "portfolio",
+    "power_curves",
+    "sampling",
+    "sensitivity",
+    "sketches",
+    "timeseries",
+    "wake_model",
 ]
@@ -7,11 +7,39 @@ and power curve shifts (simple scaling).
 """
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
 import pandas as pd
-from typing import Dict, Iterable, Tuple
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .correlation import CorrelationModel
+from .instrumentation import stage, timed
+from .mc_result import MonteCarloResult
+from .power_curves import GRID_STEP, WIND_SPEED_GRID, PowerCurveLibrary, interp_on_grid
+from .sampling import make_sampler, norm_ppf
+from .sketches import HistogramSketch
+
+# park-level percentiles reported by the Monte Carlo engine
+PERCENTILES = (2.5, 16, 50, 84, 97.5)
+
+# sketch ranges cover +/- this many standard deviations of every factor
+SKETCH_SIGMAS = 8.0
+PARK_SKETCH_BINS = 1 << 16
+# per-turbine sketches hold n_turbines x bins int64 counts in every worker;
+# above TURBINE_SKETCH_MAX_BYTES / (8 * TURBINE_SKETCH_BINS) = 8192 turbines
+# the bin count shrinks to stay within the budget (never below the minimum)
+TURBINE_SKETCH_BINS = 1024
+MIN_TURBINE_SKETCH_BINS = 64
+TURBINE_SKETCH_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 65536
+# adaptive mode: number of batches for the batch-means confidence intervals
+ADAPTIVE_BATCHES = 32
+
+HOURS_PER_YEAR = 8760.0
 
 
+@timed('aep_calc.aep_from_production', items='df_production')
 def aep_from_production(df_production: pd.DataFrame) -> pd.DataFrame:
     """Compute deterministic AEP summary from a production DataFrame.
 
@@ -29,58 +57,462 @@ def aep_from_production(df_production: pd.DataFrame) -> pd.DataFrame:
     }).assign(park_total_mwh=total)
 
 
+def _gamma(x: np.ndarray) -> np.ndarray:
+    """Vectorised gamma function for x > 0 (shift by 6, then Stirling series)."""
+    x = np.asarray(x, dtype=float)
+    z = x + 6.0
+    log_g = ((z - 0.5) * np.log(z) - z + 0.5 * np.log(2.0 * np.pi)
+             + 1.0 / (12.0 * z) - 1.0 / (360.0 * z ** 3) + 1.0 / (1260.0 * z ** 5))
+    return np.exp(log_g) / (x * (x + 1) * (x + 2) * (x + 3) * (x + 4) * (x + 5))
+
+
+def fit_weibull(speeds: np.ndarray, frequencies: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched Weibull (A, k) fit from histograms by the method of moments.
+
+    ``speeds`` are the bin centres (shape (n_bins,)); ``frequencies`` has
+    shape (..., n_bins), e.g. (n_turbines, n_sectors, n_bins). Uses Justus'
+    approximation k = (std/mean)^-1.086 and A = mean / gamma(1 + 1/k).
+    Returns A and k with the leading shape of ``frequencies``.
+    """
+    u = np.asarray(speeds, dtype=float)
+    f = np.asarray(frequencies, dtype=float)
+    total = f.sum(axis=-1)
+    if np.any(total <= 0):
+        raise ValueError('every histogram needs a positive total frequency')
+    mean = (f * u).sum(axis=-1) / total
+    var = np.maximum((f * u * u).sum(axis=-1) / total - mean * mean, 1e-12)
+    k = (np.sqrt(var) / mean) ** -1.086
+    a = mean / _gamma(1.0 + 1.0 / k)
+    return a, k
+
+
+def _shear_factor(n_turbines: int, hub_height, ref_height, shear_exponent: float) -> np.ndarray:
+    """Power-law speed ratio (hub / ref) ** alpha per turbine (ones if unused)."""
+    if hub_height is None or ref_height is None:
+        return np.ones(n_turbines)
+    hub = np.broadcast_to(np.asarray(hub_height, dtype=float), (n_turbines,))
+    return (hub / float(ref_height)) ** shear_exponent
+
+
+def aep_from_weibull(turbine_types, weibull_a, weibull_k, sector_freq,
+                     library: PowerCurveLibrary,
+                     hub_height=None, ref_height: float | None = None,
+                     shear_exponent: float = 0.143,
+                     hours: float = HOURS_PER_YEAR) -> np.ndarray:
+    """Per-turbine AEP (MWh) from power curves and per-sector Weibull distributions.
+
+    - turbine_types: one type key per turbine (must be in ``library``).
+    - weibull_a, weibull_k: shape (n_turbines, n_sectors) (or (n_turbines,)
+      for one sector) at ``ref_height``.
+    - sector_freq: (n_sectors,) or (n_turbines, n_sectors); normalised per turbine.
+    - hub_height/ref_height: if both are given, A is scaled by the power-law
+      shear (hub_height / ref_height) ** shear_exponent.
+
+    All turbines and sectors are integrated in one pass over the shared
+    wind-speed grid (bin probabilities from the Weibull CDF).
+    """
+    curves, codes = library.matrix(turbine_types)
+    n = len(codes)
+    a = np.asarray(weibull_a, dtype=float).reshape(n, -1)
+    k = np.asarray(weibull_k, dtype=float).reshape(n, -1)
+    freq = np.broadcast_to(np.asarray(sector_freq, dtype=float), a.shape)
+    freq = freq / freq.sum(axis=1, keepdims=True)
+
+    a_hub = a * _shear_factor(n, hub_height, ref_height, shear_exponent)[:, None]
+    lo = np.maximum(WIND_SPEED_GRID - 0.5 * GRID_STEP, 0.0)
+    hi = WIND_SPEED_GRID + 0.5 * GRID_STEP
+    scale = a_hub[:, :, None]
+    shape = k[:, :, None]
+    prob = np.exp(-(lo / scale) ** shape) - np.exp(-(hi / scale) ** shape)
+    return hours / 1000.0 * np.einsum('tsg,ts,tg->t', prob, freq, curves[codes])
+
+
+def aep_from_histogram(turbine_types, speeds, frequencies,
+                       library: PowerCurveLibrary,
+                       hub_height=None, ref_height: float | None = None,
+                       shear_exponent: float = 0.143,
+                       hours: float = HOURS_PER_YEAR) -> np.ndarray:
+    """Per-turbine AEP (MWh) from binned wind-speed distributions.
+
+    ``speeds`` are the bin centres at ``ref_height``; ``frequencies`` has shape
+    (n_bins,), (n_sectors, n_bins) or (n_turbines, n_sectors, n_bins) and is
+    normalised per turbine. Shear scales the bin speeds per turbine.
+    """
+    curves, codes = library.matrix(turbine_types)
+    n = len(codes)
+    u = np.asarray(speeds, dtype=float)
+    f = np.asarray(frequencies, dtype=float)
+    if f.ndim == 3:
+        f = f.sum(axis=1)
+    elif f.ndim == 2:
+        f = f.sum(axis=0)
+    f = np.broadcast_to(f, (n, len(u)))
+    f = f / f.sum(axis=1, keepdims=True)
+    u_hub = u[None, :] * _shear_factor(n, hub_height, ref_height, shear_exponent)[:, None]
+    power = interp_on_grid(curves, codes, u_hub)
+    return hours / 1000.0 * (f * power).sum(axis=1)
+
+
+def _factor_bounds(std: float) -> Tuple[float, float]:
+    """Range that holds a clipped N(1, std) factor with overwhelming probability."""
+    return max(0.0, 1.0 - SKETCH_SIGMAS * std), 1.0 + SKETCH_SIGMAS * std
+
+
+def turbine_sketch_bins(n_columns: int) -> int:
+    """Bins per column of a per-turbine sketch with ``n_columns`` columns.
+
+    ``TURBINE_SKETCH_BINS`` up to 8192 columns, then as many as fit in
+    ``TURBINE_SKETCH_MAX_BYTES`` (at least ``MIN_TURBINE_SKETCH_BINS``). The
+    percentile error is one bin, so it grows as the bins shrink: about 1e-3 of
+    the turbine's AEP at 1024 bins, 5e-3 at 50,000 turbines (167 bins).
+    """
+    fit = TURBINE_SKETCH_MAX_BYTES // (8 * max(int(n_columns), 1))
+    return int(max(MIN_TURBINE_SKETCH_BINS, min(TURBINE_SKETCH_BINS, fit)))
+
+
+def _new_sketches(base: np.ndarray, energy_scale_std: float,
+                  availability_std: float) -> Tuple[HistogramSketch, HistogramSketch]:
+    """Park and per-turbine sketches with edges fixed by the uncertainty model.
+
+    The edges depend only on the inputs (not on drawn samples) so sketches
+    built from different chunks or workers can be merged.
+    """
+    e_lo, e_hi = _factor_bounds(energy_scale_std)
+    a_lo, a_hi = _factor_bounds(availability_std)
+    lo = np.minimum(base * e_lo * a_lo, base * e_hi * a_hi)
+    hi = np.maximum(base * e_lo * a_lo, base * e_hi * a_hi)
+    park = HistogramSketch(lo.sum(), hi.sum(), n_bins=PARK_SKETCH_BINS)
+    turbines = HistogramSketch(lo, hi, n_bins=turbine_sketch_bins(len(base)))
+    return park, turbines
+
+
+def _latent_dim(n_turbines: int, correlation: CorrelationModel | None) -> int:
+    if correlation is None:
+        return 2 * n_turbines
+    return correlation.n_latent(n_turbines)
+
+
+def _draw_block(sampler, base: np.ndarray, n: int,
+                energy_scale_std: float, availability_std: float,
+                correlation: CorrelationModel | None = None) -> np.ndarray:
+    """Per-turbine production samples for one block, shape (n, n_turbines).
+
+    The (optionally correlated) standard normals have dimension
+    ``2 * n_turbines``: the first half drives the energy factors, the second
+    half availability.
+    """
+    n_turbines = len(base)
+    z = sampler.normal(n)
+    if correlation is not None:
+        z = correlation.correlate(z, n_turbines)
+    block = 1.0 + energy_scale_std * z[:, :n_turbines]
+    np.clip(block, 0.0, None, out=block)
+    availability = 1.0 + availability_std * z[:, n_turbines:]
+    np.clip(availability, 0.0, None, out=availability)
+    block *= availability
+    block *= base
+    return block
+
+
+def _stream_share(base: np.ndarray, n_samples: int, chunk_size: int,
+                  energy_scale_std: float, availability_std: float,
+                  seed, sampler: str = 'random',
+                  correlation: CorrelationModel | None = None,
+                  progress: Optional[Callable[[int, int], None]] = None
+                  ) -> Tuple[HistogramSketch, HistogramSketch, float, float]:
+    """Sample ``n_samples`` rows block by block and reduce them into sketches.
+
+    ``seed`` is anything ``np.random.default_rng`` accepts (int, None or a
+    ``SeedSequence`` child). Module-level so it can run in a worker process.
+    ``progress(done, total)`` is called after every block; it may raise to
+    abort the run.
+    Returns (park_sketch, turbine_sketch, sum, sum_of_squares) of the park total.
+    """
+    draws = make_sampler(sampler, _latent_dim(len(base), correlation), seed)
+    park_sketch, turbine_sketch = _new_sketches(base, energy_scale_std, availability_std)
+    total = 0.0
+    total_sq = 0.0
+    done = 0
+    while done < n_samples:
+        n = min(chunk_size, n_samples - done)
+        block = _draw_block(draws, base, n, energy_scale_std, availability_std, correlation)
+        park = block.sum(axis=1)
+        park_sketch.update(park)
+        turbine_sketch.update(block)
+        total += float(park.sum())
+        total_sq += float(np.dot(park, park))
+        done += n
+        if progress is not None:
+            progress(done, n_samples)
+    return park_sketch, turbine_sketch, total, total_sq
+
+
+def _split_samples(n_samples: int, n_parts: int) -> list:
+    share, extra = divmod(n_samples, n_parts)
+    return [share + (1 if i < extra else 0) for i in range(n_parts)]
+
+
+def _monte_carlo_streaming(ids, base: np.ndarray, n_samples: int, chunk_size: int,
+                           energy_scale_std: float, availability_std: float,
+                           random_seed: int | None, n_workers: int = 1,
+                           sampler: str = 'random',
+                           correlation: CorrelationModel | None = None,
+                           progress: Optional[Callable[[int, int], None]] = None) -> MonteCarloResult:
+    if correlation is not None:
+        # factorise once here; workers receive the prepared model
+        correlation.prepare(len(base))
+    if n_workers == 1:
+        parts = [_stream_share(base, n_samples, chunk_size, energy_scale_std,
+                               availability_std, random_seed, sampler, correlation, progress)]
+    else:
+        # one independent child stream per worker; the split and the merge
+        # order are fixed, so results only depend on (seed, n_workers)
+        seeds = np.random.SeedSequence(random_seed).spawn(n_workers)
+        shares = _split_samples(n_samples, n_workers)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_stream_share, base, n, chunk_size, energy_scale_std,
+                                   availability_std, seed, sampler, correlation)
+                       for n, seed in zip(shares, seeds)]
+            if progress is not None:
+                # workers cannot call back into this process; report per finished share
+                done = 0
+                try:
+                    for f in as_completed(futures):
+                        done += shares[futures.index(f)]
+                        progress(done, n_samples)
+                except BaseException:
+                    for f in futures:
+                        f.cancel()
+                    raise
+            parts = [f.result() for f in futures]
+
+    park_sketch, turbine_sketch, total, total_sq = parts[0]
+    for p_sk, t_sk, p_total, p_total_sq in parts[1:]:
+        park_sketch.merge(p_sk)
+        turbine_sketch.merge(t_sk)
+        total += p_total
+        total_sq += p_total_sq
+
+    mean = total / n_samples
+    var = max(total_sq / n_samples - mean * mean, 0.0)
+    return MonteCarloResult(ids, PERCENTILES, sketch=park_sketch, turbine_sketch=turbine_sketch,
+                            n_samples=n_samples, mean_mwh=mean, std_mwh=var ** 0.5)
+
+
+@timed('aep_calc.monte_carlo_aep', items='n_samples')
 def monte_carlo_aep(df_production: pd.DataFrame, n_samples: int = 1000,
                     energy_scale_std: float = 0.05,
                     availability_std: float = 0.01,
-                    random_seed: int | None = None) -> Dict[str, np.ndarray]:
+                    random_seed: int | None = None,
+                    chunk_size: int | None = None,
+                    n_workers: int = 1,
+                    sampler: str = 'random',
+                    correlation: CorrelationModel | None = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> MonteCarloResult:
     """Monte Carlo propagation of simple multiplicative uncertainties.
 
     - energy_scale_std: multiplicative uncertainty (relative) applied to each
       turbine's annual energy (simulates wind resource uncertainty / power curve scale).
     - availability_std: uncertainty on availability (fractional). This is applied
       multiplicatively as well.
+    - chunk_size: if given, samples are drawn in blocks of this many rows and
+      reduced into fixed-size quantile sketches, so memory stays flat however
+      large ``n_samples`` is (see ``_monte_carlo_streaming``).
+    - n_workers: if > 1, the samples are split across a process pool, each
+      worker drawing from its own ``SeedSequence(random_seed).spawn`` child.
+      Implies chunked mode (``DEFAULT_CHUNK_SIZE`` if no chunk_size is given).
+      Results are bit-reproducible for a given (random_seed, n_workers) pair,
+      but differ from a single-process run with the same seed.
+    - sampler: 'random' (pseudo-random), 'sobol' (scrambled Sobol', needs
+      scipy) or 'lhs' (Latin hypercube); see :mod:`sampling`. The
+      quasi-random backends reach a given percentile precision with fewer
+      samples, check with ``convergence_report``.
+    - correlation: optional :class:`correlation.CorrelationModel` with
+      park-wide / cluster-wide components, low-rank loadings or a dense
+      correlation matrix. Marginals (and the sketch ranges) are unchanged,
+      but park-level spread reflects the shared components.
+    - progress: chunked mode only; ``progress(done, n_samples)`` is called as
+      samples complete (per block, or per finished worker share). Raising
+      from it aborts the run, which is how background jobs are cancelled.
 
-    Returns a dict with keys: 'samples' (park total samples), 'per_turbine' (dict
-    mapping turbine_id -> samples array), 'percentiles' (DataFrame of percentiles)
+    Returns a :class:`mc_result.MonteCarloResult`. It holds the samples as one
+    contiguous (n_samples, n_turbines) array, gives percentiles for any levels
+    (``park_percentiles`` / ``turbine_percentiles``) and exports with
+    ``to_frame`` / ``to_arrow``. Dict-style access still works: 'samples' (park
+    total samples), 'per_turbine' (turbine_id -> samples column),
+    'percentiles' (DataFrame of percentiles), 'per_turbine_percentiles',
+    'mean_mwh', 'std_mwh', 'n_samples'.
+
+    In chunked mode no samples are kept ('samples' and 'per_turbine' are None)
+    and percentiles come from the sketches: park percentiles differ from the
+    exact ones by at most 'error_bound_mwh' (one sketch bin; with the default
+    stds about 1.5e-5 of the park total). Per-turbine percentiles are within
+    about 1e-3 of the turbine's AEP up to 8192 turbines; larger parks get
+    fewer bins per turbine to bound the sketch memory (see
+    ``turbine_sketch_bins``).
     """
-    rng = np.random.default_rng(random_seed)
+    if n_workers < 1:
+        raise ValueError('n_workers must be positive')
+    if n_workers > 1 and chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE
+    if chunk_size is not None:
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        ids = df_production['turbine_id'].astype(str).tolist()
+        base = df_production['annual_energy_mwh'].to_numpy(dtype=float)
+        return _monte_carlo_streaming(ids, base, n_samples, chunk_size,
+                                      energy_scale_std, availability_std,
+                                      random_seed, n_workers=n_workers, sampler=sampler,
+                                      correlation=correlation, progress=progress)
 
     df = df_production.copy()
     ids = df['turbine_id'].astype(str).tolist()
     base = df['annual_energy_mwh'].to_numpy(dtype=float)
 
     # Sample multiplicative factors per sample and per turbine
-    # energy scale: per-sample per-turbine lognormal-like using normal multiplier
-    energy_factors = rng.normal(loc=1.0, scale=energy_scale_std, size=(n_samples, len(base)))
-    availability_factors = rng.normal(loc=1.0, scale=availability_std, size=(n_samples, len(base)))
-
-    # ensure no negative factors
-    energy_factors = np.clip(energy_factors, 0.0, None)
-    availability_factors = np.clip(availability_factors, 0.0, None)
-
-    samples = (base * energy_factors * availability_factors).sum(axis=1)
-
-    per_turbine = {}
-    for i, tid in enumerate(ids):
-        per_turbine[tid] = (base[i] * energy_factors[:, i] * availability_factors[:, i])
+    # (energy scale and availability, normal multipliers clipped at zero)
+    draws = make_sampler(sampler, _latent_dim(len(base), correlation), random_seed)
+    with stage('aep_calc.sampling', n_samples):
+        production = _draw_block(draws, base, n_samples, energy_scale_std, availability_std, correlation)
 
-    # percentiles table for the park-level
-    pcts = np.percentile(samples, [2.5, 16, 50, 84, 97.5])
-    percentiles = pd.DataFrame({'percentile': ['2.5', '16', '50', '84', '97.5'], 'mwh': pcts})
+    return MonteCarloResult(ids, PERCENTILES, production=production)
 
-    return {
-        'samples': samples,
-        'per_turbine': per_turbine,
-        'percentiles': percentiles
-    }
 
-
-def summarize_montecarlo(result: Dict[str, np.ndarray]) -> pd.DataFrame:
+def summarize_montecarlo(result) -> pd.DataFrame:
     """Return a summary DataFrame (median, low, high) for park-level Monte Carlo.
     """
+    if isinstance(result, MonteCarloResult):
+        median, lo, hi = result.park_percentiles([50, 16, 84])
+        return pd.DataFrame([{'metric': 'park_total_mwh', 'median': median, 'lo_1sigma': lo, 'hi_1sigma': hi}])
     p = result['percentiles']
     # return a small summary
-    median = float(p.loc[p['percentile'] == '50', 'mwh'])
-    lo = float(p.loc[p['percentile'] == '16', 'mwh'])
-    hi = float(p.loc[p['percentile'] == '84', 'mwh'])
+    median = float(p.loc[p['percentile'] == '50', 'mwh'].iloc[0])
+    lo = float(p.loc[p['percentile'] == '16', 'mwh'].iloc[0])
+    hi = float(p.loc[p['percentile'] == '84', 'mwh'].iloc[0])
     return pd.DataFrame([{'metric': 'park_total_mwh', 'median': median, 'lo_1sigma': lo, 'hi_1sigma': hi}])
+
+
+def convergence_report(df_production: pd.DataFrame,
+                       target_rel_se: float = 1e-3,
+                       samplers: Iterable[str] = ('random', 'sobol', 'lhs'),
+                       energy_scale_std: float = 0.05,
+                       availability_std: float = 0.01,
+                       correlation: CorrelationModel | None = None,
+                       n_replicates: int = 16,
+                       min_samples: int = 128,
+                       max_samples: int = 1 << 14,
+                       random_seed: int | None = None) -> Dict[str, pd.DataFrame]:
+    """Compare how fast each sampler backend pins down P50 and P90.
+
+    For n = min_samples, 2*min_samples, ... up to max_samples every backend is
+    run ``n_replicates`` times with independent seeds; the standard error of
+    an estimate is the spread of the replicates. P90 is the value exceeded
+    with 90 % probability, i.e. the 10th percentile of the park total.
+
+    Returns a dict with 'trace' (one row per backend and n with the estimates
+    and their relative standard errors) and 'summary' (per backend, the
+    smallest n where both relative standard errors are <= target_rel_se; NaN
+    if max_samples was not enough).
+    """
+    base = df_production['annual_energy_mwh'].to_numpy(dtype=float)
+    samplers = list(samplers)
+    seeds = np.random.SeedSequence(random_seed).spawn(len(samplers))
+
+    rows = []
+    for kind, kind_seed in zip(samplers, seeds):
+        n = int(min_samples)
+        while n <= max_samples:
+            estimates = np.empty((n_replicates, 2))
+            for r, seed in enumerate(kind_seed.spawn(n_replicates)):
+                draws = make_sampler(kind, _latent_dim(len(base), correlation), seed)
+                park = _draw_block(draws, base, n, energy_scale_std, availability_std,
+                                   correlation).sum(axis=1)
+                estimates[r] = np.percentile(park, [50, 10])
+            mean = estimates.mean(axis=0)
+            rel_se = estimates.std(axis=0, ddof=1) / np.abs(mean)
+            rows.append({'sampler': kind, 'n_samples': n,
+                         'p50_mwh': mean[0], 'p50_rel_se': rel_se[0],
+                         'p90_mwh': mean[1], 'p90_rel_se': rel_se[1]})
+            n *= 2
+    trace = pd.DataFrame(rows)
+
+    summary = []
+    for kind in samplers:
+        t = trace[trace['sampler'] == kind]
+        ok = t[(t['p50_rel_se'] <= target_rel_se) & (t['p90_rel_se'] <= target_rel_se)]
+        summary.append({'sampler': kind,
+                        'required_samples': float(ok['n_samples'].iloc[0]) if len(ok) else np.nan,
+                        'p50_rel_se': float(t['p50_rel_se'].iloc[-1]),
+                        'p90_rel_se': float(t['p90_rel_se'].iloc[-1])})
+    return {'trace': trace, 'summary': pd.DataFrame(summary)}
+
+
+@timed('aep_calc.monte_carlo_adaptive')
+def monte_carlo_adaptive(df_production: pd.DataFrame,
+                         target_rel_precision: float = 1e-3,
+                         percentiles: Iterable[float] = PERCENTILES,
+                         confidence: float = 0.95,
+                         initial_samples: int = 1024,
+                         max_samples: int = 1 << 20,
+                         growth: float = 2.0,
+                         energy_scale_std: float = 0.05,
+                         availability_std: float = 0.01,
+                         random_seed: int | None = None,
+                         sampler: str = 'random',
+                         correlation: CorrelationModel | None = None,
+                         progress: Optional[Callable[[int, int], None]] = None) -> MonteCarloResult:
+    """Monte Carlo that samples until the requested percentiles have converged.
+
+    Samples are drawn in growing batches (``initial_samples``, then x
+    ``growth`` in total each round, up to ``max_samples``). After each round
+    the park-total samples are cut into ``ADAPTIVE_BATCHES`` equal batches;
+    the spread of the per-batch percentiles gives a batch-means confidence
+    interval (normal quantile at ``confidence``) for each requested
+    percentile. Sampling stops once every half-width is at most
+    ``target_rel_precision`` times the estimate.
+
+    Only the 1-D park-total samples are kept (not the per-turbine matrix).
+    ``progress(done, max_samples)`` is called after each round.
+
+    Returns a :class:`mc_result.MonteCarloResult` reporting the requested
+    percentiles, with the extra keys 'precision' (percentile, mwh,
+    ci_halfwidth_mwh, rel_precision), 'achieved_rel_precision' (the worst of
+    the percentiles) and 'converged'.
+    """
+    if target_rel_precision <= 0:
+        raise ValueError('target_rel_precision must be positive')
+    if growth <= 1.0:
+        raise ValueError('growth must be > 1')
+    qs = [float(q) for q in percentiles]
+    z_crit = float(norm_ppf(0.5 + confidence / 2.0))
+    base = df_production['annual_energy_mwh'].to_numpy(dtype=float)
+    draws = make_sampler(sampler, _latent_dim(len(base), correlation), random_seed)
+
+    max_samples = max(int(max_samples), ADAPTIVE_BATCHES)
+    target = min(max(int(initial_samples), ADAPTIVE_BATCHES), max_samples)
+    samples = np.empty(0)
+    while True:
+        n = target - len(samples)
+        with stage('aep_calc.sampling', n):
+            block = _draw_block(draws, base, n, energy_scale_std, availability_std, correlation)
+        samples = np.concatenate([samples, block.sum(axis=1)])
+        if progress is not None:
+            progress(len(samples), max_samples)
+
+        estimate = np.percentile(samples, qs)
+        usable = len(samples) - len(samples) % ADAPTIVE_BATCHES
+        batches = samples[:usable].reshape(ADAPTIVE_BATCHES, -1)
+        per_batch = np.percentile(batches, qs, axis=1)
+        halfwidth = z_crit * per_batch.std(axis=1, ddof=1) / np.sqrt(ADAPTIVE_BATCHES)
+        rel = halfwidth / np.abs(estimate)
+        converged = bool((rel <= target_rel_precision).all())
+        if converged or len(samples) >= max_samples:
+            break
+        target = min(int(np.ceil(len(samples) * growth)), max_samples)
+
+    precision = pd.DataFrame({'percentile': [f'{q:g}' for q in qs], 'mwh': estimate,
+                              'ci_halfwidth_mwh': halfwidth, 'rel_precision': rel})
+    return MonteCarloResult(df_production['turbine_id'].astype(str).tolist(), qs, samples=samples,
+                            extra={'precision': precision,
+                                   'achieved_rel_precision': float(rel.max()),
+                                   'converged': converged})
@@ -0,0 +1 @@
+"""Offline scaling benchmarks for the Dash Windpark modules (see bench_scaling.py)."""
@@ -0,0 +1,208 @@
+"""Scaling benchmarks for ``windpro_io`` and ``aep_calc``.
+
+Generates synthetic parks (10 to 50,000 turbines) and production / layout /
+windrose CSV files (1 KB to 500 MB), then records wall time and peak Python
+allocation (``tracemalloc``) for the parsers, ``aep_from_production``,
+``monte_carlo_aep`` and ``summarize_montecarlo``. Each run is written as JSON
+to ``benchmarks/results/`` (git-ignored, a local history) and compared with
+the previous run, so regressions show up between commits. Everything runs
+offline.
+
+Usage (from the folder that contains ``dash_windpark``)::
+
+    python -m dash_windpark.benchmarks.bench_scaling            # full sweep
+    python -m dash_windpark.benchmarks.bench_scaling --quick    # small sizes only
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..aep_calc import aep_from_production, monte_carlo_aep, summarize_montecarlo
+from ..windpro_io import parse_layout_table, parse_production_table, parse_windrose
+
+PARK_SIZES = (10, 100, 1_000, 10_000, 50_000)
+FILE_SIZES = (1_000, 100_000, 10_000_000, 500_000_000)
+QUICK_PARK_SIZES = (10, 100, 1_000)
+QUICK_FILE_SIZES = (1_000, 100_000)
+MC_SAMPLES = 1000
+# parks above this size use the chunked Monte Carlo engine
+MC_CHUNK_THRESHOLD = 1_000
+RESULTS_DIR = Path(__file__).parent / 'results'
+REGRESSION_FACTOR = 1.5
+
+
+def synthetic_production(n_turbines: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n_turbines)],
+                         'annual_energy_mwh': rng.uniform(2000.0, 12000.0, n_turbines)})
+
+
+def _rows_for_bytes(target_bytes: int, bytes_per_row: int) -> int:
+    return max(1, target_bytes // bytes_per_row)
+
+
+def write_synthetic_files(directory: Path, target_bytes: int, seed: int = 0) -> Dict[str, Path]:
+    """Write production, layout and windrose CSVs of roughly ``target_bytes`` each.
+
+    Files are written in blocks so even the 500 MB case needs little memory.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = {
+        'production': directory / f'production_{target_bytes}.csv',
+        'layout': directory / f'layout_{target_bytes}.csv',
+        'windrose': directory / f'windrose_{target_bytes}.csv',
+    }
+    specs = {
+        'production': (['Turbine', 'Annual energy (MWh)'], 16),
+        'layout': (['Turbine', 'X', 'Y'], 24),
+        'windrose': (['Direction', 'Speed (m/s)', 'Frequency (%)'], 14),
+    }
+    block = 200_000
+    for kind, (header, row_bytes) in specs.items():
+        n_rows = _rows_for_bytes(target_bytes, row_bytes)
+        with open(paths[kind], 'w', newline='') as fh:
+            fh.write(','.join(header) + '\n')
+            for start in range(0, n_rows, block):
+                n = min(block, n_rows - start)
+                ids = np.arange(start, start + n)
+                if kind == 'production':
+                    cols = [np.char.add('T', ids.astype(str)), np.round(rng.uniform(2000, 12000, n), 3)]
+                elif kind == 'layout':
+                    cols = [np.char.add('T', ids.astype(str)), np.round(rng.uniform(0, 1e5, n), 2),
+                            np.round(rng.uniform(0, 1e5, n), 2)]
+                else:
+                    cols = [(ids % 12) * 30, ids % 30, np.round(rng.uniform(0, 1, n), 6)]
+                frame = pd.DataFrame(dict(zip(header, cols)))
+                frame.to_csv(fh, header=False, index=False)
+    return paths
+
+
+def measure(fn: Callable, *args, repeat: int = 1, **kwargs) -> Dict[str, float]:
+    """Best-of-``repeat`` wall time and the peak traced allocation of one call."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(times), 'peak_bytes': int(peak)}
+
+
+def _monte_carlo(df: pd.DataFrame):
+    chunk = 256 if len(df) > MC_CHUNK_THRESHOLD else None
+    return monte_carlo_aep(df, n_samples=MC_SAMPLES, random_seed=0, chunk_size=chunk)
+
+
+def bench_parks(sizes: Sequence[int], repeat: int = 1) -> List[Dict[str, object]]:
+    rows = []
+    for n in sizes:
+        df = synthetic_production(n)
+        mc = _monte_carlo(df)
+        cases = [
+            ('aep_from_production', aep_from_production, (df,)),
+            ('monte_carlo_aep', _monte_carlo, (df,)),
+            ('summarize_montecarlo', summarize_montecarlo, (mc,)),
+        ]
+        for name, fn, args in cases:
+            rows.append({'benchmark': name, 'n_turbines': n, **measure(fn, *args, repeat=repeat)})
+    return rows
+
+
+def bench_files(sizes: Sequence[int], directory: Path, repeat: int = 1) -> List[Dict[str, object]]:
+    rows = []
+    parsers = {'production': parse_production_table, 'layout': parse_layout_table,
+               'windrose': parse_windrose}
+    for size in sizes:
+        paths = write_synthetic_files(directory, size)
+        for kind, path in paths.items():
+            result = measure(parsers[kind], str(path), repeat=repeat)
+            rows.append({'benchmark': f'parse_{kind}', 'target_bytes': size,
+                         'file_bytes': path.stat().st_size, **result})
+            path.unlink()
+    return rows
+
+
+def _case_key(row: Dict[str, object]) -> str:
+    size = row.get('n_turbines', row.get('target_bytes'))
+    return f"{row['benchmark']}@{size}"
+
+
+def compare(previous: Dict[str, object], current: Dict[str, object],
+            factor: float = REGRESSION_FACTOR) -> List[str]:
+    """Cases whose time or peak memory grew by more than ``factor``."""
+    before = {_case_key(r): r for r in previous.get('results', [])}
+    flagged = []
+    for row in current.get('results', []):
+        old = before.get(_case_key(row))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if old[metric] > 0 and row[metric] > factor * old[metric]:
+                flagged.append(f"{_case_key(row)} {metric}: {old[metric]:.4g} -> {row[metric]:.4g}")
+    return flagged
+
+
+def latest_result(results_dir: Path) -> Optional[Path]:
+    files = sorted(results_dir.glob('bench_*.json'))
+    return files[-1] if files else None
+
+
+def run(park_sizes: Sequence[int] = PARK_SIZES, file_sizes: Sequence[int] = FILE_SIZES,
+        results_dir: Path = RESULTS_DIR, repeat: int = 1) -> Dict[str, object]:
+    """Run all benchmarks, write a JSON record and return it (with regressions)."""
+    results_dir = Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    previous_path = latest_result(results_dir)
+
+    rows = bench_parks(park_sizes, repeat=repeat)
+    rows += bench_files(file_sizes, results_dir / 'tmp_files', repeat=repeat)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+    record = {
+        'timestamp': stamp,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'results': rows,
+    }
+    if previous_path is not None:
+        record['compared_to'] = previous_path.name
+        record['regressions'] = compare(json.loads(previous_path.read_text()), record)
+    (results_dir / f'bench_{stamp}.json').write_text(json.dumps(record, indent=2))
+    return record
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='small parks and files only')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--results-dir', type=Path, default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+    parks = QUICK_PARK_SIZES if args.quick else PARK_SIZES
+    files = QUICK_FILE_SIZES if args.quick else FILE_SIZES
+    record = run(parks, files, args.results_dir, repeat=args.repeat)
+    for row in record['results']:
+        size = row.get('n_turbines', row.get('file_bytes'))
+        print(f"{row['benchmark']:<24}{size:>12}  {row['seconds']:10.4f} s  {row['peak_bytes'] / 1e6:10.2f} MB")
+    for line in record.get('regressions', []):
+        print('REGRESSION', line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Correlated uncertainty models for the AEP Monte Carlo engine.
+
+The engine needs ``2 * n_turbines`` standard-normal drivers per sample: the
+energy factors of all turbines followed by their availability factors. By
+default they are independent. A :class:`CorrelationModel` maps a block of
+independent latent normals (of dimension ``n_latent``) onto correlated drivers
+that still have unit variance, so every factor keeps its N(1, std) marginal.
+
+Three ways to describe the correlation, from cheapest to most general:
+
+- structured: a park-wide component, optional cluster-wide components
+  (``clusters`` gives one label per turbine) and a turbine-specific rest.
+  ``park_weight`` / ``cluster_weight`` are the variance shares of the shared
+  components; ``category_corr`` correlates the shared energy and availability
+  components. Cost and memory are O(n_turbines) per sample.
+- ``loadings``: a low-rank factor model, shape ``(n, k)`` for ``n`` equal to
+  ``n_turbines`` (applied to both categories) or ``2 * n_turbines``. The
+  residual variance ``1 - sum(loadings**2, axis=1)`` is added as independent
+  noise, so no ``n x n`` matrix is ever formed.
+- ``matrix``: a dense correlation matrix (same shape rules), factorised once
+  by Cholesky. Factorisations are cached by matrix hash, so repeated runs
+  with the same matrix do not pay for it again.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+import numpy as np
+
+_CHOLESKY_CACHE: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+_CHOLESKY_CACHE_SIZE = 8
+
+
+def _matrix_key(matrix: np.ndarray) -> str:
+    h = hashlib.sha1(np.ascontiguousarray(matrix, dtype=float).tobytes())
+    h.update(str(matrix.shape).encode())
+    return h.hexdigest()
+
+
+def cholesky_cached(matrix: np.ndarray) -> np.ndarray:
+    """Lower Cholesky factor of a correlation matrix, cached by content hash.
+
+    Positive semi-definite matrices (e.g. perfectly correlated turbines) fall
+    back to an eigen-decomposition with negative eigenvalues clipped to zero.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError('correlation matrix must be square')
+    key = _matrix_key(matrix)
+    factor = _CHOLESKY_CACHE.get(key)
+    if factor is not None:
+        _CHOLESKY_CACHE.move_to_end(key)
+        return factor
+    try:
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        vals, vecs = np.linalg.eigh(matrix)
+        if vals.min() < -1e-8:
+            raise ValueError('correlation matrix is not positive semi-definite') from None
+        factor = vecs * np.sqrt(np.clip(vals, 0.0, None))
+    factor.setflags(write=False)
+    _CHOLESKY_CACHE[key] = factor
+    while len(_CHOLESKY_CACHE) > _CHOLESKY_CACHE_SIZE:
+        _CHOLESKY_CACHE.popitem(last=False)
+    return factor
+
+
+class CorrelationModel:
+    """Maps independent latent normals to correlated energy/availability drivers."""
+
+    def __init__(self, park_weight: float = 0.0, cluster_weight: float = 0.0,
+                 clusters: Optional[Sequence] = None, category_corr: float = 0.0,
+                 loadings: Optional[np.ndarray] = None,
+                 matrix: Optional[np.ndarray] = None):
+        structured = bool(park_weight or cluster_weight)
+        if sum([structured, loadings is not None, matrix is not None]) > 1:
+            raise ValueError('use either park/cluster weights, loadings or matrix')
+        if park_weight < 0 or cluster_weight < 0 or park_weight + cluster_weight > 1:
+            raise ValueError('park_weight and cluster_weight must be >= 0 and sum to <= 1')
+        if cluster_weight and clusters is None:
+            raise ValueError('cluster_weight needs cluster labels')
+        if not -1.0 <= category_corr <= 1.0:
+            raise ValueError('category_corr must be within [-1, 1]')
+        self.park_weight = float(park_weight)
+        self.cluster_weight = float(cluster_weight)
+        self.category_corr = float(category_corr)
+        self.clusters = None if clusters is None else np.asarray(clusters)
+        self.loadings = None if loadings is None else np.asarray(loadings, dtype=float)
+        self.matrix = None if matrix is None else np.asarray(matrix, dtype=float)
+        self._n_turbines = None
+        self._cluster_codes = None
+        self._n_clusters = 0
+        self._residual = None
+        self._factor = None
+
+    def prepare(self, n_turbines: int) -> 'CorrelationModel':
+        """Validate shapes and do the one-off factorisation for a park size."""
+        if self._n_turbines == n_turbines:
+            return self
+        if self.clusters is not None and self.cluster_weight:
+            if len(self.clusters) != n_turbines:
+                raise ValueError('clusters must have one label per turbine')
+            _, codes = np.unique(self.clusters, return_inverse=True)
+            self._cluster_codes = codes.ravel()
+            self._n_clusters = int(codes.max()) + 1
+        if self.loadings is not None:
+            if self.loadings.ndim != 2 or self.loadings.shape[0] not in (n_turbines, 2 * n_turbines):
+                raise ValueError('loadings must have n_turbines or 2 * n_turbines rows')
+            shared = (self.loadings ** 2).sum(axis=1)
+            if shared.max() > 1.0 + 1e-9:
+                raise ValueError('loadings explain more than unit variance')
+            self._residual = np.sqrt(np.clip(1.0 - shared, 0.0, None))
+        if self.matrix is not None:
+            if self.matrix.shape[0] not in (n_turbines, 2 * n_turbines):
+                raise ValueError('matrix must be n_turbines or 2 * n_turbines square')
+            self._factor = cholesky_cached(self.matrix)
+        self._n_turbines = n_turbines
+        return self
+
+    def n_latent(self, n_turbines: int) -> int:
+        """Number of independent normals ``correlate`` consumes per sample."""
+        self.prepare(n_turbines)
+        if self.loadings is not None:
+            k = self.loadings.shape[1]
+            return 2 * n_turbines + (2 * k if self.loadings.shape[0] == n_turbines else k)
+        if self.matrix is not None:
+            return 2 * n_turbines
+        return 2 + 2 * self._n_clusters + 2 * n_turbines
+
+    def correlate(self, z: np.ndarray, n_turbines: int) -> np.ndarray:
+        """Turn latent normals ``(n, n_latent)`` into drivers ``(n, 2 * n_turbines)``."""
+        self.prepare(n_turbines)
+        t = n_turbines
+        if self.matrix is not None:
+            if self._factor.shape[0] == 2 * t:
+                return z @ self._factor.T
+            return np.concatenate([z[:, :t] @ self._factor.T, z[:, t:] @ self._factor.T], axis=1)
+
+        if self.loadings is not None:
+            idio = z[:, :2 * t]
+            shared = z[:, 2 * t:]
+            if self.loadings.shape[0] == t:
+                k = self.loadings.shape[1]
+                energy = shared[:, :k] @ self.loadings.T + self._residual * idio[:, :t]
+                avail = shared[:, k:] @ self.loadings.T + self._residual * idio[:, t:]
+                return np.concatenate([energy, avail], axis=1)
+            return shared @ self.loadings.T + self._residual * idio
+
+        rho = self.category_corr
+        rho_c = np.sqrt(1.0 - rho * rho)
+        k = self._n_clusters
+        out = z[:, 2 + 2 * k:] * np.sqrt(max(1.0 - self.park_weight - self.cluster_weight, 0.0))
+        if self.park_weight:
+            g_energy = z[:, 0]
+            g_avail = rho * z[:, 0] + rho_c * z[:, 1]
+            w = np.sqrt(self.park_weight)
+            out[:, :t] += w * g_energy[:, None]
+            out[:, t:] += w * g_avail[:, None]
+        if k:
+            c_energy = z[:, 2:2 + k]
+            c_avail = rho * c_energy + rho_c * z[:, 2 + k:2 + 2 * k]
+            w = np.sqrt(self.cluster_weight)
+            out[:, :t] += w * c_energy[:, self._cluster_codes]
+            out[:, t:] += w * c_avail[:, self._cluster_codes]
+        return out
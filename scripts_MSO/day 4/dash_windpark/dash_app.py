@@ -2,31 +2,56 @@
 
 This is intentionally a minimal, dependency-light server entrypoint. It uses
 Dash if installed. The app demonstrates how the parser and aep engine are tied
-together; heavy-lifting like Monte Carlo sampling should be sent to background
-tasks in the real deployment.
+together; Monte Carlo sampling runs as a background job (see ``jobs.py``) and
+the page polls for progress and the result. Tables and results stay on the
+server in a :class:`data_store.DatasetStore`; the browser only holds their key.
+With ``WINDPARK_PROFILE=1`` a debug panel shows per-stage timings (see
+``instrumentation.py``); they are also served as JSON at ``/_windpark/metrics``.
 """
 from __future__ import annotations
 
 import os
+import uuid
 from pathlib import Path
 try:
     import dash
-    from dash import dcc, html, Input, Output, State
-    import plotly.express as px
+    from dash import dcc, html, Input, Output, Patch, State
 except Exception:  # pragma: no cover - optional optional dependency
     dash = None
 
 from .windpro_io import parse_production_table, parse_layout_table
-from .aep_calc import aep_from_production, monte_carlo_aep
+from .aep_calc import aep_from_production
+from .data_store import DatasetStore
+from . import instrumentation
+from .instrumentation import timed
+from .jobs import JobManager
+from .map_render import MAX_POINTS, METRICS, map_figure, marker_style, view_from_relayout
 import pandas as pd
 
+# interactive runs stop once every percentile is known to 0.1 % (95 % CI)
+MC_TARGET_PRECISION = 1e-3
+MC_MAX_SAMPLES = 1 << 16
+DEBUG_POLL_MS = 2000
+METRICS_ROUTE = '/_windpark/metrics'
+MC_POLL_MS = 300
+DATASET_MISSING = 'The dataset is no longer in server memory; please upload the file again.'
 
-def create_app() -> 'dash.Dash | None':
+
+def _message_figure(text: str) -> dict:
+    return {'data': [], 'layout': {
+        'xaxis': {'visible': False}, 'yaxis': {'visible': False},
+        'annotations': [{'text': text, 'showarrow': False, 'xref': 'paper', 'yref': 'paper',
+                         'x': 0.5, 'y': 0.5}]}}
+
+
+def create_app(jobs: JobManager | None = None, store: DatasetStore | None = None) -> 'dash.Dash | None':
     if dash is None:
         print('Dash is not installed in this environment. Install dash to run the demo app.')
         return None
 
     app = dash.Dash(__name__)
+    store = DatasetStore() if store is None else store
+    jobs = JobManager(store=store) if jobs is None else jobs
 
     sample_data_dir = Path(__file__).parent / 'example_data'
     sample_prod = sample_data_dir / 'windpro_production_sample.csv'
@@ -39,38 +64,112 @@ def create_app() -> 'dash.Dash | None':
         df_sample = pd.DataFrame({'turbine_id': ['T1', 'T2', 'T3'], 'annual_energy_mwh': [3000, 3100, 2900]})
 
     summary_df = aep_from_production(df_sample)
-
-    app.layout = html.Div([
-        html.H2('Windpark AEP & Uncertainty — demo'),
-        html.Div('Upload WindPRO production table or use sample'),
-        dcc.Upload(id='upload', children=html.Button('Upload file')),
-        html.Button('Run Monte Carlo (1000)', id='run_mc'),
-        dcc.Loading(id='loading', children=html.Div(id='output_area')),
-        dcc.Graph(id='aep_map'),
-        dcc.Store(id='parsed_production', data=df_sample.to_dict(orient='records'))
-    ])
-
-    @app.callback(Output('output_area', 'children'), Input('run_mc', 'n_clicks'), State('parsed_production', 'data'))
-    def on_run_mc(n_clicks: int, prod_data):
+    sample_key = store.put(df_sample)
+
+    debug = []
+    if instrumentation.is_enabled():
+        debug = [html.Details([html.Summary('Debug: stage timings'), html.Pre(id='debug_panel')]),
+                 dcc.Interval(id='debug_poll', interval=DEBUG_POLL_MS)]
+
+    def layout():
+        # a function, so every page load gets its own id (job group); putting
+        # the sample again brings it back if the store has evicted it
+        store.put(df_sample, sample_key)
+        return html.Div([
+            html.H2('Windpark AEP & Uncertainty — demo'),
+            html.Div('Upload WindPRO production table or use sample'),
+            dcc.Upload(id='upload', children=html.Button('Upload file')),
+            html.Button('Run Monte Carlo (adaptive)', id='run_mc'),
+            html.Div(id='output_area', children=html.Pre(str(summary_df.head()))),
+            dcc.Dropdown(id='map_metric', clearable=False, value='annual_energy_mwh',
+                         options=[{'label': label, 'value': col or 'relative'} for label, col in METRICS.items()]),
+            dcc.Graph(id='aep_map'),
+            dcc.Store(id='map_view'),
+            # only the key goes to the browser; the table stays in ``store``
+            dcc.Store(id='dataset', data={'key': sample_key}),
+            dcc.Store(id='mc_job'),
+            dcc.Store(id='page', data=uuid.uuid4().hex),
+            dcc.Interval(id='mc_poll', interval=MC_POLL_MS, disabled=True),
+            *debug,
+        ])
+
+    app.layout = layout
+
+    @app.server.route(METRICS_ROUTE)
+    def metrics():
+        from flask import jsonify
+        return jsonify(instrumentation.report())
+
+    if debug:
+        @app.callback(Output('debug_panel', 'children'), Input('debug_poll', 'n_intervals'))
+        def show_metrics(n_intervals):
+            return instrumentation.format_report()
+
+    @app.callback(Output('mc_job', 'data'), Output('mc_poll', 'disabled'),
+                  Output('output_area', 'children', allow_duplicate=True),
+                  Input('run_mc', 'n_clicks'), State('dataset', 'data'), State('page', 'data'),
+                  prevent_initial_call=True)
+    @timed('dash_app.on_run_mc')
+    def on_run_mc(n_clicks: int, dataset, page):
         if not n_clicks:
-            return html.Pre(str(summary_df.head()))
-        df = pd.DataFrame(prod_data)
-        mc = monte_carlo_aep(df, n_samples=1000, random_seed=42)
-        pct = mc['percentiles']
-        return html.Pre(pct.to_string(index=False))
-
-    @app.callback(Output('aep_map', 'figure'), Input('parsed_production', 'data'))
-    def render_map(prod_data):
-        df = pd.DataFrame(prod_data)
-        # no position info in production sample — create fake grid for demo
-        if 'x' not in df.columns or 'y' not in df.columns:
-            coords = [(i * 500, i * 500) for i in range(len(df))]
-            df['x'] = [c[0] for c in coords]
-            df['y'] = [c[1] for c in coords]
-
-        fig = px.scatter(df, x='x', y='y', text='turbine_id', size='annual_energy_mwh')
-        fig.update_layout(title='Windpark turbine positions (demo)')
-        return fig
+            return dash.no_update, True, dash.no_update
+        df = store.get((dataset or {}).get('key'))
+        if df is None:
+            # evicted from the DatasetStore (or never stored)
+            return None, True, html.Pre(DATASET_MISSING)
+        # one group per page: a new click supersedes a still-running job
+        job_id = jobs.submit_monte_carlo(df, group=f'run_mc-{page}', adaptive=True,
+                                         target_rel_precision=MC_TARGET_PRECISION,
+                                         max_samples=MC_MAX_SAMPLES, random_seed=42)
+        return {'job_id': job_id}, False, html.Pre('Monte Carlo queued ...')
+
+    @app.callback(Output('output_area', 'children'), Output('mc_poll', 'disabled', allow_duplicate=True),
+                  Input('mc_poll', 'n_intervals'), State('mc_job', 'data'),
+                  prevent_initial_call=True)
+    @timed('dash_app.poll_mc')
+    def poll_mc(n_intervals, job):
+        if not job:
+            return dash.no_update, True
+        st = jobs.status(job['job_id'])
+        if st['status'] in ('pending', 'running'):
+            return html.Pre(f"Monte Carlo running ... {st['progress']:.0%}"), False
+        if st['status'] == 'done':
+            res = jobs.result(job['job_id'])
+            if res is None:
+                return html.Pre('Monte Carlo result expired, please run again'), True
+            note = (f"{res['n_samples']} samples, precision {res['achieved_rel_precision']:.2%}"
+                    + ('' if res['converged'] else ' (not converged)'))
+            return html.Pre(res['percentiles'].to_string(index=False) + '\n' + note), True
+        return html.Pre(f"Monte Carlo {st['status']}: {st['error'] or ''}"), True
+
+    @app.callback(Output('aep_map', 'figure'), Output('map_view', 'data'),
+                  Input('dataset', 'data'), Input('aep_map', 'relayoutData'), Input('map_metric', 'value'),
+                  State('map_view', 'data'))
+    @timed('dash_app.render_map')
+    def render_map(dataset, relayout, metric_value, view):
+        df = store.get((dataset or {}).get('key'))
+        if df is None:
+            return _message_figure(DATASET_MISSING), None
+        metric = None if metric_value == 'relative' else metric_value
+        trigger = dash.ctx.triggered_id
+        if trigger == 'map_metric':
+            # same markers, new colours: send only the changed arrays
+            style = marker_style(df, view, metric)
+            patch = Patch()
+            patch['data'][0]['marker']['size'] = style['size']
+            patch['data'][0]['marker']['color'] = style['color']
+            return patch, dash.no_update
+        if trigger == 'aep_map':
+            if len(df) <= MAX_POINTS:
+                # every turbine is already drawn and plotly zooms client-side;
+                # the view stays None so metric patches cover every point
+                return dash.no_update, None
+            new_view = view_from_relayout(relayout, view)
+            if new_view == view:
+                return dash.no_update, dash.no_update
+            return map_figure(df, new_view, metric), new_view
+        # new dataset: start from the full extent
+        return map_figure(df, None, metric), None
 
     return app
 
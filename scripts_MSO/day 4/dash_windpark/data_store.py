@@ -0,0 +1,180 @@
+"""Server-side dataset store for the Dash app.
+
+Instead of shipping tables to the browser in ``dcc.Store`` payloads, the app
+puts parsed tables (and Monte Carlo results) into a :class:`DatasetStore` and
+only the returned key travels to the client. Callbacks look the key up and
+get the very same Python object back, with no JSON round trip and no
+DataFrame rebuild.
+
+The in-process tier is an LRU bounded by an estimate of the objects' memory
+footprint. With a ``disk_dir``, entries evicted from memory are pickled there
+(itself bounded, oldest first) and promoted back on the next access.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .jobs import content_hash
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 2 * 1024 * 1024 * 1024
+_DISK_SUFFIX = '.pkl'
+
+
+def estimate_nbytes(obj, _seen=None) -> int:
+    """Rough memory footprint of tables, arrays and containers of them."""
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(k, _seen) + estimate_nbytes(v, _seen)
+                                        for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(v, _seen) for v in obj)
+    if hasattr(obj, '__dict__'):
+        return sys.getsizeof(obj) + estimate_nbytes(vars(obj), _seen)
+    return sys.getsizeof(obj)
+
+
+class DatasetStore:
+    """Thread-safe, size-bounded key -> object store with an optional disk tier."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk_dir=None,
+                 disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.disk_max_bytes = int(disk_max_bytes)
+        self._lock = threading.RLock()
+        self._items: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # -- public API -----------------------------------------------------
+    def put(self, obj, key: Optional[str] = None) -> str:
+        """Store ``obj`` and return its key.
+
+        DataFrames are keyed by content hash unless a key is given, so the
+        same table uploaded twice is stored once.
+        """
+        if key is None:
+            key = content_hash(obj) if isinstance(obj, pd.DataFrame) else uuid.uuid4().hex
+        size = estimate_nbytes(obj)
+        with self._lock:
+            self._drop_memory(key)
+            self._items[key] = (obj, size)
+            self._nbytes += size
+            self._evict()
+        return key
+
+    def get(self, key: Optional[str], default=None):
+        """The stored object (the same instance that was put), or ``default``."""
+        if not key:
+            return default
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            obj = self._load_disk(key)
+            if obj is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.put(obj, key)
+            return obj
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._items or (self._disk_path(key) is not None
+                                          and self._disk_path(key).exists())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated size of the in-memory tier."""
+        return self._nbytes
+
+    def discard(self, key: str):
+        with self._lock:
+            self._drop_memory(key)
+            path = self._disk_path(key)
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._nbytes = 0
+            if self.disk_dir is not None:
+                for p in self.disk_dir.glob('*' + _DISK_SUFFIX):
+                    p.unlink(missing_ok=True)
+
+    # -- internals ------------------------------------------------------
+    def _drop_memory(self, key: str):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._nbytes -= old[1]
+
+    def _evict(self):
+        # the newest entry always stays, even if it alone exceeds the budget
+        while self._nbytes > self.max_bytes and len(self._items) > 1:
+            key, (obj, size) = self._items.popitem(last=False)
+            self._nbytes -= size
+            self._spill(key, obj)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / (key + _DISK_SUFFIX)
+
+    def _spill(self, key: str, obj):
+        path = self._disk_path(key)
+        if path is None:
+            return
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as fh:
+            pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        entries = sorted(self.disk_dir.glob('*' + _DISK_SUFFIX), key=lambda p: p.stat().st_mtime_ns)
+        total = sum(p.stat().st_size for p in entries)
+        for p in entries:
+            if total <= self.disk_max_bytes:
+                break
+            total -= p.stat().st_size
+            p.unlink(missing_ok=True)
+
+    def _load_disk(self, key: str):
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as fh:
+                obj = pickle.load(fh)
+        except Exception:
+            path.unlink(missing_ok=True)
+            return None
+        path.unlink(missing_ok=True)
+        return obj
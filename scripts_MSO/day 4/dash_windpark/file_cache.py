@@ -0,0 +1,183 @@
+"""On-disk cache of parsed WindPRO tables.
+
+Parsing large WindPRO Excel exports takes seconds; the canonical DataFrames
+produced by :mod:`windpro_io` are small. :class:`ParsedFileCache` stores those
+outputs in a local cache directory, keyed by the source file's absolute path,
+mtime, size and a SHA-1 of its content plus the kind of table parsed from it
+and the parser's version, so a parser change invalidates old entries.
+Re-opening an unchanged project loads the cached table and never touches the
+Excel parser.
+
+Entries are written as Parquet when ``pyarrow`` is available and as pickles
+otherwise. The directory is bounded by ``max_bytes``; least recently used
+entries (by file mtime, refreshed on every hit) are evicted first; the
+entries just written always stay, even if they alone exceed the budget.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (only needed for the Parquet format)
+    _HAS_PARQUET = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_PARQUET = False
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('WINDPARK_CACHE_DIR', Path.home() / '.cache' / 'dash_windpark'))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# marker for "the parser returned None" (e.g. no windrose in the file)
+_NONE_SUFFIX = '.none'
+_HASH_BLOCK = 1 << 20
+
+
+def file_digest(path) -> str:
+    """SHA-1 of a file's content, read in 1 MiB blocks."""
+    h = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _strip(kind: str, prefix: str) -> str:
+    return kind[len(prefix):] if prefix and kind.startswith(prefix) else kind
+
+
+class ParsedFileCache:
+    """Size-bounded LRU directory of parsed tables (Parquet or pickle)."""
+
+    def __init__(self, cache_dir=None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 use_parquet: Optional[bool] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.use_parquet = _HAS_PARQUET if use_parquet is None else bool(use_parquet)
+        # content hashes of files already seen, by (path, mtime_ns, size)
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _suffix(self) -> str:
+        return '.parquet' if self.use_parquet else '.pkl'
+
+    def key(self, path, kind: str, version: int = 0) -> str:
+        path = os.path.abspath(os.fspath(path))
+        st = os.stat(path)
+        stamp = (path, st.st_mtime_ns, st.st_size)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            digest = file_digest(path)
+            self._digests[stamp] = digest
+        h = hashlib.sha1(repr((kind, version) + stamp + (digest,)).encode())
+        return f'{kind}-{h.hexdigest()}'
+
+    def _entry(self, key: str) -> Optional[Path]:
+        for suffix in (self._suffix, _NONE_SUFFIX):
+            p = self.cache_dir / (key + suffix)
+            if p.exists():
+                return p
+        return None
+
+    def load(self, path, kind: str, parser: Callable, version: int = 0) -> Optional[pd.DataFrame]:
+        """Return the cached table for (path, kind), parsing it on a miss.
+
+        ``version`` identifies the parser's output format; bump it whenever
+        the parser changes.
+        """
+        key = self.key(path, kind, version)
+        entry = self._entry(key)
+        if entry is not None:
+            try:
+                out = self._read(entry)
+            except Exception:
+                # unreadable entry (e.g. interrupted write): drop and re-parse
+                entry.unlink(missing_ok=True)
+            else:
+                os.utime(entry)
+                self.hits += 1
+                return out
+        self.misses += 1
+        out = parser(os.fspath(path))
+        self._write(key, out)
+        self._evict({key})
+        return out
+
+    def load_many(self, path, kinds, parser: Callable, strip_prefix: str = '',
+                  version: int = 0) -> Dict[str, Optional[pd.DataFrame]]:
+        """Like :meth:`load` for several tables parsed from one file in one go.
+
+        ``parser(path)`` must return a dict with an entry per kind; it only
+        runs if any of the kinds is missing from the cache. Keys of the
+        returned dict have ``strip_prefix`` removed.
+        """
+        keys = {kind: self.key(path, kind, version) for kind in kinds}
+        out: Dict[str, Optional[pd.DataFrame]] = {}
+        for kind, key in keys.items():
+            entry = self._entry(key)
+            if entry is None:
+                break
+            try:
+                out[kind] = self._read(entry)
+            except Exception:
+                entry.unlink(missing_ok=True)
+                break
+        else:
+            for key in keys.values():
+                os.utime(self._entry(key))
+            self.hits += 1
+            return {_strip(k, strip_prefix): v for k, v in out.items()}
+
+        self.misses += 1
+        parsed = parser(os.fspath(path))
+        for kind, key in keys.items():
+            self._write(key, parsed[kind])
+        self._evict(set(keys.values()))
+        return {_strip(k, strip_prefix): parsed[k] for k in kinds}
+
+    def clear(self):
+        for p in self._entries():
+            p.unlink(missing_ok=True)
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self):
+        return [p for p in self.cache_dir.iterdir()
+                if p.suffix in ('.parquet', '.pkl', _NONE_SUFFIX) and p.is_file()]
+
+    def _read(self, entry: Path) -> Optional[pd.DataFrame]:
+        if entry.suffix == _NONE_SUFFIX:
+            return None
+        if entry.suffix == '.parquet':
+            return pd.read_parquet(entry)
+        return pd.read_pickle(entry)
+
+    def _write(self, key: str, df: Optional[pd.DataFrame]):
+        if df is None:
+            (self.cache_dir / (key + _NONE_SUFFIX)).touch()
+            return
+        target = self.cache_dir / (key + self._suffix)
+        tmp = target.with_name(target.name + '.tmp')
+        if self.use_parquet:
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, target)
+
+    def _evict(self, keep=()):
+        entries = sorted(self._entries(), key=lambda p: p.stat().st_mtime_ns)
+        total = sum(p.stat().st_size for p in entries)
+        for p in entries:
+            if total <= self.max_bytes:
+                break
+            if p.stem in keep:
+                continue
+            total -= p.stat().st_size
+            p.unlink(missing_ok=True)
@@ -0,0 +1,211 @@
+"""Opt-in stage timing for the windpark pipeline.
+
+Parsing, sampling, percentile computation and Dash callbacks are wrapped in
+:func:`stage` blocks or :func:`timed` functions. While instrumentation is
+disabled (the default) a stage is one flag check returning a shared no-op
+context, so the hooks can stay in hot paths.
+
+Enable with ``WINDPARK_PROFILE=1`` in the environment or :func:`enable`.
+Each finished stage records wall time, items per second (when the stage
+knows how many samples / rows it handled) and, with ``trace_memory``, the
+peak ``tracemalloc`` allocation above the stage's starting point. Nested
+stages in one thread are attributed correctly. The tracemalloc peak is
+process-wide, so a stage that overlaps a stage in another thread (job pool,
+concurrent Dash requests) records ``peak_bytes=None`` rather than a wrong
+number; timings are unaffected. :func:`report` returns JSON-ready
+aggregates and the most recent events; the Dash app shows them in a debug
+panel and serves them at ``/_windpark/metrics``.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Dict, Optional
+
+MAX_EVENTS = 500
+
+_enabled = False
+_trace_memory = False
+_lock = threading.Lock()
+_events: deque = deque(maxlen=MAX_EVENTS)
+_totals: Dict[str, Dict[str, float]] = {}
+_local = threading.local()
+# stages currently open in any thread (memory bookkeeping, under _lock)
+_active: list = []
+
+
+def enable(trace_memory: bool = True):
+    """Start recording stages (and peak allocations if ``trace_memory``)."""
+    global _enabled, _trace_memory
+    _trace_memory = bool(trace_memory)
+    if _trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _events.clear()
+        _totals.clear()
+
+
+class _NoStage:
+    """Shared do-nothing stage used while instrumentation is off."""
+
+    items = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+class _Stage:
+    __slots__ = ('name', 'items', '_start', '_mem_start', '_child_peak', '_parent', '_thread')
+
+    def __init__(self, name: str, items: Optional[int]):
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self._parent = stack[-1] if stack else None
+        self._child_peak = 0
+        self._mem_start = None
+        self._thread = threading.get_ident()
+        with _lock:
+            if any(s._thread != self._thread for s in _active):
+                # the peak would mix both threads' allocations: give up on it
+                for s in _active:
+                    s._mem_start = None
+            elif _trace_memory and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                if self._parent is not None and self._parent._mem_start is not None:
+                    # resetting the peak below would lose the parent's peak so far
+                    self._parent._child_peak = max(self._parent._child_peak, peak)
+                tracemalloc.reset_peak()
+                self._mem_start = current
+            _active.append(self)
+        stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        _local.stack.pop()
+        peak_bytes = None
+        with _lock:
+            _active.remove(self)
+            if self._mem_start is not None and tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1], self._child_peak)
+                peak_bytes = max(0, peak - self._mem_start)
+                if self._parent is not None and self._parent._mem_start is not None:
+                    self._parent._child_peak = max(self._parent._child_peak, peak)
+        _record(self.name, seconds, self.items, peak_bytes, exc_type is None)
+        return False
+
+
+def stage(name: str, items: Optional[int] = None):
+    """Context manager timing one pipeline stage.
+
+    ``items`` (e.g. the number of samples) gives an items/s throughput; it can
+    also be set later on the returned object (``s.items = n``).
+    """
+    if not _enabled:
+        return _NO_STAGE
+    return _Stage(name, items)
+
+
+def timed(name: Optional[str] = None, items: Optional[str] = None):
+    """Decorator running the function inside :func:`stage`.
+
+    ``items`` names an argument whose value (or ``len()`` for sized values)
+    is the stage's item count.
+    """
+    def decorate(fn):
+        label = name or fn.__qualname__
+        signature = inspect.signature(fn) if items else None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            count = None
+            if signature is not None:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                value = bound.arguments.get(items)
+                count = len(value) if hasattr(value, '__len__') else value
+            with _Stage(label, count):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _record(name: str, seconds: float, items, peak_bytes, ok: bool):
+    event = {'stage': name, 'seconds': seconds, 'items': items,
+             'items_per_sec': items / seconds if items and seconds > 0 else None,
+             'peak_bytes': peak_bytes, 'ok': ok, 'time': time.time()}
+    with _lock:
+        _events.append(event)
+        t = _totals.setdefault(name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                                      'items': 0, 'max_peak_bytes': 0})
+        t['count'] += 1
+        t['total_seconds'] += seconds
+        t['max_seconds'] = max(t['max_seconds'], seconds)
+        t['items'] += items or 0
+        t['max_peak_bytes'] = max(t['max_peak_bytes'], peak_bytes or 0)
+
+
+def report(last: int = 50) -> Dict[str, object]:
+    """Per-stage aggregates and the ``last`` events, JSON serialisable."""
+    with _lock:
+        stages = {}
+        for name, t in _totals.items():
+            stages[name] = dict(t, mean_seconds=t['total_seconds'] / t['count'],
+                                items_per_sec=t['items'] / t['total_seconds']
+                                if t['items'] and t['total_seconds'] > 0 else None)
+        events = list(_events)[-last:] if last else []
+    return {'enabled': _enabled, 'trace_memory': _trace_memory, 'stages': stages, 'events': events}
+
+
+def format_report(data: Optional[Dict[str, object]] = None) -> str:
+    """Plain-text table of :func:`report` for the debug panel."""
+    data = report() if data is None else data
+    if not data['stages']:
+        return 'no stages recorded' if data['enabled'] else 'instrumentation disabled (WINDPARK_PROFILE=1)'
+    lines = [f"{'stage':<34}{'n':>6}{'mean s':>10}{'max s':>10}{'items/s':>12}{'peak MB':>10}"]
+    for name, t in sorted(data['stages'].items(), key=lambda kv: -kv[1]['total_seconds']):
+        rate = f"{t['items_per_sec']:.3g}" if t['items_per_sec'] else '-'
+        lines.append(f"{name:<34}{t['count']:>6}{t['mean_seconds']:>10.4f}{t['max_seconds']:>10.4f}"
+                     f"{rate:>12}{t['max_peak_bytes'] / 1e6:>10.2f}")
+    return '\n'.join(lines)
+
+
+if os.environ.get('WINDPARK_PROFILE', '').strip().lower() in ('1', 'true', 'yes', 'on'):
+    enable(trace_memory=os.environ.get('WINDPARK_PROFILE_MEMORY', '1') != '0')
@@ -0,0 +1,250 @@
+"""Background job runner and result cache for the Dash Windpark app.
+
+Monte Carlo runs are submitted to a :class:`JobManager` instead of running
+inside the Dash request. Jobs execute on a small thread pool (NumPy releases
+the GIL for the heavy array work); with ``n_workers > 1`` each job fans out
+further to a process pool through ``monte_carlo_aep(n_workers=...)``.
+
+- progress: jobs run the chunked engine and record ``done / n_samples``,
+  which the UI polls with a ``dcc.Interval``;
+- supersession: submitting a job in a ``group`` (e.g. one per browser
+  session) cancels the group's previous job if it has not finished;
+- adaptive runs: ``submit_monte_carlo(..., adaptive=True)`` runs
+  ``monte_carlo_adaptive`` instead, which stops as soon as the percentiles
+  reach ``target_rel_precision``;
+- memoisation: finished results are kept in an LRU keyed by a content hash of
+  the production table plus the parameters, so re-running an unchanged table
+  returns instantly. With a ``store`` (a :class:`data_store.DatasetStore`)
+  results live in that size-bounded store instead of the built-in LRU.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .aep_calc import monte_carlo_adaptive, monte_carlo_aep
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once it has been cancelled."""
+
+
+def _canonical(value):
+    """JSON-serialisable form of a parameter that depends only on its value.
+
+    Arrays and tables are reduced to a digest of their content; other objects
+    (e.g. a ``CorrelationModel``) to their class and public attributes, so
+    private caches do not change the key. Raises TypeError for anything else
+    (callables included), which could not be keyed by value.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        if data.dtype.hasobject:
+            return {'ndarray': [_canonical(v) for v in data.ravel().tolist()], 'shape': list(data.shape)}
+        return {'ndarray': hashlib.sha1(data.tobytes()).hexdigest(), 'dtype': data.dtype.str,
+                'shape': list(data.shape)}
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return {'table': content_hash(value.to_frame() if isinstance(value, pd.Series) else value)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if hasattr(value, '__dict__') and not callable(value):
+        attrs = {k: _canonical(v) for k, v in vars(value).items() if not k.startswith('_')}
+        return {'class': f'{type(value).__module__}.{type(value).__qualname__}', 'attrs': attrs}
+    raise TypeError(f'cannot build a cache key from a parameter of type {type(value).__name__}')
+
+
+def content_hash(df: pd.DataFrame, **params) -> str:
+    """Stable hash of a table's content (values, index, columns) and parameters.
+
+    Parameters are hashed by value (see ``_canonical``); a parameter that
+    cannot be serialised raises TypeError.
+    """
+    h = hashlib.sha1()
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(json.dumps(_canonical(params), sort_keys=True).encode())
+    return h.hexdigest()
+
+
+class Job:
+    """State of one submitted job, shared between the runner and pollers."""
+
+    def __init__(self, job_id: str, key: str, group: Optional[str]):
+        self.job_id = job_id
+        self.key = key
+        self.group = group
+        self.status = 'pending'
+        self.progress = 0.0
+        self.result = None
+        self.error: Optional[str] = None
+        self.cancelled = threading.Event()
+        self.future = None
+
+    def snapshot(self) -> Dict[str, object]:
+        return {'job_id': self.job_id, 'status': self.status,
+                'progress': self.progress, 'error': self.error}
+
+
+class JobManager:
+    """Runs Monte Carlo jobs off the request thread and memoises results."""
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 32, max_jobs: int = 256,
+                 store=None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='windpark-job')
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._by_group: Dict[str, str] = {}
+        self._results: 'OrderedDict[str, object]' = OrderedDict()
+        self.cache_size = cache_size
+        self.max_jobs = max_jobs
+        self.store = store
+
+    # -- public API -----------------------------------------------------
+    def submit_monte_carlo(self, df_production: pd.DataFrame, group: Optional[str] = None,
+                           adaptive: bool = False, **params) -> str:
+        """Queue ``monte_carlo_aep(df_production, **params)`` and return a job id.
+
+        With ``adaptive=True`` the job runs ``monte_carlo_adaptive`` with
+        ``params`` instead.
+
+        Cached results come back as an already finished job; an identical job
+        that is still running is shared rather than started twice.
+        """
+        if adaptive:
+            params['adaptive'] = True
+        else:
+            params.setdefault('chunk_size', max(1, int(params.get('n_samples', 1000)) // 20))
+        key = content_hash(df_production, **params)
+        with self._lock:
+            if group is not None:
+                self._cancel_group(group, keep_key=key)
+            for job in self._jobs.values():
+                if job.key == key and job.status in ('pending', 'running'):
+                    if group is not None:
+                        self._by_group[group] = job.job_id
+                    return job.job_id
+            job = self._new_job(key, group)
+            cached = self._cached(key)
+            if cached is not None:
+                job.result = None if self.store is not None else cached
+                job.status = 'done'
+                job.progress = 1.0
+                return job.job_id
+            job.future = self._pool.submit(self._run, job, df_production.copy(), params)
+            return job.job_id
+
+    def status(self, job_id: str) -> Dict[str, object]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return {'job_id': job_id, 'status': 'unknown', 'progress': 0.0, 'error': None}
+        return job.snapshot()
+
+    def result(self, job_id: str):
+        """Result of a finished job (None while pending/running or if it failed)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != 'done':
+            return None
+        return job.result if self.store is None else self.store.get(self.result_key(job.key))
+
+    @staticmethod
+    def result_key(key: str) -> str:
+        """Key of a job's result in the dataset store."""
+        return f'mc-{key}'
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in ('pending', 'running'):
+                return False
+            self._cancel(job)
+            return True
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status in ('pending', 'running'):
+                    self._cancel(job)
+        self._pool.shutdown(wait=wait)
+
+    # -- internals ------------------------------------------------------
+    def _cached(self, key: str):
+        if self.store is not None:
+            return self.store.get(self.result_key(key))
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+        return None
+
+    def _remember(self, key: str, result):
+        if self.store is not None:
+            self.store.put(result, self.result_key(key))
+            return
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+    def _new_job(self, key: str, group: Optional[str]) -> Job:
+        job = Job(f'job-{next(self._ids)}', key, group)
+        self._jobs[job.job_id] = job
+        if group is not None:
+            self._by_group[group] = job.job_id
+        while len(self._jobs) > self.max_jobs:
+            oldest = next(iter(self._jobs.values()))
+            if oldest.status in ('pending', 'running'):
+                break
+            self._jobs.popitem(last=False)
+        return job
+
+    def _cancel_group(self, group: str, keep_key: str):
+        previous = self._jobs.get(self._by_group.get(group, ''))
+        if previous is not None and previous.key != keep_key and previous.status in ('pending', 'running'):
+            self._cancel(previous)
+
+    def _cancel(self, job: Job):
+        job.cancelled.set()
+        if job.future is not None and job.future.cancel():
+            job.status = 'cancelled'
+
+    def _run(self, job: Job, df: pd.DataFrame, params: dict):
+        if job.cancelled.is_set():
+            job.status = 'cancelled'
+            return
+        job.status = 'running'
+
+        def progress(done: int, total: int):
+            if job.cancelled.is_set():
+                raise JobCancelled(job.job_id)
+            job.progress = done / total if total else 1.0
+
+        params = dict(params)
+        run = monte_carlo_adaptive if params.pop('adaptive', False) else monte_carlo_aep
+        try:
+            result = run(df, progress=progress, **params)
+        except JobCancelled:
+            job.status = 'cancelled'
+            return
+        except Exception as exc:  # surfaced to the UI through status()
+            job.error = f'{type(exc).__name__}: {exc}'
+            job.status = 'error'
+            return
+        with self._lock:
+            self._remember(job.key, result)
+            job.result = None if self.store is not None else result
+            job.progress = 1.0
+            job.status = 'done'
@@ -0,0 +1,166 @@
+"""Level-of-detail turbine maps for the Dash app.
+
+``map_figure`` draws turbines with a WebGL ``Scattergl`` trace. When more than
+``max_points`` turbines are inside the visible window they are aggregated on
+a ``GRID_BINS x GRID_BINS`` grid (one marker per occupied cell, sized by the
+turbine count), so the figure payload stays bounded however large the park
+is. Zooming in (``relayoutData`` ranges) switches back to single turbines.
+
+``marker_style`` recomputes only marker sizes and colours for a view; the app
+sends them as a Dash ``Patch`` when just the colour metric changes.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import timed
+
+try:
+    import plotly.graph_objects as go
+except Exception:  # pragma: no cover - optional dependency
+    go = None
+
+MAX_POINTS = 2000
+GRID_BINS = 48
+MARKER_SIZE = (6.0, 18.0)
+DEMO_SPACING = 500.0
+# colour metrics offered by the app: label -> column (None: relative to park mean)
+METRICS = {'Annual energy (MWh)': 'annual_energy_mwh', 'Relative to park mean': None}
+
+Range = Optional[Sequence[float]]
+
+
+def with_positions(df: pd.DataFrame) -> pd.DataFrame:
+    """Add demo x/y positions (a diagonal line) if the table has none."""
+    if 'x' in df.columns and 'y' in df.columns:
+        return df
+    out = df.copy()
+    out['x'] = np.arange(len(df)) * DEMO_SPACING
+    out['y'] = np.arange(len(df)) * DEMO_SPACING
+    return out
+
+
+def view_from_relayout(relayout: Optional[dict], previous: Optional[dict] = None) -> Dict[str, Range]:
+    """Visible x/y ranges from a ``dcc.Graph.relayoutData`` event (None: everything)."""
+    view = dict(previous or {'x_range': None, 'y_range': None})
+    if not relayout:
+        return view
+    for axis in ('x', 'y'):
+        key = f'{axis}axis'
+        if relayout.get(f'{key}.autorange'):
+            view[f'{axis}_range'] = None
+        elif f'{key}.range[0]' in relayout:
+            view[f'{axis}_range'] = [float(relayout[f'{key}.range[0]']), float(relayout[f'{key}.range[1]'])]
+        elif f'{key}.range' in relayout:
+            lo, hi = relayout[f'{key}.range']
+            view[f'{axis}_range'] = [float(lo), float(hi)]
+    return view
+
+
+def _in_range(values: np.ndarray, rng: Range) -> np.ndarray:
+    if rng is None:
+        return np.ones(len(values), dtype=bool)
+    lo, hi = sorted(rng)
+    return (values >= lo) & (values <= hi)
+
+
+def grid_aggregate(x: np.ndarray, y: np.ndarray, values: np.ndarray,
+                   n_bins: int = GRID_BINS) -> pd.DataFrame:
+    """Aggregate points on an ``n_bins x n_bins`` grid over their bounding box.
+
+    One row per occupied cell: centroid x/y of its points, count, and the sum
+    and mean of ``values``.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if len(x) == 0:
+        return pd.DataFrame({'x': [], 'y': [], 'count': [], 'sum': [], 'mean': []})
+
+    def cell(v):
+        lo, hi = v.min(), v.max()
+        span = hi - lo if hi > lo else 1.0
+        return np.minimum(((v - lo) / span * n_bins).astype(np.int64), n_bins - 1)
+
+    code = cell(x) * n_bins + cell(y)
+    cells, inverse, count = np.unique(code, return_inverse=True, return_counts=True)
+    total = np.bincount(inverse, values, len(cells))
+    return pd.DataFrame({
+        'x': np.bincount(inverse, x, len(cells)) / count,
+        'y': np.bincount(inverse, y, len(cells)) / count,
+        'count': count,
+        'sum': total,
+        'mean': total / count,
+    })
+
+
+def _scale(values: np.ndarray) -> np.ndarray:
+    lo, hi = MARKER_SIZE
+    if len(values) == 0:
+        return values
+    v_min, v_max = float(np.min(values)), float(np.max(values))
+    if v_max <= v_min:
+        return np.full(len(values), (lo + hi) / 2)
+    return lo + (values - v_min) / (v_max - v_min) * (hi - lo)
+
+
+def map_data(df: pd.DataFrame, view: Optional[dict] = None, metric: Optional[str] = 'annual_energy_mwh',
+             max_points: int = MAX_POINTS) -> Dict[str, object]:
+    """Marker arrays for the visible part of the park.
+
+    Returns a dict with 'mode' ('points' or 'grid'), 'x', 'y', 'size',
+    'color' and 'text' (hover text) of at most ``max(max_points, GRID_BINS**2)``
+    markers.
+    """
+    df = with_positions(df)
+    view = view or {}
+    x = df['x'].to_numpy(dtype=float)
+    y = df['y'].to_numpy(dtype=float)
+    energy = df['annual_energy_mwh'].to_numpy(dtype=float)
+    if metric:
+        colour = df[metric].to_numpy(dtype=float)
+    else:
+        colour = energy / energy.mean() if len(energy) else energy
+    mask = _in_range(x, view.get('x_range')) & _in_range(y, view.get('y_range'))
+    if mask.sum() <= max_points:
+        ids = df['turbine_id'].astype(str).to_numpy()[mask]
+        return {'mode': 'points', 'x': x[mask], 'y': y[mask], 'size': _scale(energy[mask]),
+                'color': colour[mask],
+                'text': [f'{t}: {e:,.0f} MWh' for t, e in zip(ids, energy[mask])]}
+    cells = grid_aggregate(x[mask], y[mask], energy[mask])
+    cell_colour = grid_aggregate(x[mask], y[mask], colour[mask])['mean'].to_numpy()
+    return {'mode': 'grid', 'x': cells['x'].to_numpy(), 'y': cells['y'].to_numpy(),
+            'size': _scale(np.sqrt(cells['count'].to_numpy())), 'color': cell_colour,
+            'text': [f'{c} turbines, {s:,.0f} MWh' for c, s in zip(cells['count'], cells['sum'])]}
+
+
+def marker_style(df: pd.DataFrame, view: Optional[dict] = None, metric: Optional[str] = 'annual_energy_mwh',
+                 max_points: int = MAX_POINTS) -> Dict[str, np.ndarray]:
+    """Only the marker size and colour arrays of :func:`map_data`."""
+    data = map_data(df, view, metric, max_points)
+    return {'size': data['size'], 'color': data['color']}
+
+
+@timed('map_render.map_figure', items='df')
+def map_figure(df: pd.DataFrame, view: Optional[dict] = None, metric: Optional[str] = 'annual_energy_mwh',
+               max_points: int = MAX_POINTS, title: str = 'Windpark turbine positions'):
+    """WebGL scatter of the visible turbines (or grid cells at low zoom)."""
+    if go is None:
+        raise ImportError('plotly is required for map_figure')
+    data = map_data(df, view, metric, max_points)
+    fig = go.Figure(go.Scattergl(
+        x=data['x'], y=data['y'], mode='markers', hovertext=data['text'], hoverinfo='text',
+        marker={'size': data['size'], 'color': data['color'], 'colorscale': 'Viridis',
+                'showscale': True}))
+    suffix = ' (aggregated, zoom in for turbines)' if data['mode'] == 'grid' else ''
+    # a fixed uirevision keeps the user's zoom when the figure is replaced
+    fig.update_layout(title=title + suffix, uirevision='aep_map')
+    if view:
+        if view.get('x_range'):
+            fig.update_xaxes(range=list(view['x_range']))
+        if view.get('y_range'):
+            fig.update_yaxes(range=list(view['y_range']))
+    return fig
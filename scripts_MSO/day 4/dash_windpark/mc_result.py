@@ -0,0 +1,147 @@
+"""Compact container for Monte Carlo AEP output.
+
+:class:`MonteCarloResult` keeps the per-turbine samples as one contiguous
+``(n_samples, n_turbines)`` array (exact mode) or only the histogram sketches
+(chunked mode), and computes any percentile set for all turbines at once,
+with a single ``np.percentile(..., axis=0)`` call or one sketch lookup.
+
+Results still behave like the dicts ``monte_carlo_aep`` used to return
+(``result['percentiles']``, ``result['samples']``, ...), so existing callers
+keep working.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import stage
+
+try:
+    import pyarrow as pa
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+
+
+def percentile_labels(qs: Iterable[float]) -> list:
+    return [f'{q:g}' for q in qs]
+
+
+class MonteCarloResult:
+    """Park and per-turbine Monte Carlo output, from samples or sketches."""
+
+    _KEYS = ('samples', 'per_turbine', 'percentiles', 'per_turbine_percentiles', 'n_samples',
+             'mean_mwh', 'std_mwh', 'error_bound_mwh', 'sketch', 'per_turbine_sketch')
+
+    def __init__(self, turbine_ids: Sequence[str], percentile_levels: Sequence[float],
+                 samples: Optional[np.ndarray] = None, production: Optional[np.ndarray] = None,
+                 sketch=None, turbine_sketch=None, n_samples: Optional[int] = None,
+                 mean_mwh: Optional[float] = None, std_mwh: Optional[float] = None,
+                 extra: Optional[Dict[str, object]] = None):
+        self.turbine_ids = list(turbine_ids)
+        self.percentile_levels = tuple(float(q) for q in percentile_levels)
+        self.production = None if production is None else np.ascontiguousarray(production)
+        if samples is None and self.production is not None:
+            samples = self.production.sum(axis=1)
+        self.samples = samples
+        self.sketch = sketch
+        self.turbine_sketch = turbine_sketch
+        if n_samples is None:
+            n_samples = len(samples) if samples is not None else int(sketch.n)
+        self.n_samples = int(n_samples)
+        self.mean_mwh = float(samples.mean()) if mean_mwh is None else float(mean_mwh)
+        self.std_mwh = float(samples.std()) if std_mwh is None else float(std_mwh)
+        self.extra = dict(extra or {})
+
+    # -- percentiles ----------------------------------------------------
+    def _levels(self, qs) -> list:
+        return list(self.percentile_levels if qs is None else np.atleast_1d(qs).astype(float))
+
+    def park_percentiles(self, qs: Optional[Iterable[float]] = None) -> np.ndarray:
+        """Park-total percentiles (MWh) at ``qs`` (default: the reported levels)."""
+        qs = self._levels(qs)
+        with stage('mc_result.park_percentiles', self.n_samples):
+            if self.samples is not None:
+                return np.percentile(self.samples, qs)
+            return self.sketch.percentile(qs)[:, 0]
+
+    def turbine_percentiles(self, qs: Optional[Iterable[float]] = None) -> Optional[np.ndarray]:
+        """Per-turbine percentiles, shape ``(len(qs), n_turbines)``."""
+        qs = self._levels(qs)
+        with stage('mc_result.turbine_percentiles', self.n_samples * len(self.turbine_ids)):
+            if self.production is not None:
+                return np.percentile(self.production, qs, axis=0)
+            if self.turbine_sketch is not None:
+                return self.turbine_sketch.percentile(qs)
+            return None
+
+    @property
+    def error_bound_mwh(self) -> float:
+        """Max. deviation of park percentiles from exact ones (0 with samples)."""
+        if self.samples is not None or self.sketch is None:
+            return 0.0
+        return float(self.sketch.error_bound[0])
+
+    # -- export ---------------------------------------------------------
+    def to_frame(self, qs: Optional[Iterable[float]] = None) -> pd.DataFrame:
+        """Tidy table: scope ('park' / 'turbine'), turbine_id, percentile, mwh."""
+        qs = self._levels(qs)
+        park = pd.DataFrame({'scope': 'park', 'turbine_id': None, 'percentile': qs,
+                             'mwh': self.park_percentiles(qs)})
+        table = self.turbine_percentiles(qs)
+        if table is None:
+            return park
+        n_t = len(self.turbine_ids)
+        turbines = pd.DataFrame({'scope': 'turbine',
+                                 'turbine_id': np.tile(np.asarray(self.turbine_ids, dtype=object), len(qs)),
+                                 'percentile': np.repeat(qs, n_t),
+                                 'mwh': table.ravel()})
+        return pd.concat([park, turbines], ignore_index=True)
+
+    def to_arrow(self, qs: Optional[Iterable[float]] = None):
+        """:meth:`to_frame` as a ``pyarrow.Table`` (needs pyarrow)."""
+        if pa is None:
+            raise ImportError('pyarrow is required for to_arrow')
+        return pa.Table.from_pandas(self.to_frame(qs), preserve_index=False)
+
+    # -- dict-style access (backwards compatible) -----------------------
+    def _legacy(self, key: str):
+        if key == 'percentiles':
+            return pd.DataFrame({'percentile': percentile_labels(self.percentile_levels),
+                                 'mwh': self.park_percentiles()})
+        if key == 'per_turbine_percentiles':
+            table = self.turbine_percentiles()
+            if table is None:
+                return None
+            out = pd.DataFrame(table.T, columns=percentile_labels(self.percentile_levels))
+            out.insert(0, 'turbine_id', self.turbine_ids)
+            return out
+        if key == 'per_turbine':
+            if self.production is None:
+                return None
+            return {tid: self.production[:, i] for i, tid in enumerate(self.turbine_ids)}
+        if key == 'per_turbine_sketch':
+            return self.turbine_sketch
+        return getattr(self, key)
+
+    def __getitem__(self, key: str):
+        if key in self.extra:
+            return self.extra[key]
+        if key in self._KEYS:
+            return self._legacy(key)
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._KEYS or key in self.extra
+
+    def keys(self):
+        return list(self._KEYS) + list(self.extra)
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self else default
+
+    def __repr__(self) -> str:
+        kind = 'samples' if self.production is not None else 'sketch' if self.turbine_sketch else 'park'
+        return (f'MonteCarloResult(n_samples={self.n_samples}, n_turbines={len(self.turbine_ids)}, '
+                f'{kind}, mean_mwh={self.mean_mwh:.6g})')
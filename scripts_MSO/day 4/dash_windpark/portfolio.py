@@ -0,0 +1,143 @@
+"""Portfolio-level Monte Carlo across many wind parks in one array program.
+
+All parks' production tables are concatenated into one ragged turbine axis
+with ``offsets`` (park ``p`` owns turbines ``offsets[p]:offsets[p + 1]``).
+Each sample draws, in a single block of normals,
+
+- one resource factor per region, shared by all parks in that region,
+- one factor per park (park-specific resource / loss uncertainty),
+- the per-turbine energy and availability factors of ``aep_calc``,
+
+and reduces turbines to park totals with ``np.add.reduceat``. Park and
+portfolio totals go into the same mergeable histogram sketches as the
+chunked single-park engine, so memory stays flat in ``n_samples``.
+
+P-values follow the wind-industry convention: P90 is the production exceeded
+with 90 % probability, i.e. the 10th percentile.
+"""
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .aep_calc import DEFAULT_CHUNK_SIZE, PARK_SKETCH_BINS, _factor_bounds, turbine_sketch_bins
+from .sampling import make_sampler
+from .sketches import HistogramSketch
+
+# P-value -> percentile of the production distribution
+EXCEEDANCE = {'P50': 50.0, 'P75': 25.0, 'P90': 10.0}
+
+
+def _clipped(z: np.ndarray, std: float) -> np.ndarray:
+    out = 1.0 + std * z
+    np.clip(out, 0.0, None, out=out)
+    return out
+
+
+def monte_carlo_portfolio(tables: Mapping[str, pd.DataFrame],
+                          regions: Optional[Mapping[str, str]] = None,
+                          n_samples: int = 10000,
+                          regional_std: float = 0.04,
+                          park_std: float = 0.03,
+                          energy_scale_std: float = 0.05,
+                          availability_std: float = 0.01,
+                          random_seed: int | None = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          sampler: str = 'random') -> Dict[str, object]:
+    """Joint Monte Carlo of many parks with shared regional resource factors.
+
+    - tables: park name -> production table (['turbine_id', 'annual_energy_mwh']).
+    - regions: park name -> region label; parks in the same region share the
+      regional factor. Parks without a region get their own.
+    - regional_std / park_std: relative std of the shared factors;
+      energy_scale_std / availability_std act per turbine as in ``monte_carlo_aep``.
+
+    Returns a dict with 'percentiles' (portfolio P50/P75/P90), 'parks' (per
+    park mean, P50, P90, share of the portfolio mean and contribution to the
+    portfolio variance, cov(park, portfolio) / var(portfolio), which sums to
+    1), 'mean_mwh', 'std_mwh', 'n_samples', 'error_bound_mwh' and the sketches.
+    """
+    names = [str(n) for n in tables]
+    if not names:
+        raise ValueError('portfolio needs at least one park')
+    bases = [t['annual_energy_mwh'].to_numpy(dtype=float) for t in tables.values()]
+    counts = np.array([len(b) for b in bases])
+    if (counts == 0).any():
+        raise ValueError('every park needs at least one turbine')
+    base = np.concatenate(bases)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    regions = regions or {}
+    region_labels = [str(regions.get(n, f'__park__{n}')) for n in names]
+    _, region_codes = np.unique(region_labels, return_inverse=True)
+    region_codes = region_codes.ravel()
+    n_regions = int(region_codes.max()) + 1
+    n_parks = len(names)
+    n_turbines = len(base)
+
+    # sketch ranges from the factor bounds, as in aep_calc._new_sketches
+    bounds = [_factor_bounds(s) for s in (regional_std, park_std, energy_scale_std, availability_std)]
+    lo_f = np.prod([b[0] for b in bounds])
+    hi_f = np.prod([b[1] for b in bounds])
+    park_base = np.add.reduceat(base, offsets[:-1])
+    park_lo = np.minimum(park_base * lo_f, park_base * hi_f)
+    park_hi = np.maximum(park_base * lo_f, park_base * hi_f)
+    portfolio_sketch = HistogramSketch(park_lo.sum(), park_hi.sum(), n_bins=PARK_SKETCH_BINS)
+    park_sketch = HistogramSketch(park_lo, park_hi, n_bins=turbine_sketch_bins(n_parks))
+
+    draws = make_sampler(sampler, n_regions + n_parks + 2 * n_turbines, random_seed)
+    sum_total = 0.0
+    sum_total_sq = 0.0
+    sum_park = np.zeros(n_parks)
+    sum_park_total = np.zeros(n_parks)
+    done = 0
+    while done < n_samples:
+        n = min(chunk_size, n_samples - done)
+        z = draws.normal(n)
+        shared = _clipped(z[:, :n_regions], regional_std)[:, region_codes]
+        shared *= _clipped(z[:, n_regions:n_regions + n_parks], park_std)
+        t0 = n_regions + n_parks
+        turbine = _clipped(z[:, t0:t0 + n_turbines], energy_scale_std)
+        turbine *= _clipped(z[:, t0 + n_turbines:], availability_std)
+        turbine *= base
+        parks = np.add.reduceat(turbine, offsets[:-1], axis=1)
+        parks *= shared
+        total = parks.sum(axis=1)
+
+        portfolio_sketch.update(total)
+        park_sketch.update(parks)
+        sum_total += float(total.sum())
+        sum_total_sq += float(np.dot(total, total))
+        sum_park += parks.sum(axis=0)
+        sum_park_total += total @ parks
+        done += n
+
+    mean = sum_total / n_samples
+    var = max(sum_total_sq / n_samples - mean * mean, 0.0)
+    park_mean = sum_park / n_samples
+    cov = sum_park_total / n_samples - park_mean * mean
+    contribution = cov / var if var > 0 else np.full(n_parks, np.nan)
+
+    pct = portfolio_sketch.percentile(list(EXCEEDANCE.values()))[:, 0]
+    park_pct = park_sketch.percentile([EXCEEDANCE['P50'], EXCEEDANCE['P90']])
+    parks_df = pd.DataFrame({
+        'park': names,
+        'region': [regions.get(n) for n in names],
+        'n_turbines': counts,
+        'mean_mwh': park_mean,
+        'p50_mwh': park_pct[0],
+        'p90_mwh': park_pct[1],
+        'share_of_mean': park_mean / mean if mean else np.nan,
+        'variance_contribution': contribution,
+    })
+    return {
+        'percentiles': pd.DataFrame({'metric': list(EXCEEDANCE), 'mwh': pct}),
+        'parks': parks_df,
+        'mean_mwh': mean,
+        'std_mwh': var ** 0.5,
+        'n_samples': n_samples,
+        'error_bound_mwh': float(portfolio_sketch.error_bound[0]),
+        'sketch': portfolio_sketch,
+        'park_sketch': park_sketch,
+    }
@@ -0,0 +1,116 @@
+"""Fixed-memory quantile sketches for streaming Monte Carlo output.
+
+The streaming Monte Carlo engine in :mod:`aep_calc` cannot keep every sample
+once ``n_samples`` grows into the millions. Instead it feeds each block of
+samples into a :class:`HistogramSketch`: a fixed-range, fixed-bin histogram
+per column (park total or turbine). Memory is ``n_columns * n_bins`` counters
+no matter how many samples are pushed through it, an update touches only the
+bins a block falls into (one ``np.bincount`` when the block is large compared
+to the table, ``np.add.at`` otherwise) and two sketches with the same edges merge by adding
+their counts (which makes the result independent of how samples were split
+across chunks or worker processes).
+
+Error bound: for values inside ``[lo, hi]`` a percentile returned by
+:meth:`HistogramSketch.percentile` differs from the exact ``np.percentile`` of
+the same samples by at most one bin width, ``(hi - lo) / n_bins``. Values
+outside the range are counted in the first/last bin; callers choose the range
+wide enough (see ``aep_calc``) that this does not happen in practice.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+
+class HistogramSketch:
+    """Mergeable fixed-bin quantile sketch over one or more columns.
+
+    ``lo``/``hi`` are scalars or one value per column. ``update`` accepts a
+    1-D array (single column) or a ``(n, n_columns)`` block.
+    """
+
+    def __init__(self, lo, hi, n_bins: int = 2048):
+        lo = np.atleast_1d(np.asarray(lo, dtype=float))
+        hi = np.atleast_1d(np.asarray(hi, dtype=float))
+        if lo.shape != hi.shape:
+            raise ValueError('lo and hi must have the same shape')
+        if n_bins < 1:
+            raise ValueError('n_bins must be positive')
+        self.lo = np.minimum(lo, hi)
+        self.hi = np.maximum(lo, hi)
+        self.n_bins = int(n_bins)
+        span = self.hi - self.lo
+        # degenerate (zero-width) columns get a dummy width; percentiles are
+        # clamped to the observed min/max so they still come out exact
+        self._width = np.where(span > 0, span / self.n_bins, 1.0)
+        self.counts = np.zeros((lo.size, self.n_bins), dtype=np.int64)
+        self.n = 0
+        self.min = np.full(lo.size, np.inf)
+        self.max = np.full(lo.size, -np.inf)
+
+    @property
+    def n_columns(self) -> int:
+        return self.counts.shape[0]
+
+    @property
+    def error_bound(self) -> np.ndarray:
+        """Worst-case absolute percentile error per column (one bin width)."""
+        return np.where(self.hi > self.lo, self._width, 0.0)
+
+    def update(self, values: np.ndarray) -> 'HistogramSketch':
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        if values.shape[1] != self.n_columns:
+            raise ValueError(f'expected {self.n_columns} columns, got {values.shape[1]}')
+        if values.shape[0] == 0:
+            return self
+        idx = ((values - self.lo) / self._width).astype(np.int64)
+        np.clip(idx, 0, self.n_bins - 1, out=idx)
+        idx += np.arange(self.n_columns, dtype=np.int64) * self.n_bins
+        if idx.size >= self.counts.size // 4:
+            self.counts += np.bincount(idx.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        else:
+            # a dense bincount would allocate the whole table per block
+            np.add.at(self.counts.reshape(-1), idx.ravel(), 1)
+        self.n += values.shape[0]
+        np.minimum(self.min, values.min(axis=0), out=self.min)
+        np.maximum(self.max, values.max(axis=0), out=self.max)
+        return self
+
+    def compatible(self, other: 'HistogramSketch') -> bool:
+        return (self.n_bins == other.n_bins and self.lo.shape == other.lo.shape
+                and np.array_equal(self.lo, other.lo) and np.array_equal(self.hi, other.hi))
+
+    def merge(self, other: 'HistogramSketch') -> 'HistogramSketch':
+        """Add the counts of ``other`` (same edges) into this sketch in place."""
+        if not self.compatible(other):
+            raise ValueError('cannot merge sketches with different bin edges')
+        self.counts += other.counts
+        self.n += other.n
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        return self
+
+    def percentile(self, q: Iterable[float]) -> np.ndarray:
+        """Approximate percentiles (0-100), shape ``(len(q), n_columns)``.
+
+        Uses the same rank convention as ``np.percentile`` (linear method) and
+        places a rank uniformly inside the bin that holds it.
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.n == 0:
+            raise ValueError('sketch is empty')
+        cum = np.cumsum(self.counts, axis=1)
+        out = np.empty((q.size, self.n_columns))
+        for k, qk in enumerate(q):
+            rank = qk / 100.0 * (self.n - 1)
+            b = (cum <= rank).sum(axis=1)
+            np.minimum(b, self.n_bins - 1, out=b)
+            cols = np.arange(self.n_columns)
+            below = np.where(b > 0, cum[cols, np.maximum(b - 1, 0)], 0)
+            in_bin = np.maximum(self.counts[cols, b], 1)
+            frac = (rank - below + 0.5) / in_bin
+            out[k] = self.lo + (b + np.clip(frac, 0.0, 1.0)) * self._width
+        return np.clip(out, self.min, self.max)
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from dash_windpark.aep_calc import aep_from_production, monte_carlo_aep, summarize_montecarlo
+from dash_windpark.aep_calc import (TURBINE_SKETCH_BINS, TURBINE_SKETCH_MAX_BYTES, aep_from_production,
+                                    monte_carlo_adaptive, monte_carlo_aep, summarize_montecarlo)
 
 
 def test_aep_from_production_basic():
@@ -25,3 +26,96 @@ def test_summarize_montecarlo():
     res = monte_carlo_aep(df, n_samples=50, energy_scale_std=0.0, availability_std=0.0, random_seed=4)
     sum_df = summarize_montecarlo(res)
     assert sum_df['median'].iloc[0] == 1000.0
+
+
+def test_monte_carlo_chunked_matches_exact():
+    df = pd.DataFrame({'turbine_id': [f'T{i}' for i in range(8)],
+                       'annual_energy_mwh': np.linspace(2000, 3000, 8)})
+    exact = monte_carlo_aep(df, n_samples=20000, random_seed=1)
+    chunked = monte_carlo_aep(df, n_samples=20000, random_seed=1, chunk_size=20000)
+    assert chunked['samples'] is None
+    # same draws in one chunk -> sketch percentiles within the documented bound
+    diff = np.abs(chunked['percentiles']['mwh'].to_numpy() - exact['percentiles']['mwh'].to_numpy())
+    assert np.all(diff <= chunked['error_bound_mwh'])
+    assert abs(chunked['mean_mwh'] - exact['samples'].mean()) < 1e-6 * exact['samples'].mean()
+    per_t = chunked['per_turbine_percentiles']
+    assert per_t['turbine_id'].tolist() == df['turbine_id'].tolist()
+    exact_t = np.percentile(exact['per_turbine']['T3'], 50)
+    bound = chunked['per_turbine_sketch'].error_bound[3]
+    assert abs(per_t.loc[3, '50'] - exact_t) <= bound
+
+
+def test_turbine_sketch_memory_is_bounded():
+    n = 50_000
+    df = pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n)], 'annual_energy_mwh': np.full(n, 2000.0)})
+    res = monte_carlo_aep(df, n_samples=8, random_seed=0, chunk_size=8)
+    sketch = res['per_turbine_sketch']
+    assert sketch.counts.nbytes <= TURBINE_SKETCH_MAX_BYTES
+    assert sketch.n_bins < TURBINE_SKETCH_BINS
+    small = monte_carlo_aep(df.head(8), n_samples=8, random_seed=0, chunk_size=8)
+    assert small['per_turbine_sketch'].n_bins == TURBINE_SKETCH_BINS
+
+
+def test_monte_carlo_chunked_small_blocks():
+    df = pd.DataFrame({'turbine_id': ['T1', 'T2'], 'annual_energy_mwh': [1000, 2000]})
+    res = monte_carlo_aep(df, n_samples=10001, random_seed=3, chunk_size=997)
+    assert res['n_samples'] == 10001
+    assert res['sketch'].n == 10001
+    median = summarize_montecarlo(res)['median'].iloc[0]
+    assert abs(median - 3000) < 0.01 * 3000
+
+
+def test_monte_carlo_parallel_reproducible():
+    df = pd.DataFrame({'turbine_id': ['T1', 'T2', 'T3'], 'annual_energy_mwh': [1000, 2000, 1500]})
+    a = monte_carlo_aep(df, n_samples=5001, random_seed=7, chunk_size=1000, n_workers=2)
+    b = monte_carlo_aep(df, n_samples=5001, random_seed=7, chunk_size=1000, n_workers=2)
+    assert a['sketch'].n == 5001
+    assert np.array_equal(a['percentiles']['mwh'].to_numpy(), b['percentiles']['mwh'].to_numpy())
+    assert a['mean_mwh'] == b['mean_mwh']
+    assert np.array_equal(a['per_turbine_sketch'].counts, b['per_turbine_sketch'].counts)
+    assert abs(a['mean_mwh'] - 4500) < 0.01 * 4500
+
+
+def test_monte_carlo_adaptive_stops_at_target():
+    df = pd.DataFrame({'turbine_id': ['T1', 'T2', 'T3'], 'annual_energy_mwh': [5000.0, 6000.0, 7000.0]})
+    loose = monte_carlo_adaptive(df, target_rel_precision=5e-3, random_seed=0)
+    tight = monte_carlo_adaptive(df, target_rel_precision=1e-3, random_seed=0)
+    assert loose['converged'] and tight['converged']
+    assert loose['achieved_rel_precision'] <= 5e-3
+    assert tight['achieved_rel_precision'] <= 1e-3
+    assert loose['n_samples'] < tight['n_samples']
+    assert len(tight['samples']) == tight['n_samples']
+    assert list(tight['percentiles']['percentile']) == ['2.5', '16', '50', '84', '97.5']
+    assert summarize_montecarlo(tight)['median'].iloc[0] > 0
+
+
+def test_monte_carlo_adaptive_respects_max_samples():
+    df = pd.DataFrame({'turbine_id': ['T1'], 'annual_energy_mwh': [5000.0]})
+    out = monte_carlo_adaptive(df, target_rel_precision=1e-7, percentiles=[1, 99],
+                               initial_samples=256, max_samples=4096, random_seed=1)
+    assert not out['converged']
+    assert out['n_samples'] == 4096
+    assert out['achieved_rel_precision'] > 1e-7
+
+
+def test_result_object_percentiles_and_export():
+    df = pd.DataFrame({'turbine_id': ['T1', 'T2', 'T3'], 'annual_energy_mwh': [5000.0, 6000.0, 7000.0]})
+    res = monte_carlo_aep(df, n_samples=4000, random_seed=5)
+    assert res.production.shape == (4000, 3) and res.production.flags['C_CONTIGUOUS']
+    table = res.turbine_percentiles([10, 50, 90])
+    assert table.shape == (3, 3)
+    assert np.allclose(table[:, 1], np.percentile(res['per_turbine']['T2'], [10, 50, 90]))
+    assert np.allclose(res.park_percentiles([50]), np.median(res['samples']))
+
+    tidy = res.to_frame([10, 90])
+    assert list(tidy.columns) == ['scope', 'turbine_id', 'percentile', 'mwh']
+    assert len(tidy) == 2 + 2 * 3
+    row = tidy[(tidy['turbine_id'] == 'T3') & (tidy['percentile'] == 90)]
+    assert np.isclose(row['mwh'].iloc[0], table[2, 2])
+    assert res.to_arrow([50]).num_rows == 4
+
+    chunked = monte_carlo_aep(df, n_samples=4000, random_seed=5, chunk_size=1000)
+    assert chunked.turbine_percentiles([50]).shape == (1, 3)
+    assert chunked['per_turbine_percentiles'].shape == (3, 6)
+    s = summarize_montecarlo(chunked)
+    assert s['lo_1sigma'].iloc[0] < s['median'].iloc[0] < s['hi_1sigma'].iloc[0]
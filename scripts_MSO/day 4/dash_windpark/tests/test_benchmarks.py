@@ -0,0 +1,29 @@
+import json
+
+from dash_windpark.benchmarks.bench_scaling import compare, run, write_synthetic_files
+
+
+def test_synthetic_files_hit_target_size(tmp_path):
+    paths = write_synthetic_files(tmp_path, 50_000)
+    for path in paths.values():
+        assert 25_000 < path.stat().st_size < 100_000
+
+
+def test_run_writes_json_and_compares(tmp_path):
+    first = run(park_sizes=(10,), file_sizes=(1_000,), results_dir=tmp_path)
+    names = {r['benchmark'] for r in first['results']}
+    assert names == {'aep_from_production', 'monte_carlo_aep', 'summarize_montecarlo',
+                     'parse_production', 'parse_layout', 'parse_windrose'}
+    assert all(r['seconds'] >= 0 and r['peak_bytes'] >= 0 for r in first['results'])
+    second = run(park_sizes=(10,), file_sizes=(1_000,), results_dir=tmp_path)
+    assert second['compared_to'].startswith('bench_')
+    stored = sorted(tmp_path.glob('bench_*.json'))
+    assert len(stored) == 2
+    assert json.loads(stored[-1].read_text())['timestamp'] == second['timestamp']
+
+
+def test_compare_flags_slowdowns():
+    old = {'results': [{'benchmark': 'monte_carlo_aep', 'n_turbines': 10, 'seconds': 1.0, 'peak_bytes': 100}]}
+    new = {'results': [{'benchmark': 'monte_carlo_aep', 'n_turbines': 10, 'seconds': 2.0, 'peak_bytes': 100}]}
+    assert compare(old, new) == ['monte_carlo_aep@10 seconds: 1 -> 2']
+    assert compare(old, old) == []
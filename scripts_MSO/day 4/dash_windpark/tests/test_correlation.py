@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from dash_windpark.correlation import CorrelationModel, cholesky_cached
+from dash_windpark.aep_calc import monte_carlo_aep
+
+
+def _drivers(model, n_turbines, n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((n, model.n_latent(n_turbines)))
+    return model.correlate(z, n_turbines)
+
+
+def test_structured_model_correlations():
+    model = CorrelationModel(park_weight=0.3, cluster_weight=0.4, clusters=['a', 'a', 'b', 'b'],
+                             category_corr=0.5)
+    d = _drivers(model, 4)
+    assert d.shape == (20000, 8)
+    assert np.allclose(d.std(axis=0), 1.0, atol=0.03)
+    c = np.corrcoef(d.T)
+    assert abs(c[0, 1] - 0.7) < 0.03   # same cluster: park + cluster share
+    assert abs(c[0, 2] - 0.3) < 0.03   # other cluster: park share only
+    assert abs(c[0, 4] - 0.7 * 0.5) < 0.03  # energy vs availability, same turbine
+
+
+def test_low_rank_loadings_match_dense_matrix():
+    loadings = np.full((5, 1), 0.6)
+    dense = loadings @ loadings.T
+    np.fill_diagonal(dense, 1.0)
+    c_low = np.corrcoef(_drivers(CorrelationModel(loadings=loadings), 5)[:, :5].T)
+    c_dense = np.corrcoef(_drivers(CorrelationModel(matrix=dense), 5)[:, :5].T)
+    assert np.allclose(c_low, dense, atol=0.03)
+    assert np.allclose(c_dense, dense, atol=0.03)
+
+
+def test_cholesky_is_cached_by_content():
+    m = np.array([[1.0, 0.5], [0.5, 1.0]])
+    assert cholesky_cached(m) is cholesky_cached(m.copy())
+    singular = np.ones((3, 3))
+    f = cholesky_cached(singular)
+    assert np.allclose(f @ f.T, singular)
+
+
+def test_invalid_models():
+    with pytest.raises(ValueError):
+        CorrelationModel(park_weight=0.7, cluster_weight=0.5, clusters=[0])
+    with pytest.raises(ValueError):
+        CorrelationModel(park_weight=0.5, matrix=np.eye(2))
+    with pytest.raises(ValueError):
+        CorrelationModel(loadings=np.ones((2, 1))).n_latent(3)
+
+
+def test_monte_carlo_park_correlation_widens_spread():
+    df = pd.DataFrame({'turbine_id': [f'T{i}' for i in range(20)], 'annual_energy_mwh': np.full(20, 1000.0)})
+    indep = monte_carlo_aep(df, n_samples=4000, random_seed=0)
+    corr = monte_carlo_aep(df, n_samples=4000, random_seed=0,
+                           correlation=CorrelationModel(park_weight=0.8))
+    assert corr['samples'].std() > 2 * indep['samples'].std()
+    streamed = monte_carlo_aep(df, n_samples=4000, random_seed=0, chunk_size=1000,
+                               correlation=CorrelationModel(park_weight=0.8))
+    assert abs(streamed['std_mwh'] - corr['samples'].std()) < 0.1 * corr['samples'].std()
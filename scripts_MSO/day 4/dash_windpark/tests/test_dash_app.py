@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+dash = pytest.importorskip('dash')
+
+from dash_windpark.dash_app import create_app  # noqa: E402
+from dash_windpark.data_store import DatasetStore  # noqa: E402
+from dash_windpark.jobs import JobManager  # noqa: E402
+
+
+def _callback(app, output):
+    client = app.server.test_client()
+    deps = client.get('/_dash-dependencies').get_json()
+    spec = next(d for d in deps if output in d['output'])
+
+    def call(trigger, values):
+        def prop(dep):
+            return dict(dep, value=values.get(f"{dep['id']}.{dep['property']}"))
+        outputs = [dict(zip(('id', 'property'), o.split('.'))) for o in spec['output'].strip('.').split('...')]
+        body = {'output': spec['output'], 'outputs': outputs if len(outputs) > 1 else outputs[0],
+                'inputs': [prop(d) for d in spec['inputs']], 'state': [prop(d) for d in spec['state']],
+                'changedPropIds': [trigger]}
+        resp = client.post('/_dash-update-component', json=body)
+        return resp.get_json()['response'] if resp.status_code == 200 else None
+    return call
+
+
+class RecordingJobs(JobManager):
+    def __init__(self):
+        super().__init__()
+        self.groups = []
+
+    def submit_monte_carlo(self, df, group=None, adaptive=False, **params):
+        self.groups.append(group)
+        return f'job-{len(self.groups)}'
+
+
+def _store_data(layout, store_id):
+    return next(c.data for c in layout.children if getattr(c, 'id', None) == store_id)
+
+
+def test_each_page_gets_its_own_job_group():
+    jobs = RecordingJobs()
+    try:
+        app = create_app(jobs=jobs)
+        run = _callback(app, 'mc_job.data')
+        dataset = _store_data(app.layout(), 'dataset')
+        pages = [_store_data(app.layout(), 'page') for _ in range(2)]
+        assert pages[0] != pages[1]
+        for page in pages:
+            run('run_mc.n_clicks', {'run_mc.n_clicks': 1, 'dataset.data': dataset, 'page.data': page})
+        assert jobs.groups[0] != jobs.groups[1]
+    finally:
+        jobs.shutdown()
+
+
+
+def test_evicted_dataset_shows_a_message():
+    app = create_app()
+    gone = {'key': 'evicted'}
+    run = _callback(app, 'mc_job.data')
+    out = run('run_mc.n_clicks', {'run_mc.n_clicks': 1, 'dataset.data': gone, 'page.data': 'p'})
+    assert 'upload the file again' in str(out['output_area'])
+    render = _callback(app, 'aep_map.figure')
+    out = render('dataset.data', {'dataset.data': gone, 'map_metric.value': 'annual_energy_mwh'})
+    assert 'upload the file again' in str(out['aep_map']['figure'])
+
+
+def test_new_page_restores_evicted_sample():
+    store = DatasetStore(max_bytes=1)
+    app = create_app(store=store)
+    key = _store_data(app.layout(), 'dataset')['key']
+    store.put(pd.DataFrame({'x': [1.0]}))  # evicts the sample (max_bytes=1)
+    assert key not in store
+    assert _store_data(app.layout(), 'dataset')['key'] == key
+    assert store.get(key) is not None
+
+
+def test_zoom_on_small_park_keeps_full_view():
+    store = DatasetStore()
+    app = create_app(store=store)
+    dataset = _store_data(app.layout(), 'dataset')
+    n_points = len(store.get(dataset['key']))
+    render = _callback(app, 'aep_map.figure')
+    values = {'dataset.data': dataset, 'map_metric.value': 'annual_energy_mwh'}
+    zoom = {'xaxis.range[0]': 0.0, 'xaxis.range[1]': 1.0, 'yaxis.range[0]': 0.0, 'yaxis.range[1]': 1.0}
+    out = render('aep_map.relayoutData', dict(values, **{'aep_map.relayoutData': zoom}))
+    # every turbine is drawn, so the stored view stays the full extent
+    assert out['map_view']['data'] is None
+    out = render('map_metric.value', dict(values, **{'map_metric.value': 'relative', 'map_view.data': None}))
+    ops = out['aep_map']['figure']['operations']
+    colours = next(op['params']['value'] for op in ops if op['location'][-1] == 'color')
+    assert len(colours) == n_points
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from dash_windpark.data_store import DatasetStore, estimate_nbytes
+
+
+def _table(n, value=1.0):
+    return pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n)], 'annual_energy_mwh': np.full(n, value)})
+
+
+def test_get_returns_same_object_and_dedupes_tables():
+    store = DatasetStore()
+    df = _table(10)
+    key = store.put(df)
+    assert store.get(key) is df
+    assert store.put(df.copy()) == key
+    assert len(store) == 1
+    assert store.get('missing') is None and store.get(None, 'x') == 'x'
+
+
+def test_lru_evicts_to_budget():
+    one = estimate_nbytes(np.zeros(1000))
+    store = DatasetStore(max_bytes=int(2.5 * one))
+    keys = [store.put(np.zeros(1000)) for _ in range(3)]
+    store.get(keys[1])
+    store.put(np.zeros(1000))
+    assert keys[0] not in store and keys[1] in store
+    assert store.nbytes <= store.max_bytes
+
+
+def test_disk_tier_spills_and_promotes(tmp_path):
+    one = estimate_nbytes(_table(1000))
+    store = DatasetStore(max_bytes=int(1.5 * one), disk_dir=tmp_path)
+    first = store.put(_table(1000, 1.0))
+    store.put(_table(1000, 2.0))
+    assert len(store) == 1 and first in store
+    back = store.get(first)
+    pd.testing.assert_frame_equal(back, _table(1000, 1.0))
+    assert len(list(tmp_path.glob('*.pkl'))) == 1   # the other table spilled in turn
+
+
+def test_estimate_counts_nested_results():
+    result = {'samples': np.zeros(5000), 'percentiles': _table(5)}
+    assert estimate_nbytes(result) > 40000
@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+from dash_windpark.file_cache import ParsedFileCache
+from dash_windpark.windpro_io import PARSER_VERSION, parse_production_table, parse_windrose
+
+
+def _write_csv(path, energies):
+    pd.DataFrame({'Turbine': [f'T{i}' for i in range(len(energies))],
+                  'Annual energy (MWh)': energies}).to_csv(path, index=False)
+
+
+def test_second_parse_is_a_cache_hit(tmp_path):
+    src = tmp_path / 'prod.csv'
+    _write_csv(src, [1000, 1500])
+    cache = ParsedFileCache(tmp_path / 'cache', use_parquet=False)
+    first = parse_production_table(str(src), cache=cache)
+    second = parse_production_table(src, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    pd.testing.assert_frame_equal(first, second)
+    assert second['annual_energy_mwh'].tolist() == [1000.0, 1500.0]
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    src = tmp_path / 'prod.csv'
+    _write_csv(src, [1000])
+    cache = ParsedFileCache(tmp_path / 'cache', use_parquet=False)
+    parse_production_table(str(src), cache=cache)
+    _write_csv(src, [2000, 3000])
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    out = parse_production_table(str(src), cache=cache)
+    assert cache.misses == 2
+    assert out['annual_energy_mwh'].tolist() == [2000.0, 3000.0]
+
+
+def test_parser_version_invalidates_entries(tmp_path):
+    src = tmp_path / 'prod.csv'
+    _write_csv(src, [1000])
+    cache = ParsedFileCache(tmp_path / 'cache', use_parquet=False)
+    calls = []
+
+    def parser(path):
+        calls.append(path)
+        return pd.read_csv(path)
+
+    cache.load(src, 'production', parser, version=1)
+    cache.load(src, 'production', parser, version=1)
+    cache.load(src, 'production', parser, version=2)
+    assert len(calls) == 2 and (cache.hits, cache.misses) == (1, 2)
+
+
+def test_none_results_are_cached(tmp_path):
+    src = tmp_path / 'no_rose.csv'
+    _write_csv(src, [1000])
+    cache = ParsedFileCache(tmp_path / 'cache', use_parquet=False)
+    assert parse_windrose(str(src), cache=cache) is None
+    assert parse_windrose(str(src), cache=cache) is None
+    assert cache.hits == 1
+
+
+def test_lru_eviction_keeps_size_bounded(tmp_path):
+    cache = ParsedFileCache(tmp_path / 'cache', max_bytes=1, use_parquet=False)
+    for i in range(3):
+        src = tmp_path / f'prod{i}.csv'
+        _write_csv(src, [1000 + i] * 50)
+        parse_production_table(str(src), cache=cache)
+    # every entry exceeds the budget on its own; older ones are evicted first,
+    # the one just written stays
+    entries = list((tmp_path / 'cache').iterdir())
+    assert [p.stem for p in entries] == [cache.key(src, 'production', PARSER_VERSION)]
+    parse_production_table(str(src), cache=cache)
+    assert cache.hits == 1
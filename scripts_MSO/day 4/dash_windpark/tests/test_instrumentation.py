@@ -0,0 +1,100 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from dash_windpark import instrumentation as inst
+from dash_windpark.aep_calc import monte_carlo_aep
+
+
+@pytest.fixture
+def profiling():
+    inst.reset()
+    inst.enable(trace_memory=True)
+    yield inst
+    inst.disable()
+    inst.reset()
+
+
+def _park(n=10):
+    return pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n)], 'annual_energy_mwh': np.full(n, 3000.0)})
+
+
+def test_disabled_stages_record_nothing():
+    inst.reset()
+    assert not inst.is_enabled()
+    with inst.stage('x', items=5) as s:
+        s.items = 10
+    monte_carlo_aep(_park(), n_samples=100, random_seed=0)
+    assert inst.report()['stages'] == {}
+
+
+def test_disabled_hooks_do_no_work(monkeypatch):
+    # structural instead of wall-clock: no stage objects are created at all
+    def fail(*args, **kwargs):
+        raise AssertionError('stage created while disabled')
+
+    monkeypatch.setattr(inst, '_Stage', fail)
+
+    @inst.timed('noop', items='n')
+    def noop(n):
+        return n
+
+    assert inst.stage('x') is inst.stage('y')
+    with inst.stage('x', items=3):
+        pass
+    assert noop(5) == 5
+
+
+def test_pipeline_stages_and_throughput(profiling):
+    res = monte_carlo_aep(_park(), n_samples=5000, random_seed=0)
+    res.turbine_percentiles([10, 90])
+    stages = inst.report()['stages']
+    assert stages['aep_calc.monte_carlo_aep']['items'] == 5000
+    assert stages['aep_calc.sampling']['items_per_sec'] > 0
+    assert stages['mc_result.turbine_percentiles']['count'] == 1
+    assert 'aep_calc.monte_carlo_aep' in inst.format_report()
+    json.dumps(inst.report())
+
+
+def test_nested_peak_is_attributed_to_parent(profiling):
+    with inst.stage('outer'):
+        with inst.stage('inner'):
+            big = np.ones(2_000_000)
+            del big
+    events = {e['stage']: e for e in inst.report()['events']}
+    assert events['inner']['peak_bytes'] >= 16_000_000
+    assert events['outer']['peak_bytes'] >= events['inner']['peak_bytes']
+
+
+def test_metrics_endpoint(profiling):
+    from dash_windpark.dash_app import create_app
+    app = create_app()
+    with inst.stage('probe'):
+        pass
+    body = app.server.test_client().get('/_windpark/metrics').get_json()
+    assert body['enabled'] and 'probe' in body['stages']
+
+
+def test_concurrent_stages_report_no_peak(profiling):
+    inside, release = threading.Event(), threading.Event()
+
+    def worker():
+        with inst.stage('worker'):
+            inside.set()
+            release.wait(5)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    inside.wait(5)
+    with inst.stage('main'):
+        pass
+    release.set()
+    t.join()
+    with inst.stage('alone'):
+        pass
+    events = {e['stage']: e for e in inst.report()['events']}
+    # tracemalloc's peak is process-wide: overlapping stages cannot be told apart
+    assert events['worker']['peak_bytes'] is None and events['main']['peak_bytes'] is None
+    assert events['alone']['peak_bytes'] is not None
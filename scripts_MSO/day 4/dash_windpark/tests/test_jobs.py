@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from dash_windpark.correlation import CorrelationModel
+from dash_windpark.jobs import JobManager, content_hash
+
+
+def _wait(manager, job_id, timeout=10.0):
+    end = time.time() + timeout
+    while manager.status(job_id)['status'] in ('pending', 'running'):
+        assert time.time() < end, 'job did not finish'
+        time.sleep(0.01)
+    return manager.status(job_id)
+
+
+def _park(n=5):
+    return pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n)], 'annual_energy_mwh': np.full(n, 1000.0)})
+
+
+def test_content_hash_tracks_values_and_params():
+    df = _park()
+    assert content_hash(df, n_samples=10) == content_hash(df.copy(), n_samples=10)
+    assert content_hash(df, n_samples=10) != content_hash(df, n_samples=20)
+    changed = df.copy()
+    changed.loc[0, 'annual_energy_mwh'] = 1001.0
+    assert content_hash(changed, n_samples=10) != content_hash(df, n_samples=10)
+
+
+def test_content_hash_keys_objects_by_value():
+    df = _park()
+    model = CorrelationModel(park_weight=0.3)
+    same = CorrelationModel(park_weight=0.3)
+    same.prepare(5)  # private caches do not change the key
+    assert content_hash(df, correlation=model) == content_hash(df, correlation=same)
+    assert content_hash(df, correlation=model) != content_hash(df, correlation=CorrelationModel(park_weight=0.4))
+    loadings = np.full((5, 1), 0.5)
+    assert (content_hash(df, correlation=CorrelationModel(loadings=loadings))
+            == content_hash(df, correlation=CorrelationModel(loadings=loadings.copy())))
+    with pytest.raises(TypeError):
+        content_hash(df, progress=lambda done, total: None)
+
+
+def test_job_runs_and_result_is_memoised():
+    manager = JobManager()
+    try:
+        job = manager.submit_monte_carlo(_park(), n_samples=2000, random_seed=1)
+        st = _wait(manager, job)
+        assert st['status'] == 'done' and st['progress'] == 1.0
+        first = manager.result(job)
+        again = manager.submit_monte_carlo(_park(), n_samples=2000, random_seed=1)
+        assert manager.status(again)['status'] == 'done'
+        assert manager.result(again) is first
+    finally:
+        manager.shutdown()
+
+
+def test_new_job_in_group_cancels_previous():
+    manager = JobManager(max_workers=1)
+    try:
+        slow = manager.submit_monte_carlo(_park(50), group='g', n_samples=2_000_000,
+                                          chunk_size=1000, random_seed=1)
+        fast = manager.submit_monte_carlo(_park(), group='g', n_samples=100, random_seed=2)
+        assert _wait(manager, slow)['status'] == 'cancelled'
+        assert _wait(manager, fast)['status'] == 'done'
+    finally:
+        manager.shutdown()
+
+
+def test_errors_are_reported():
+    manager = JobManager()
+    try:
+        job = manager.submit_monte_carlo(pd.DataFrame({'turbine_id': ['T1']}), n_samples=10)
+        st = _wait(manager, job)
+        assert st['status'] == 'error' and 'KeyError' in st['error']
+    finally:
+        manager.shutdown()
+
+
+def test_adaptive_job():
+    manager = JobManager()
+    try:
+        job = manager.submit_monte_carlo(_park(), adaptive=True, target_rel_precision=5e-3, random_seed=1)
+        assert _wait(manager, job)['status'] == 'done'
+        result = manager.result(job)
+        assert result['converged'] and result['achieved_rel_precision'] <= 5e-3
+    finally:
+        manager.shutdown()
+
+
+def test_results_live_in_dataset_store():
+    from dash_windpark.data_store import DatasetStore
+    store = DatasetStore()
+    manager = JobManager(store=store)
+    try:
+        job = manager.submit_monte_carlo(_park(), n_samples=500, random_seed=2)
+        assert _wait(manager, job)['status'] == 'done'
+        result = manager.result(job)
+        assert store.get(JobManager.result_key(manager._jobs[job].key)) is result
+        again = manager.submit_monte_carlo(_park(), n_samples=500, random_seed=2)
+        assert manager.result(again) is result
+    finally:
+        manager.shutdown()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from dash_windpark.map_render import (GRID_BINS, grid_aggregate, map_data, map_figure, marker_style,
+                                      view_from_relayout, with_positions)
+
+
+def _park(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n)],
+                         'annual_energy_mwh': rng.uniform(2000, 9000, n),
+                         'x': rng.uniform(0, 1e5, n), 'y': rng.uniform(0, 1e5, n)})
+
+
+def test_grid_aggregate_preserves_totals():
+    df = _park(5000)
+    cells = grid_aggregate(df['x'], df['y'], df['annual_energy_mwh'], n_bins=10)
+    assert cells['count'].sum() == 5000
+    assert np.isclose(cells['sum'].sum(), df['annual_energy_mwh'].sum())
+    assert len(cells) <= 100
+
+
+def test_small_parks_draw_every_turbine():
+    data = map_data(_park(100))
+    assert data['mode'] == 'points' and len(data['x']) == 100
+
+
+def test_payload_is_bounded_for_large_parks():
+    for n in (100, 20000):
+        fig = map_figure(_park(n))
+        assert fig.data[0].type == 'scattergl'
+        assert len(fig.data[0].x) <= max(2000, GRID_BINS ** 2)
+    zoomed = map_data(_park(20000), {'x_range': [0, 5000], 'y_range': [0, 5000]})
+    assert zoomed['mode'] == 'points'
+    assert all(0 <= v <= 5000 for v in zoomed['x'])
+
+
+def test_marker_style_matches_figure():
+    df = _park(20000)
+    view = {'x_range': [0, 5e4], 'y_range': None}
+    style = marker_style(df, view, metric=None)
+    fig = map_figure(df, view, metric=None)
+    assert np.allclose(fig.data[0].marker.color, style['color'])
+    assert np.allclose(fig.data[0].marker.size, style['size'])
+
+
+def test_view_from_relayout():
+    view = view_from_relayout({'xaxis.range[0]': 1, 'xaxis.range[1]': 2})
+    assert view == {'x_range': [1.0, 2.0], 'y_range': None}
+    assert view_from_relayout({'xaxis.autorange': True, 'yaxis.autorange': True}, view) == \
+        {'x_range': None, 'y_range': None}
+    assert view_from_relayout({'dragmode': 'pan'}, view) == view
+
+
+def test_demo_positions_added():
+    df = with_positions(pd.DataFrame({'turbine_id': ['A', 'B'], 'annual_energy_mwh': [1.0, 2.0]}))
+    assert df['x'].tolist() == [0.0, 500.0]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from dash_windpark.portfolio import monte_carlo_portfolio
+
+
+def _park(n, mwh=5000.0):
+    return pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n)],
+                         'annual_energy_mwh': np.full(n, mwh)})
+
+
+def test_portfolio_pvalues_and_contributions():
+    tables = {'north': _park(3), 'south': _park(5), 'east': _park(2, 8000.0)}
+    out = monte_carlo_portfolio(tables, regions={'north': 'A', 'south': 'A', 'east': 'B'},
+                                n_samples=20000, random_seed=1, chunk_size=3000)
+    p = out['percentiles'].set_index('metric')['mwh']
+    assert p['P90'] < p['P75'] < p['P50']
+    assert abs(out['mean_mwh'] - 56000.0) / 56000.0 < 0.01
+    parks = out['parks'].set_index('park')
+    assert parks['n_turbines'].tolist() == [3, 5, 2]
+    assert abs(parks['variance_contribution'].sum() - 1.0) < 1e-6
+    assert abs(parks['share_of_mean'].sum() - 1.0) < 1e-9
+    assert (parks['p90_mwh'] < parks['p50_mwh']).all()
+
+
+def test_shared_region_widens_portfolio_spread():
+    tables = {f'p{i}': _park(4) for i in range(6)}
+    kwargs = dict(n_samples=20000, random_seed=0, park_std=0.0, energy_scale_std=0.0,
+                  availability_std=0.0, regional_std=0.05)
+    shared = monte_carlo_portfolio(tables, regions={k: 'R' for k in tables}, **kwargs)
+    separate = monte_carlo_portfolio(tables, **kwargs)
+    # one shared factor: std = 5 %; six independent ones: 5 % / sqrt(6)
+    assert abs(shared['std_mwh'] / shared['mean_mwh'] - 0.05) < 0.003
+    assert abs(separate['std_mwh'] / separate['mean_mwh'] - 0.05 / np.sqrt(6)) < 0.003
+
+
+def test_chunking_does_not_change_result():
+    tables = {'a': _park(3), 'b': _park(4)}
+    one = monte_carlo_portfolio(tables, n_samples=5000, random_seed=3, chunk_size=5000)
+    many = monte_carlo_portfolio(tables, n_samples=5000, random_seed=3, chunk_size=700)
+    assert abs(one['mean_mwh'] - many['mean_mwh']) / one['mean_mwh'] < 0.01
+
+
+def test_empty_park_rejected():
+    with pytest.raises(ValueError):
+        monte_carlo_portfolio({'a': _park(0)})
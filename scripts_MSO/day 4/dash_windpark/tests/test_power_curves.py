@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from dash_windpark.power_curves import PowerCurveLibrary, WIND_SPEED_GRID, interp_on_grid
+from dash_windpark.aep_calc import aep_from_weibull, aep_from_histogram, fit_weibull, _gamma
+
+
+def _library(n_types=1):
+    lib = PowerCurveLibrary()
+    for i in range(n_types):
+        u = np.arange(0, 26.0)
+        p = np.clip((u - 3) / 9, 0, 1) ** 3 * (2000 + 10 * i)
+        lib.register(f'type{i}', pd.DataFrame({'wind_speed': u, 'power_kw': p}))
+    return lib
+
+
+def test_library_caches_grid_curves():
+    lib = _library(2)
+    assert 'type0' in lib and len(lib) == 2
+    assert lib.grid_power('type0') is lib.grid_power('type0')
+    curves, codes = lib.matrix(['type1', 'type0', 'type1'])
+    assert curves.shape == (2, len(WIND_SPEED_GRID))
+    assert codes.tolist() == [1, 0, 1]
+    with pytest.raises(KeyError):
+        lib.grid_power('missing')
+    vals = interp_on_grid(curves, codes, np.array([[12.0], [3.0], [100.0]]))
+    assert vals[:, 0].tolist() == [2010.0, 0.0, 0.0]
+
+
+def test_gamma_and_weibull_fit():
+    assert np.allclose(_gamma(np.array([1.0, 1.5, 2.0, 5.0])),
+                       [1.0, 0.886226925452758, 1.0, 24.0], rtol=1e-9)
+    rng = np.random.default_rng(0)
+    samples = 8.0 * rng.weibull(2.2, size=200000)
+    edges = np.arange(0, 30.5, 0.5)
+    hist, _ = np.histogram(samples, bins=edges)
+    a, k = fit_weibull(0.5 * (edges[1:] + edges[:-1]), np.stack([hist, hist]))
+    assert a.shape == (2,)
+    assert abs(a[0] - 8.0) < 0.1 and abs(k[0] - 2.2) < 0.1
+
+
+def test_weibull_and_histogram_agree():
+    lib = _library()
+    a, k = 8.0, 2.0
+    centres = WIND_SPEED_GRID
+    pdf = (k / a) * (centres / a) ** (k - 1) * np.exp(-(centres / a) ** k)
+    w = aep_from_weibull(['type0'], [[a]], [[k]], [1.0], lib)
+    h = aep_from_histogram(['type0'], centres, pdf, lib)
+    assert abs(w[0] - h[0]) < 0.005 * w[0]
+
+
+def test_shear_increases_aep():
+    lib = _library()
+    base = aep_from_weibull(['type0'] * 2, [[7.0], [7.0]], [[2.0], [2.0]], [1.0], lib)
+    sheared = aep_from_weibull(['type0'] * 2, [[7.0], [7.0]], [[2.0], [2.0]], [1.0], lib,
+                               hub_height=[100.0, 140.0], ref_height=100.0)
+    assert sheared[0] == pytest.approx(base[0])
+    assert sheared[1] > base[1]
+
+
+def test_portfolio_integrates_quickly():
+    n_types, n_turbines, n_sectors = 300, 2000, 12
+    lib = _library(n_types)
+    rng = np.random.default_rng(1)
+    types = [f'type{i}' for i in rng.integers(0, n_types, n_turbines)]
+    a = rng.uniform(6, 9, (n_turbines, n_sectors))
+    k = rng.uniform(1.8, 2.4, (n_turbines, n_sectors))
+    start = time.perf_counter()
+    aep = aep_from_weibull(types, a, k, np.full(n_sectors, 1 / 12), lib)
+    assert time.perf_counter() - start < 1.0
+    assert aep.shape == (n_turbines,) and (aep > 0).all()
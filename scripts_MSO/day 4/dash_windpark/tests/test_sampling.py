@@ -0,0 +1,47 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from dash_windpark.sampling import make_sampler, norm_ppf, qmc
+from dash_windpark.aep_calc import monte_carlo_aep, convergence_report
+
+
+def test_norm_ppf_known_values():
+    vals = norm_ppf(np.array([0.5, 0.975, 0.025, 0.8413447460685429]))
+    assert np.allclose(vals, [0.0, 1.959963984540054, -1.959963984540054, 1.0], atol=1e-8)
+
+
+def test_lhs_is_stratified():
+    z = make_sampler('lhs', 3, seed=0).normal(100)
+    assert z.shape == (100, 3)
+    # mapped back to uniforms there is exactly one point per 1/100 stratum
+    u = 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+    for col in range(3):
+        assert len(np.unique(np.floor(u[:, col] * 100))) == 100
+    assert abs(z.mean()) < 0.05
+
+
+def test_unknown_sampler():
+    with pytest.raises(ValueError):
+        make_sampler('halton', 2)
+
+
+@pytest.mark.skipif(qmc is None, reason='scipy not installed')
+def test_monte_carlo_sobol_backend():
+    df = pd.DataFrame({'turbine_id': ['T1', 'T2'], 'annual_energy_mwh': [1000, 2000]})
+    res = monte_carlo_aep(df, n_samples=1024, random_seed=0, sampler='sobol')
+    assert res['samples'].shape == (1024,)
+    assert abs(np.median(res['samples']) - 3000) < 0.005 * 3000
+    streamed = monte_carlo_aep(df, n_samples=4096, random_seed=0, chunk_size=1024, sampler='sobol')
+    assert streamed['sketch'].n == 4096
+
+
+def test_convergence_report_shape():
+    df = pd.DataFrame({'turbine_id': ['T1', 'T2'], 'annual_energy_mwh': [1000, 2000]})
+    rep = convergence_report(df, target_rel_se=0.05, samplers=('random', 'lhs'),
+                             n_replicates=4, min_samples=64, max_samples=256, random_seed=1)
+    assert rep['trace']['n_samples'].tolist() == [64, 128, 256] * 2
+    summary = rep['summary']
+    assert summary['sampler'].tolist() == ['random', 'lhs']
+    assert (summary['required_samples'] <= 256).all()
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from dash_windpark.sensitivity import Parameter, sobol_indices
+
+
+def _park(n):
+    return pd.DataFrame({'turbine_id': [f'T{i}' for i in range(n)], 'annual_energy_mwh': np.full(n, 5000.0)})
+
+
+def test_park_factors_match_analytic_indices():
+    # Y ~ base * (1 + 0.1 z1)(1 + 0.05 z2): variance shares 0.1^2 : 0.05^2 (+ small interaction)
+    params = [Parameter('resource', 0.10), Parameter('losses', 0.05)]
+    out = sobol_indices(_park(4), params, n_samples=1 << 14, random_seed=0)
+    idx = out['indices'].set_index('parameter')
+    v1, v2 = 0.1 ** 2, 0.05 ** 2
+    v = v1 + v2 + v1 * v2
+    assert abs(idx.loc['resource', 'first_order'] - v1 / v) < 0.02
+    assert abs(idx.loc['losses', 'first_order'] - v2 / v) < 0.02
+    assert abs(idx.loc['resource', 'total_order'] - (v1 + v1 * v2) / v) < 0.02
+    assert abs(out['mean_mwh'] - 20000.0) / 20000.0 < 1e-3
+
+
+def test_unused_parameter_has_zero_index():
+    params = [Parameter('resource', 0.05), Parameter('other_park', 0.05, turbines=[]),
+              Parameter('per_turbine', 0.02, 'turbine')]
+    idx = sobol_indices(_park(10), params, n_samples=4096, random_seed=1)['indices'].set_index('parameter')
+    assert abs(idx.loc['other_park', 'first_order']) < 1e-12
+    assert abs(idx.loc['other_park', 'total_order']) < 1e-12
+    assert idx.loc['per_turbine', 'n_inputs'] == 10
+    assert idx.loc['resource', 'first_order'] > idx.loc['per_turbine', 'first_order']
+
+
+def test_many_parameters_on_100_turbines_is_fast():
+    rng = np.random.default_rng(0)
+    params = [Parameter(f'cluster{i}', 0.03, turbines=np.arange(i * 10, (i + 1) * 10)) for i in range(10)]
+    params += [Parameter('energy_scale', 0.05, 'turbine'), Parameter('availability', 0.01, 'turbine')]
+    df = _park(100).assign(annual_energy_mwh=rng.uniform(3000, 8000, 100))
+    start = time.perf_counter()
+    out = sobol_indices(df, params, n_samples=4096, random_seed=2)
+    assert time.perf_counter() - start < 5.0
+    assert out['n_evaluations'] == 4096 * 14
+    s1 = out['indices']['first_order']
+    assert 0.8 < s1.sum() < 1.1
+
+
+def test_bad_scope_rejected():
+    with pytest.raises(ValueError):
+        sobol_indices(_park(2), [Parameter('x', 0.1, 'cluster')])
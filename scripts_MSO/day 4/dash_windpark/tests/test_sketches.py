@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from dash_windpark.sketches import HistogramSketch
+
+
+def test_percentiles_within_bin_width():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100.0, 5.0, size=(50000, 3))
+    sk = HistogramSketch([60.0] * 3, [140.0] * 3, n_bins=4096).update(values)
+    qs = [1, 10, 50, 90, 99]
+    approx = sk.percentile(qs)
+    exact = np.percentile(values, qs, axis=0)
+    assert approx.shape == (5, 3)
+    assert np.all(np.abs(approx - exact) <= sk.error_bound)
+
+
+def test_merge_equals_single_pass():
+    rng = np.random.default_rng(1)
+    values = rng.uniform(0, 10, size=10000)
+    whole = HistogramSketch(0, 10, n_bins=256).update(values)
+    a = HistogramSketch(0, 10, n_bins=256).update(values[:3000])
+    b = HistogramSketch(0, 10, n_bins=256).update(values[3000:])
+    a.merge(b)
+    assert np.array_equal(a.counts, whole.counts)
+    assert np.array_equal(a.percentile([5, 50, 95]), whole.percentile([5, 50, 95]))
+    with pytest.raises(ValueError):
+        a.merge(HistogramSketch(0, 11, n_bins=256))
+
+
+def test_degenerate_range_is_exact():
+    sk = HistogramSketch(1000.0, 1000.0).update(np.full(10, 1000.0))
+    assert sk.percentile([50])[0, 0] == 1000.0
+
+
+def test_small_blocks_match_one_large_block():
+    # small blocks over many columns take the sparse (np.add.at) path
+    rng = np.random.default_rng(5)
+    values = rng.uniform(0.0, 10.0, size=(600, 300))
+    whole = HistogramSketch(np.zeros(300), np.full(300, 10.0), n_bins=256).update(values)
+    blocks = HistogramSketch(np.zeros(300), np.full(300, 10.0), n_bins=256)
+    for start in range(0, 600, 7):
+        blocks.update(values[start:start + 7])
+    np.testing.assert_array_equal(whole.counts, blocks.counts)
+    assert whole.n == blocks.n
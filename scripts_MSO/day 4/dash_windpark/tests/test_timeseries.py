@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from dash_windpark.power_curves import PowerCurveLibrary
+from dash_windpark.timeseries import (aggregate_series, create_series, open_series, power_from_wind,
+                                      series_from_csv)
+
+
+def _hourly(tmp_path, n_steps=2 * 8760, n_turbines=3, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 3000, (n_steps, n_turbines)).astype(np.float32)
+    out = create_series(tmp_path / 'power.npy', [f'T{i}' for i in range(n_turbines)],
+                        '2021-01-01', 60, n_steps)
+    out[:] = values
+    out.flush()
+    return tmp_path / 'power.npy', values
+
+
+def test_aggregates_match_pandas(tmp_path):
+    path, values = _hourly(tmp_path)
+    availability = (np.arange(len(values)) % 50 != 0).astype(np.float32)
+    curtailment = np.full(values.shape, 0.9, dtype=np.float32)
+    out = aggregate_series(path, availability=availability, curtailment=curtailment, block_rows=1000)
+
+    net = values.astype(float) * availability[:, None] * curtailment
+    index = pd.date_range('2021-01-01', periods=len(values), freq='h')
+    park = pd.Series(net.sum(axis=1) / 1000.0, index=index)
+    monthly = park.groupby([index.year, index.month]).sum().to_numpy()
+    assert np.allclose(out['monthly']['energy_mwh'], monthly, rtol=1e-6)
+    assert out['annual']['year'].tolist() == [2021, 2022]
+    assert np.allclose(out['annual']['energy_mwh'], park.groupby(index.year).sum(), rtol=1e-6)
+    assert np.allclose(out['diurnal']['mean_power_mw'], park.groupby(index.hour).mean(), rtol=1e-6)
+    assert np.allclose(out['per_turbine']['aep_mwh'], net.sum(axis=0) / 1000.0 / 2, rtol=1e-6)
+    gross = values.astype(float).sum() / 1000.0
+    total = out['annual'][['energy_mwh', 'availability_loss_mwh', 'curtailment_loss_mwh']].to_numpy().sum()
+    assert np.isclose(total, gross, rtol=1e-6)
+
+
+def test_csv_ingest_in_chunks(tmp_path):
+    index = pd.date_range('2020-06-01', periods=500, freq='10min')
+    df = pd.DataFrame({'timestamp': index, 'WTG1': np.arange(500.0), 'WTG2': 2 * np.arange(500.0)})
+    df.to_csv(tmp_path / 'series.csv', index=False)
+    data, meta = series_from_csv(tmp_path / 'series.csv', tmp_path / 'series.npy', chunksize=64)
+    assert isinstance(data, np.memmap)
+    assert meta.step_minutes == 10 and meta.turbine_ids == ['WTG1', 'WTG2']
+    assert np.array_equal(data[:, 1], 2 * np.arange(500.0, dtype=np.float32))
+    assert meta.timestamps(499, 500)[0] == index[-1]
+
+
+def test_csv_row_count_ignores_layout_quirks(tmp_path):
+    # no final newline, blank lines and a quoted header with a newline
+    text = ('timestamp,"WTG\n1"\n2020-01-01 00:00,1\n\n2020-01-01 01:00,2\n\n'
+            '2020-01-01 02:00,3')
+    (tmp_path / 'odd.csv').write_text(text)
+    data, meta = series_from_csv(tmp_path / 'odd.csv', tmp_path / 'odd.npy')
+    assert meta.n_steps == 3 and meta.step_minutes == 60
+    assert data[:, 0].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_gaps_count_as_missing(tmp_path):
+    index = pd.date_range('2021-01-01', periods=48, freq='h')
+    df = pd.DataFrame({'timestamp': index, 'WTG1': 1000.0, 'WTG2': 2000.0})
+    df['WTG2'] = df['WTG2'].astype(object)
+    df.loc[5, 'WTG2'] = 'n/a'
+    df.to_csv(tmp_path / 'gap.csv', index=False)
+    data, _ = series_from_csv(tmp_path / 'gap.csv', tmp_path / 'gap.npy')
+    assert np.isnan(data[5, 1])
+    out = aggregate_series(tmp_path / 'gap.npy')
+    assert np.isclose(out['monthly']['energy_mwh'].sum(), 48 * 3.0 - 2.0)
+    assert np.isclose(out['annual']['energy_mwh'].sum(), 48 * 3.0 - 2.0)
+    assert out['annual']['missing_samples'].tolist() == [1]
+    per_turbine = out['per_turbine']
+    assert np.isfinite(per_turbine['aep_mwh']).all()
+    assert per_turbine['missing_samples'].tolist() == [0, 1]
+
+
+def test_power_from_wind(tmp_path):
+    lib = PowerCurveLibrary()
+    lib.register('A', pd.DataFrame({'wind_speed': [3, 12, 25], 'power_kw': [0, 3000, 3000]}))
+    wind = create_series(tmp_path / 'wind.npy', ['T1', 'T2'], '2022-01-01', 60, 48)
+    wind[:] = np.tile([[7.5, 30.0]], (48, 1))
+    wind.flush()
+    power, _ = power_from_wind(tmp_path / 'wind.npy', tmp_path / 'power.npy', lib, ['A', 'A'],
+                               block_rows=10)
+    assert np.allclose(power[:, 0], 1500.0) and np.allclose(power[:, 1], 0.0)
+    assert open_series(tmp_path / 'power.npy')[1].n_steps == 48
@@ -30,3 +30,56 @@ def pytest_approx_sum(freqs, tol=1e-6):
     # helper for tests — expects frequencies normalized to 1.0 (or percentages that we normalize)
     s = sum(freqs)
     return abs(s - 1.0) < 1e-6 or abs(s - 100.0) < 1e-6
+
+
+def test_parse_windrose_with_direction():
+    df = pd.DataFrame({'Direction': [0, 0, 180], 'Wind speed': [8, 10, 8], 'Freq': [0.5, 0.3, 0.2]})
+    out = parse_windrose(df)
+    assert out.columns.tolist() == ['direction', 'wind_speed', 'frequency']
+    assert out['direction'].tolist() == [0.0, 0.0, 180.0]
+
+
+def test_parse_windrose_sector_columns():
+    # labelled sectors are not directions: keep the rows, drop the column
+    labelled = pd.DataFrame({'Sector': ['N', 'E', 'S'], 'Wind speed': [8, 10, 8], 'Freq': [0.5, 0.3, 0.2]})
+    out = parse_windrose(labelled)
+    assert out.columns.tolist() == ['wind_speed', 'frequency'] and len(out) == 3
+    # 'Sector frequency [%]' is the frequency column only
+    shared = pd.DataFrame({'Wind speed': [8, 10], 'Sector frequency [%]': [60, 40]})
+    assert parse_windrose(shared)['frequency'].tolist() == [0.6, 0.4]
+    # sector numbers 1..4 become sector centres in degrees
+    numbered = pd.DataFrame({'Sector': [1, 2, 3, 4], 'Wind speed': [8] * 4, 'Freq': [0.25] * 4})
+    assert parse_windrose(numbered)['direction'].tolist() == [0.0, 90.0, 180.0, 270.0]
+
+
+def test_detect_columns_is_cached_per_header():
+    from dash_windpark.windpro_io import detect_columns
+    cols = ('Turbine', 'X', 'Y', 'Annual energy (MWh)')
+    first = detect_columns(cols)
+    assert detect_columns(cols) is first
+    assert first.roles == ('layout', 'production')
+    assert detect_columns(('Speed', 'Frequency')).roles == ('windrose',)
+
+
+def test_read_windpro_workbook_classifies_sheets(tmp_path):
+    import pytest
+    pytest.importorskip('openpyxl')
+    from dash_windpark.file_cache import ParsedFileCache
+    from dash_windpark.windpro_io import read_windpro_workbook
+    path = tmp_path / 'project.xlsx'
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({'Speed (m/s)': [5, 6], 'Frequency (%)': [60, 40]}).to_excel(writer, sheet_name='Wind', index=False)
+        pd.DataFrame({'Turbine': ['T1', 'T2'], 'Easting': [1.0, 2.0], 'Northing': [3.0, 4.0],
+                      'Annual energy (MWh)': [9.0, 9.0]}).to_excel(writer, sheet_name='Layout', index=False)
+        pd.DataFrame({'Turbine': ['T1', 'T2'], 'Annual energy (MWh)': [1000, 1500]}).to_excel(writer, sheet_name='Result', index=False)
+    tables = read_windpro_workbook(path)
+    assert tables['production']['annual_energy_mwh'].tolist() == [1000.0, 1500.0]
+    assert tables['layout']['x'].tolist() == [1.0, 2.0]
+    assert tables['windrose']['frequency'].tolist() == [0.6, 0.4]
+
+    cache = ParsedFileCache(tmp_path / 'cache', use_parquet=False)
+    read_windpro_workbook(path, cache=cache)
+    cached = read_windpro_workbook(path, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert sorted(cached) == ['layout', 'production', 'windrose']
+    pd.testing.assert_frame_equal(cached['layout'], tables['layout'])
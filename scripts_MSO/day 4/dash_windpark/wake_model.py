@@ -0,0 +1,208 @@
+"""Vectorised wake-loss AEP engine for the Dash Windpark prototype.
+
+Takes the canonical tables from :mod:`windpro_io` (layout with ``x``/``y`` in
+metres, windrose with ``wind_speed``/``frequency`` and optionally
+``direction``) and computes per-turbine gross and net AEP over direction x
+speed bins.
+
+How it stays fast for large parks:
+
+- a grid-bucket spatial index (:func:`neighbour_pairs`) keeps only turbine
+  pairs closer than ``max_distance_d`` rotor diameters; wakes further away
+  are negligible with the default models,
+- the geometric part of the deficit is evaluated for all (pair, direction)
+  combinations in one broadcast and summed per downstream turbine with
+  ``np.bincount`` (sum-of-squares superposition),
+- the speed dependence is separable (deficit = thrust term(U) x geometry),
+  so the (turbine, direction, speed) array is only formed at the very end.
+
+Wake models are pluggable through :data:`WAKE_MODELS`; a model provides
+``geometry(dx, dy, rotor_diameter)`` and ``thrust_term(ct)``. The thrust
+coefficient is taken at the free-stream speed of each bin, the usual
+simplification for fast engineering estimates.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+HOURS_PER_YEAR = 8760.0
+
+
+def generic_power_curve(rated_power_kw: float = 3000.0, cut_in: float = 3.0,
+                        rated_speed: float = 12.0, cut_out: float = 25.0,
+                        ct_below_rated: float = 0.8, step: float = 0.5) -> pd.DataFrame:
+    """Simple generic power/thrust curve used when no curve is supplied.
+
+    Returns a DataFrame with columns ['wind_speed', 'power_kw', 'ct'].
+    """
+    u = np.arange(0.0, cut_out + 5.0 + step, step)
+    ramp = np.clip((u - cut_in) / (rated_speed - cut_in), 0.0, 1.0) ** 3
+    power = np.where((u >= cut_in) & (u <= cut_out), rated_power_kw * ramp, 0.0)
+    ct = np.where(u < rated_speed, ct_below_rated,
+                  ct_below_rated * (rated_speed / np.maximum(u, 1e-9)) ** 3)
+    ct = np.where((u >= cut_in) & (u <= cut_out), ct, 0.0)
+    return pd.DataFrame({'wind_speed': u, 'power_kw': power, 'ct': ct})
+
+
+class JensenWake:
+    """Jensen / Park top-hat wake with linear expansion."""
+
+    name = 'jensen'
+
+    def __init__(self, wake_decay: float = 0.075):
+        self.wake_decay = float(wake_decay)
+
+    def geometry(self, dx: np.ndarray, dy: np.ndarray, rotor_diameter: float) -> np.ndarray:
+        """Speed-independent deficit factor for downstream offsets (dx, dy)."""
+        d = rotor_diameter
+        wake_radius = 0.5 * d + self.wake_decay * dx
+        inside = (dx > 0) & (np.abs(dy) < wake_radius)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            g = (d / (d + 2.0 * self.wake_decay * dx)) ** 2
+        return np.where(inside, g, 0.0)
+
+    def thrust_term(self, ct: np.ndarray) -> np.ndarray:
+        return 1.0 - np.sqrt(1.0 - np.clip(ct, 0.0, 1.0))
+
+
+WAKE_MODELS: Dict[str, Type] = {
+    'jensen': JensenWake,
+}
+
+
+def neighbour_pairs(x: np.ndarray, y: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """All ordered pairs (i, j), i != j, with distance <= radius.
+
+    Uses a uniform grid with cell size ``radius``: candidates come from the
+    3 x 3 block of cells around each turbine, found with ``searchsorted`` on
+    the sorted cell keys. Cost is O(n * neighbours), not O(n^2).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n == 0 or radius <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    cx = np.floor((x - x.min()) / radius).astype(np.int64)
+    cy = np.floor((y - y.min()) / radius).astype(np.int64)
+    ny = int(cy.max()) + 1
+    nx = int(cx.max()) + 1
+    key = cx * ny + cy
+    order = np.argsort(key, kind='stable')
+    sorted_key = key[order]
+    idx = np.arange(n)
+
+    left, right = [], []
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            tx = cx + ox
+            ty = cy + oy
+            valid = (tx >= 0) & (tx < nx) & (ty >= 0) & (ty < ny)
+            target = tx * ny + ty
+            start = np.searchsorted(sorted_key, target, side='left')
+            counts = np.where(valid, np.searchsorted(sorted_key, target, side='right') - start, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            first = np.cumsum(counts) - counts
+            within = np.arange(total) - np.repeat(first, counts)
+            left.append(np.repeat(idx, counts))
+            right.append(order[np.repeat(start, counts) + within])
+
+    if not left:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    i = np.concatenate(left)
+    j = np.concatenate(right)
+    keep = (i != j) & ((x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 <= radius * radius)
+    return i[keep], j[keep]
+
+
+def _windrose_bins(windrose: pd.DataFrame, n_sectors: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Direction centres (deg), speeds and a (n_dir, n_speed) frequency table."""
+    if 'direction' in windrose.columns:
+        table = windrose.pivot_table(index='direction', columns='wind_speed',
+                                     values='frequency', aggfunc='sum', fill_value=0.0)
+        directions = table.index.to_numpy(dtype=float)
+        speeds = table.columns.to_numpy(dtype=float)
+        freq = table.to_numpy(dtype=float)
+    else:
+        by_speed = windrose.groupby('wind_speed')['frequency'].sum()
+        directions = np.arange(n_sectors) * (360.0 / n_sectors)
+        speeds = by_speed.index.to_numpy(dtype=float)
+        freq = np.repeat(by_speed.to_numpy(dtype=float)[None, :] / n_sectors, n_sectors, axis=0)
+    total = freq.sum()
+    if total <= 0:
+        raise ValueError('windrose frequencies sum to zero')
+    return directions, speeds, freq / total
+
+
+def wake_aep(layout: pd.DataFrame, windrose: pd.DataFrame,
+             power_curve: Optional[pd.DataFrame] = None,
+             rotor_diameter: float = 120.0,
+             wake_model='jensen',
+             n_sectors: int = 12,
+             max_distance_d: float = 20.0,
+             hours: float = HOURS_PER_YEAR) -> pd.DataFrame:
+    """Per-turbine gross and net AEP including wake losses.
+
+    - layout: canonical layout table ['turbine_id', 'x', 'y'] (metres).
+    - windrose: ['wind_speed', 'frequency'] and optionally 'direction'
+      (degrees the wind blows from). Without directions the speed
+      distribution is spread evenly over ``n_sectors`` sectors.
+    - power_curve: ['wind_speed', 'power_kw', 'ct']; defaults to
+      :func:`generic_power_curve`.
+    - wake_model: a key of :data:`WAKE_MODELS` or a model instance.
+
+    Returns ['turbine_id', 'x', 'y', 'gross_aep_mwh', 'net_aep_mwh', 'wake_loss'].
+    """
+    if power_curve is None:
+        power_curve = generic_power_curve()
+    model = WAKE_MODELS[wake_model]() if isinstance(wake_model, str) else wake_model
+
+    x = layout['x'].to_numpy(dtype=float)
+    y = layout['y'].to_numpy(dtype=float)
+    n = len(x)
+    directions, speeds, freq = _windrose_bins(windrose, n_sectors)
+
+    pc_u = power_curve['wind_speed'].to_numpy(dtype=float)
+    pc_p = power_curve['power_kw'].to_numpy(dtype=float)
+    pc_ct = power_curve['ct'].to_numpy(dtype=float)
+    free_power = np.interp(speeds, pc_u, pc_p, left=0.0, right=0.0)
+    thrust = model.thrust_term(np.interp(speeds, pc_u, pc_ct, left=0.0, right=0.0))
+
+    # wind from theta travels towards theta + 180 deg (x east, y north)
+    theta = np.deg2rad(directions)
+    ux = -np.sin(theta)
+    uy = -np.cos(theta)
+
+    src, dst = neighbour_pairs(x, y, max_distance_d * rotor_diameter)
+    ddx = x[dst] - x[src]
+    ddy = y[dst] - y[src]
+    along = ddx[:, None] * ux[None, :] + ddy[:, None] * uy[None, :]
+    across = ddy[:, None] * ux[None, :] - ddx[:, None] * uy[None, :]
+    g2 = model.geometry(along, across, rotor_diameter) ** 2
+
+    n_dir = len(directions)
+    flat = (dst[:, None] * n_dir + np.arange(n_dir)[None, :]).ravel()
+    g_sum = np.bincount(flat, weights=g2.ravel(), minlength=n * n_dir).reshape(n, n_dir)
+
+    # deficit[t, d, s] = thrust(s) * sqrt(sum of squared geometric factors)
+    deficit = np.sqrt(g_sum)[:, :, None] * thrust[None, None, :]
+    u_eff = speeds[None, None, :] * np.clip(1.0 - deficit, 0.0, None)
+    net_power = np.interp(u_eff, pc_u, pc_p, left=0.0, right=0.0)
+
+    gross = hours * float((freq * free_power[None, :]).sum()) / 1000.0
+    net = hours * np.einsum('tds,ds->t', net_power, freq) / 1000.0
+    gross_arr = np.full(n, gross)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        loss = np.where(gross_arr > 0, 1.0 - net / gross_arr, 0.0)
+    return pd.DataFrame({
+        'turbine_id': layout['turbine_id'].astype(str).to_numpy(),
+        'x': x,
+        'y': y,
+        'gross_aep_mwh': gross_arr,
+        'net_aep_mwh': net,
+        'wake_loss': loss,
+    })
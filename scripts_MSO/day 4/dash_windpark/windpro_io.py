@@ -7,23 +7,34 @@ calculator (layout, production, windrose).
 Designed to be small and robust for the demo; exact WindPRO formats should be
 handled by adding more rules to the parsing functions when sample files are
 available.
+
+``read_windpro_workbook`` reads all three tables from a multi-sheet project
+workbook in one pass. All parsers take an optional ``cache``
+(``file_cache.ParsedFileCache``) so re-opening the same export skips the
+Excel/CSV parser entirely.
 """
 from __future__ import annotations
 
-from typing import Dict, Optional
+import os
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
 import pandas as pd
 
+from .file_cache import ParsedFileCache
+from .instrumentation import timed
 
-def parse_production_table(source) -> pd.DataFrame:
-    """Parse a production table from path or DataFrame into a canonical DataFrame.
+# part of the parsed-table cache key; bump whenever a parser's output changes
+PARSER_VERSION = 2
 
-    The returned DataFrame should include at least columns:
-      - turbine_id (string)
-      - annual_energy_mwh (float)  # per-turbine expected production
 
-    Accepts either a path (str/Path) or an already-loaded DataFrame.
-    """
-    if isinstance(source, (str,)):
+def _is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def _read_source(source) -> pd.DataFrame:
+    """Load a path (Excel or CSV) or copy an already-loaded DataFrame."""
+    if _is_path(source):
+        source = os.fspath(source)
         if source.lower().endswith(('.xls', '.xlsx')):
             df = pd.read_excel(source)
         else:
@@ -32,30 +43,122 @@ def parse_production_table(source) -> pd.DataFrame:
         df = source.copy()
     else:
         raise TypeError("source must be a path or DataFrame")
+    return df
+
+
+class ColumnMap(NamedTuple):
+    """Column roles detected from a sheet header (original column labels)."""
+    id_col: object
+    energy_col: object
+    x_col: object
+    y_col: object
+    speed_col: object
+    freq_col: object
+    dir_col: object
+
+    @property
+    def roles(self) -> Tuple[str, ...]:
+        """Canonical tables this header can produce, judged by names alone."""
+        roles = []
+        if self.speed_col is not None and self.freq_col is not None:
+            roles.append('windrose')
+        if self.x_col is not None and self.y_col is not None:
+            roles.append('layout')
+        if self.energy_col is not None:
+            roles.append('production')
+        return tuple(roles)
+
+
+@lru_cache(maxsize=256)
+def detect_columns(columns: Tuple) -> ColumnMap:
+    """Run the column heuristics for one header signature.
+
+    Cached per header, so repeated imports of the same WindPRO template skip
+    detection. Only looks at names; data-dependent fallbacks (first numeric
+    columns for coordinates) stay in the parsers.
+    """
+    names = [str(c).lower() for c in columns]
 
     # Heuristics: common WindPRO production exports include columns named
     # like 'Turbine', 'Turbine ID', 'Annual energy (MWh)', 'Annual [MWh]'
-    mapping = {}
-    cols = [c.lower() for c in df.columns]
-    if 'turbine' in cols:
-        mapping[[c for c in df.columns if c.lower() == 'turbine'][0]] = 'turbine_id'
-    elif 'turbine id' in cols:
-        mapping[[c for c in df.columns if c.lower() == 'turbine id'][0]] = 'turbine_id'
-    else:
-        # fall back to first column
-        mapping[df.columns[0]] = 'turbine_id'
+    id_col = None
+    for candidate in ('turbine', 'turbine id', 'id'):
+        if candidate in names:
+            id_col = columns[names.index(candidate)]
+            break
 
     # find annual energy column
-    ae_candidates = [c for c in df.columns if 'annual' in c.lower() and 'mwh' in c.lower()]
+    energy_col = None
+    ae_candidates = [c for c, nc in zip(columns, names) if 'annual' in nc and 'mwh' in nc]
+    if not ae_candidates:
+        ae_candidates = [c for c, nc in zip(columns, names) if 'annual' in nc]
     if not ae_candidates:
-        ae_candidates = [c for c in df.columns if 'annual' in c.lower()]
-    if ae_candidates:
-        mapping[ae_candidates[0]] = 'annual_energy_mwh'
-    else:
         # try to detect 'production' columns
-        prod_candidates = [c for c in df.columns if 'production' in c.lower() or 'yield' in c.lower()]
-        if prod_candidates:
-            mapping[prod_candidates[0]] = 'annual_energy_mwh'
+        ae_candidates = [c for c, nc in zip(columns, names) if 'production' in nc or 'yield' in nc]
+    if ae_candidates:
+        energy_col = ae_candidates[0]
+
+    # find x/y or lat/lon
+    x_col = None
+    y_col = None
+    for c, nc in zip(columns, names):
+        if 'x' == nc or 'xcoord' in nc or 'x coordinate' in nc or 'easting' in nc:
+            x_col = c
+        if 'y' == nc or 'ycoord' in nc or 'y coordinate' in nc or 'northing' in nc:
+            y_col = c
+        if 'lat' in nc and x_col is None:
+            x_col = c
+        if 'lon' in nc and y_col is None:
+            y_col = c
+
+    speed_col = None
+    freq_col = None
+    dir_col = None
+    for c, nc in zip(columns, names):
+        if 'speed' in nc and speed_col is None:
+            speed_col = c
+        if any(k in nc for k in ('frequency', 'freq', '%')) and freq_col is None:
+            freq_col = c
+    for c, nc in zip(columns, names):
+        # 'Sector frequency [%]' is the frequency column, not a direction
+        if c in (speed_col, freq_col):
+            continue
+        if 'direction' in nc or 'sector' in nc or nc in ('dir', 'wd'):
+            dir_col = c
+            break
+
+    return ColumnMap(id_col, energy_col, x_col, y_col, speed_col, freq_col, dir_col)
+
+
+def _columns_of(df: pd.DataFrame) -> ColumnMap:
+    return detect_columns(tuple(df.columns))
+
+
+@timed('windpro_io.parse_production')
+def parse_production_table(source, cache: Optional[ParsedFileCache] = None) -> pd.DataFrame:
+    """Parse a production table from path or DataFrame into a canonical DataFrame.
+
+    The returned DataFrame should include at least columns:
+      - turbine_id (string)
+      - annual_energy_mwh (float)  # per-turbine expected production
+
+    Accepts either a path (str/Path) or an already-loaded DataFrame. With a
+    ``cache`` (see ``file_cache.ParsedFileCache``) parsed paths are stored and
+    an unchanged file is loaded from the cache without re-parsing.
+    """
+    if cache is not None and _is_path(source):
+        return cache.load(source, 'production', parse_production_table, version=PARSER_VERSION)
+    df = _read_source(source)
+    cmap = _columns_of(df)
+
+    mapping = {}
+    id_col = cmap.id_col
+    if id_col is None or str(id_col).lower() == 'id':
+        # fall back to first column
+        id_col = df.columns[0]
+    mapping[id_col] = 'turbine_id'
+    if cmap.energy_col is not None:
+        mapping[cmap.energy_col] = 'annual_energy_mwh'
 
     out = df.rename(columns=mapping)
     # ensure required columns exist
@@ -72,45 +175,21 @@ def parse_production_table(source) -> pd.DataFrame:
     return out[['turbine_id', 'annual_energy_mwh']]
 
 
-def parse_layout_table(source) -> pd.DataFrame:
+@timed('windpro_io.parse_layout')
+def parse_layout_table(source, cache: Optional[ParsedFileCache] = None) -> pd.DataFrame:
     """Parse layout table to return a DataFrame with turbine_id, x, y (or lat, lon).
 
     Returns canonical columns: ['turbine_id', 'x', 'y'] where coordinates may be
     local coordinates or lat/lon depending on the WindPRO export.
     """
-    if isinstance(source, (str,)):
-        if source.lower().endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(source)
-        else:
-            df = pd.read_csv(source)
-    elif isinstance(source, pd.DataFrame):
-        df = source.copy()
-    else:
-        raise TypeError("source must be a path or DataFrame")
+    if cache is not None and _is_path(source):
+        return cache.load(source, 'layout', parse_layout_table, version=PARSER_VERSION)
+    df = _read_source(source)
+    cmap = _columns_of(df)
 
-    cols = [c.lower() for c in df.columns]
-    # simple heuristics
-    id_col = None
-    for candidate in ('turbine', 'turbine id', 'id'):
-        if candidate in cols:
-            id_col = df.columns[cols.index(candidate)]
-            break
-    if id_col is None:
-        id_col = df.columns[0]
-
-    # find x/y or lat/lon
-    x_col = None
-    y_col = None
-    for c in df.columns:
-        nc = c.lower()
-        if 'x' == nc or 'xcoord' in nc or 'x coordinate' in nc or 'easting' in nc:
-            x_col = c
-        if 'y' == nc or 'ycoord' in nc or 'y coordinate' in nc or 'northing' in nc:
-            y_col = c
-        if 'lat' in nc and x_col is None:
-            x_col = c
-        if 'lon' in nc and y_col is None:
-            y_col = c
+    id_col = cmap.id_col if cmap.id_col is not None else df.columns[0]
+    x_col = cmap.x_col
+    y_col = cmap.y_col
 
     if x_col is None or y_col is None:
         # fallback: try first two numeric columns
@@ -120,47 +199,107 @@ def parse_layout_table(source) -> pd.DataFrame:
 
     out = pd.DataFrame()
     out['turbine_id'] = df[id_col].astype(str)
-    out['x'] = pd.to_numeric(df[x_col], errors='coerce') if x_col else 0.0
-    out['y'] = pd.to_numeric(df[y_col], errors='coerce') if y_col else 0.0
+    out['x'] = pd.to_numeric(df[x_col], errors='coerce') if x_col is not None else 0.0
+    out['y'] = pd.to_numeric(df[y_col], errors='coerce') if y_col is not None else 0.0
 
     return out[['turbine_id', 'x', 'y']]
 
 
-def parse_windrose(source) -> Optional[pd.DataFrame]:
+def _direction_degrees(values: pd.Series, name: str) -> Optional[pd.Series]:
+    """Direction column in degrees, or None if it is not numeric.
+
+    Labelled sectors ('N', 'NNE', ...) are not used. A column named
+    'sector' (without 'deg') holding small integers is read as sector
+    numbers 1..n (or 0..n-1) and converted to sector centres in degrees.
+    """
+    numeric = pd.to_numeric(values, errors='coerce')
+    if numeric.isna().any() and not numeric.isna().equals(values.isna()):
+        return None
+    name = name.lower()
+    valid = numeric.dropna()
+    if (not valid.empty and 'sector' in name and 'deg' not in name
+            and (valid == valid.round()).all() and valid.min() >= 0 and valid.max() <= 36):
+        first = int(valid.min() >= 1)
+        n_sectors = int(valid.max()) + 1 - first
+        return (numeric - first) * (360.0 / n_sectors)
+    return numeric
+
+
+@timed('windpro_io.parse_windrose')
+def parse_windrose(source, cache: Optional[ParsedFileCache] = None) -> Optional[pd.DataFrame]:
     """Parse a windrose / wind resource sheet into a structured DataFrame.
 
     Returns a DataFrame with at least columns ['wind_speed','frequency'] or None if
-    it cannot detect an appropriate sheet.
+    it cannot detect an appropriate sheet. If the sheet has a direction/sector
+    column it is kept as 'direction' (degrees) for the wake engine.
     """
-    if isinstance(source, (str,)):
-        if source.lower().endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(source)
-        else:
-            df = pd.read_csv(source)
-    elif isinstance(source, pd.DataFrame):
-        df = source.copy()
-    else:
-        raise TypeError("source must be a path or DataFrame")
-
-    cols = [c.lower() for c in df.columns]
-    speed_col = None
-    freq_col = None
-    for c in df.columns:
-        nc = c.lower()
-        if 'speed' in nc and speed_col is None:
-            speed_col = c
-        if any(k in nc for k in ('frequency', 'freq', '%')) and freq_col is None:
-            freq_col = c
+    if cache is not None and _is_path(source):
+        return cache.load(source, 'windrose', parse_windrose, version=PARSER_VERSION)
+    df = _read_source(source)
+    cmap = _columns_of(df)
+    speed_col, freq_col, dir_col = cmap.speed_col, cmap.freq_col, cmap.dir_col
 
     if speed_col is None or freq_col is None:
         return None
 
-    out = df[[speed_col, freq_col]].rename(columns={speed_col: 'wind_speed', freq_col: 'frequency'})
-    out['wind_speed'] = pd.to_numeric(out['wind_speed'], errors='coerce')
-    out['frequency'] = pd.to_numeric(out['frequency'], errors='coerce')
+    out = pd.DataFrame({'wind_speed': pd.to_numeric(df[speed_col], errors='coerce'),
+                        'frequency': pd.to_numeric(df[freq_col], errors='coerce')})
+    direction = _direction_degrees(df[dir_col], str(dir_col)) if dir_col is not None else None
+    if direction is not None:
+        out.insert(0, 'direction', direction)
+    else:
+        dir_col = None
     out = out.dropna()
     # normalize frequencies to sum 1 if they are percentages
     if out['frequency'].sum() > 1.5:
         out['frequency'] = out['frequency'] / out['frequency'].sum()
 
+    if dir_col is not None:
+        return out[['direction', 'wind_speed', 'frequency']]
     return out[['wind_speed', 'frequency']]
+
+
+_PARSERS = {
+    'production': parse_production_table,
+    'layout': parse_layout_table,
+    'windrose': parse_windrose,
+}
+WORKBOOK_TABLES = tuple(_PARSERS)
+
+
+def _read_sheets(path: str) -> Dict[str, pd.DataFrame]:
+    """All sheets of a workbook, opening the file once (CSV: one sheet)."""
+    if path.lower().endswith(('.xls', '.xlsx')):
+        with pd.ExcelFile(path) as book:
+            return {name: book.parse(name) for name in book.sheet_names}
+    return {os.path.basename(path): pd.read_csv(path)}
+
+
+def _parse_workbook(path) -> Dict[str, Optional[pd.DataFrame]]:
+    sheets = _read_sheets(os.fspath(path))
+    roles = {name: _columns_of(df).roles for name, df in sheets.items()}
+    out: Dict[str, Optional[pd.DataFrame]] = {}
+    for table in WORKBOOK_TABLES:
+        candidates = [name for name, r in roles.items() if table in r]
+        # prefer sheets that can only be this table (a layout sheet may also
+        # carry an energy column, a production sheet never has coordinates)
+        candidates.sort(key=lambda name: len(roles[name]))
+        out[table] = _PARSERS[table](sheets[candidates[0]]) if candidates else None
+    return out
+
+
+@timed('windpro_io.read_workbook')
+def read_windpro_workbook(path, cache: Optional[ParsedFileCache] = None) -> Dict[str, Optional[pd.DataFrame]]:
+    """Read production, layout and windrose tables from one WindPRO workbook.
+
+    The file is opened once and every sheet is classified with the same
+    column heuristics as the single-table parsers. Returns a dict with keys
+    'production', 'layout' and 'windrose'; a table that no sheet provides is
+    None. With a ``cache`` all three tables are stored together and an
+    unchanged workbook is not parsed again.
+    """
+    if cache is not None:
+        return cache.load_many(path, ['workbook-' + t for t in WORKBOOK_TABLES],
+                               lambda p: {'workbook-' + k: v for k, v in _parse_workbook(p).items()},
+                               strip_prefix='workbook-', version=PARSER_VERSION)
+    return _parse_workbook(path)